@@ -21,19 +21,10 @@ class Aligner(object):
         self.alignments = []
 
     def is_similar(self, item1, item2, pos1, pos2, is_opposite, relation):
-        result = False
-        group = self.config.get_similar_group(pos1, pos2, is_opposite, relation)
+        return self.config.similar_groups.is_similar(item1, item2, pos1, pos2, is_opposite, relation)
 
-        if is_opposite:
-            for subgroup in group:
-                if item1 in subgroup[0] and item2 in subgroup[1]:
-                    result = True
-        else:
-            for subgroup in group:
-                if item1 in subgroup and item2 in subgroup:
-                    result = True
-
-        return result
+    def is_similar_to_any(self, item1, item2, pos, is_opposite, relation):
+        return self.config.similar_groups.is_similar_to_any(item1, item2, pos, is_opposite, relation)
 
     def compareNodes(self, sourceNodes, targetNodes, pos, opposite, relationDirection, existingAlignments, sourcePosTags, targetPosTags, sourceLemmas, targetLemmas):
         # search for nodes in common or equivalent function
@@ -69,16 +60,10 @@ class Aligner(object):
 
                 if ([ktem[0], ltem[0]] in existingAlignments or word_relatedness_alignment(word1, word2, self.config) >= self.config.alignment_similarity_threshold) and (
                     (ktem[2] == ltem[2]) or
-                        ((pos != '' and relationDirection != 'child_parent') and (
-                            self.is_similar(ktem[2], ltem[2], pos, 'noun', opposite, relationDirection) or
-                            self.is_similar(ktem[2], ltem[2], pos, 'verb', opposite, relationDirection) or
-                            self.is_similar(ktem[2], ltem[2], pos, 'adjective', opposite, relationDirection) or
-                            self.is_similar(ktem[2], ltem[2], pos, 'adverb', opposite, relationDirection))) or
-                        ((pos != '' and relationDirection == 'child_parent') and (
-                            self.is_similar(ltem[2], ktem[2], pos, 'noun', opposite, relationDirection) or
-                            self.is_similar(ltem[2], ktem[2], pos, 'verb', opposite, relationDirection) or
-                            self.is_similar(ltem[2], ktem[2], pos, 'adjective', opposite, relationDirection) or
-                            self.is_similar(ltem[2], ktem[2], pos, 'adverb', opposite, relationDirection)))):
+                        ((pos != '' and relationDirection != 'child_parent') and
+                            self.is_similar_to_any(ktem[2], ltem[2], pos, opposite, relationDirection)) or
+                        ((pos != '' and relationDirection == 'child_parent') and
+                            self.is_similar_to_any(ltem[2], ktem[2], pos, opposite, relationDirection))):
 
                     relativeAlignments.append([ktem[0], ltem[0]])
                     wordSimilarities.append(word_relatedness_alignment(word1, word2, self.config))
@@ -110,16 +95,10 @@ class Aligner(object):
 
                 if ([ktem[0], ltem[0]] in existingAlignments or (ktem[0] == 0 and ltem[0] == 0)) and (
                     (ktem[2] == ltem[2]) or
-                        ((pos != '' and relationDirection != 'child_parent') and (
-                            self.is_similar(ktem[2], ltem[2], pos, 'noun', opposite, relationDirection) or
-                            self.is_similar(ktem[2], ltem[2], pos, 'verb', opposite, relationDirection) or
-                            self.is_similar(ktem[2], ltem[2], pos, 'adjective', opposite, relationDirection) or
-                            self.is_similar(ktem[2], ltem[2], pos, 'adverb', opposite, relationDirection))) or
-                        ((pos != '' and relationDirection == 'child_parent') and (
-                            self.is_similar(ltem[2], ktem[2], pos, 'noun', opposite, relationDirection) or
-                            self.is_similar(ltem[2], ktem[2], pos, 'verb', opposite, relationDirection) or
-                            self.is_similar(ltem[2], ktem[2], pos, 'adjective', opposite, relationDirection) or
-                            self.is_similar(ltem[2], ktem[2], pos, 'adverb', opposite, relationDirection)))):
+                        ((pos != '' and relationDirection != 'child_parent') and
+                            self.is_similar_to_any(ktem[2], ltem[2], pos, opposite, relationDirection)) or
+                        ((pos != '' and relationDirection == 'child_parent') and
+                            self.is_similar_to_any(ltem[2], ktem[2], pos, opposite, relationDirection))):
 
                     relativeAlignments.append([ktem[0], ltem[0]])
                     wordSimilarities.append(word_relatedness_alignment(word1, word2, self.config))
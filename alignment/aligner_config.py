@@ -3,6 +3,8 @@ import os.path
 from configparser import ConfigParser
 from json import *
 
+from alignment.equivalence_table import EquivalenceTable
+
 
 class AlignerConfig(object):
     config = ConfigParser()
@@ -11,7 +13,9 @@ class AlignerConfig(object):
     __similar_groups__ = dict()
 
     def __init__(self, language):
-        self.config.readfp(open(os.path.expanduser('config/aligner/' + language + '.cfg')))
+        path = os.path.expanduser('config/aligner/' + language + '.cfg')
+        self.config.readfp(open(path))
+        self.similar_groups = EquivalenceTable.load(path, 'Similar Groups', self.config)
         self.alignment_similarity_threshold = self.config.getfloat('Aligner', 'alignment_similarity_threshold')
 
         self.exact = self.config.getfloat('Aligner', 'exact')
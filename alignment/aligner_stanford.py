@@ -224,19 +224,10 @@ class AlignerStanford(object):
         return
 
     def _is_similar(self, dep1, dep2, pos1, pos2, is_opposite, relation):
-        result = False
-        group = self.config.get_similar_group(pos1, pos2, is_opposite, relation)
-
-        if is_opposite:
-            for subgroup in group:
-                if dep1 in subgroup[0] and dep2 in subgroup[1]:
-                    result = True
-        else:
-            for subgroup in group:
-                if dep1 in subgroup and dep2 in subgroup:
-                    result = True
+        return self.config.similar_groups.is_similar(dep1, dep2, pos1, pos2, is_opposite, relation)
 
-        return result
+    def _is_similar_to_any(self, dep1, dep2, pos, is_opposite, relation):
+        return self.config.similar_groups.is_similar_to_any(dep1, dep2, pos, is_opposite, relation)
 
     def _compare_nodes(self, source, target, pos, opposite, relation_direction):
         # search for nodes in common or equivalent function
@@ -247,16 +238,7 @@ class AlignerStanford(object):
                 similarity, similarity_type = word_relatedness_alignment_stanford(word1, word2, self.config)
                 if ((word1.index, word2.index) in self.alignments or similarity >= self.config.alignment_similarity_threshold) and (
                     (word1.dep == word2.dep) or
-                        ((pos != '' and relation_direction != 'child_parent') and (
-                            self._is_similar(word1.dep, word2.dep, pos, 'noun', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'verb', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'adjective', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'adverb', opposite, relation_direction))) or
-                        ((pos != '' and relation_direction == 'child_parent') and (
-                            self._is_similar(word1.dep, word2.dep, pos, 'noun', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'verb', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'adjective', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'adverb', opposite, relation_direction)))):
+                        (pos != '' and self._is_similar_to_any(word1.dep, word2.dep, pos, opposite, relation_direction))):
 
                     result[(word1.index, word2.index)] = (similarity, similarity_type)
 
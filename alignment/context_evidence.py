@@ -3,6 +3,8 @@ import os
 from configparser import ConfigParser
 from json import loads
 
+from alignment.equivalence_table import EquivalenceTable
+
 
 class ContextDifference(object):
 
@@ -18,9 +20,12 @@ class ContextEvidence(object):
     _equivalent_functions = dict()
 
     def __init__(self):
-        self.config.readfp(open('config/equivalent_dependencies.cfg'))
+        self.equivalent_functions = EquivalenceTable.load('config/equivalent_dependencies.cfg', 'Equivalent Functions')
 
     def get_similar_group(self, left_category, right_category, is_opposite, relation):
+        if not self.config.has_section('Equivalent Functions'):
+            self.config.readfp(open('config/equivalent_dependencies.cfg'))
+
         group_name = left_category + '_' + ('opposite_' if is_opposite else '') + right_category + '_' + relation
 
         if group_name in self._equivalent_functions:
@@ -35,20 +40,7 @@ class ContextEvidence(object):
         return similar_group
 
     def is_similar(self, left_pos, right_pos, context_category, target_category, is_opposite, relation):
-
-        result = False
-        group = self.get_similar_group(context_category, target_category, is_opposite, relation)
-
-        if is_opposite:
-            for subgroup in group:
-                if left_pos in subgroup[0] and right_pos in subgroup[1]:
-                    result = True
-        else:
-            for subgroup in group:
-                if left_pos in subgroup and right_pos in subgroup:
-                    result = True
-
-        return result
+        return self.equivalent_functions.is_similar(left_pos, right_pos, context_category, target_category, is_opposite, relation)
 
     def equivalent_context(self, right_target_word, left_context_words, right_context_words, relation, opposite, alignments):
 
@@ -27,16 +27,7 @@ class ContextInfoCompiler(AlignerStanford):
 
                 if ((word1.index, word2.index) in alignments or (word1.index == 0 and word2.index == 0)) and (
                     (word1.dep == word2.dep) or
-                        ((pos != '' and relation_direction != 'child_parent') and (
-                            self._is_similar(word1.dep, word2.dep, pos, 'noun', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'verb', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'adjective', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'adverb', opposite, relation_direction))) or
-                        ((pos != '' and relation_direction == 'child_parent') and (
-                            self._is_similar(word1.dep, word2.dep, pos, 'noun', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'verb', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'adjective', opposite, relation_direction) or
-                            self._is_similar(word1.dep, word2.dep, pos, 'adverb', opposite, relation_direction)))):
+                        (pos != '' and self._is_similar_to_any(word1.dep, word2.dep, pos, opposite, relation_direction))):
 
                     relative_alignments.append((word1.index, word2.index))
                     word_similarities.append(word_relatedness_alignment_stanford(word1, word2, self.config)[0])
@@ -0,0 +1,129 @@
+import os
+import pickle
+import tempfile
+
+from configparser import ConfigParser
+from json import loads
+from lex_resources.lazy_resource import replace_shared
+
+
+# Word categories of the target word compared by the aligners
+CATEGORIES = ['noun', 'verb', 'adjective', 'adverb']
+
+# Compiled tables, by (config path, section)
+__tables__ = dict()
+
+
+class EquivalenceTable(object):
+
+    """ Groups of equivalent dependency labels of a config section, compiled into a set of
+    (pos1, pos2, opposite, relation, dep1, dep2) keys so that each similarity check is one lookup """
+
+    # Version of the compiled table, to be increased when the attributes or the keys change
+    version = '1'
+
+    def __init__(self, groups):
+        self.keys = set()
+        self.any_category = set()
+
+        for (pos1, pos2, opposite, relation), group in groups.items():
+            for subgroup in group:
+                if opposite:
+                    pairs = [(dep1, dep2) for dep1 in subgroup[0] for dep2 in subgroup[1]]
+                else:
+                    pairs = [(dep1, dep2) for dep1 in subgroup for dep2 in subgroup]
+
+                for dep1, dep2 in pairs:
+                    self.keys.add((pos1, pos2, opposite, relation, dep1, dep2))
+                    if pos2 in CATEGORIES:
+                        self.any_category.add((pos1, opposite, relation, dep1, dep2))
+
+    def is_similar(self, dep1, dep2, pos1, pos2, is_opposite, relation):
+        return (pos1, pos2, bool(is_opposite), relation, dep1, dep2) in self.keys
+
+    def is_similar_to_any(self, dep1, dep2, pos, is_opposite, relation):
+
+        """ Whether the labels are equivalent for a target word of any category (noun, verb, adjective or adverb) """
+
+        return (pos, bool(is_opposite), relation, dep1, dep2) in self.any_category
+
+    @staticmethod
+    def group_key(group_name):
+
+        # pos1_[opposite_]pos2_relation, the relation can contain underscores (parent_child)
+
+        parts = group_name.split('_')
+
+        if parts[1] == 'opposite':
+            return parts[0], parts[2], True, '_'.join(parts[3:])
+
+        return parts[0], parts[1], False, '_'.join(parts[2:])
+
+    @staticmethod
+    def read_groups(config, section):
+
+        groups = {}
+
+        for group_name in config.options(section):
+            group = []
+            for line in config.get(section, group_name).splitlines():
+                if len(line.strip()) > 0:
+                    group.append(loads(line.strip()))
+            groups[EquivalenceTable.group_key(group_name)] = group
+
+        return groups
+
+    @staticmethod
+    def compiled_path(path, section):
+        return path + '.' + section.lower().replace(' ', '_') + '.pickle'
+
+    @staticmethod
+    def load(path, section, config=None):
+
+        """ Compiled table of a config section. The table is serialized next to the config file and read
+        from there as long as the config file and the version of the table do not change, the config is
+        parsed only to compile it """
+
+        path = os.path.expanduser(path)
+
+        if (path, section) in __tables__:
+            return __tables__[path, section]
+
+        compiled_path = EquivalenceTable.compiled_path(path, section)
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime, EquivalenceTable.version)
+        table = None
+
+        if os.path.exists(compiled_path):
+            try:
+                with open(compiled_path, 'rb') as f:
+                    compiled_signature, compiled_table = pickle.load(f)
+                if compiled_signature == signature:
+                    table = compiled_table
+            except (OSError, EOFError, pickle.UnpicklingError):
+                # Unreadable or partial file, the table is compiled again
+                pass
+
+        if table is None:
+            if config is None:
+                config = ConfigParser()
+                config.readfp(open(path))
+
+            table = EquivalenceTable(EquivalenceTable.read_groups(config, section))
+            EquivalenceTable.save(table, signature, compiled_path)
+
+        __tables__[path, section] = table
+
+        return table
+
+    @staticmethod
+    def save(table, signature, compiled_path):
+
+        try:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(compiled_path)))
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((signature, table), f, protocol=pickle.HIGHEST_PROTOCOL)
+            replace_shared(tmp, compiled_path)
+        except OSError:
+            # Read-only config directory, the table is compiled again on the next run
+            pass
@@ -20,10 +20,11 @@ def feature_extraction(config_features_path):
     data = RankingData(config)
     data.read_dataset()
 
+    feature_names = FeatureExtractor.read_feature_names(config)
+
     process = Process(config)
-    sentences_tgt, sentences_ref = process.run_processors()
+    sentences_tgt, sentences_ref = process.run_processors(feature_names)
 
-    feature_names = FeatureExtractor.read_feature_names(config)
     feature_values = FeatureExtractor.extract_features_static(feature_names, sentences_tgt, sentences_ref)
     write_feature_file(wd + '/' + 'x' + '_' + data.datasets[0].name + '.tsv', feature_values)
 
@@ -0,0 +1,124 @@
+""" Per-feature column cache for the feature extraction.
+    The values of a feature over a dataset are stored as a binary column keyed by the feature class name,
+    the feature version (AbstractFeature.version) and the fingerprint of the dataset, so that adding a
+    feature to a feature set only computes the new column. The fingerprint is the hash of the data files
+    in the working directory, of the inputs, outputs, resources and settings of the selected processors
+    (see AbstractProcessor.cache_inputs), of the scorer and aligner configuration files and of the lexical
+    resources read by the features through word_sim (synonyms, contractions, stopwords, PPDB and vectors),
+    any change in the data, in the processing or in these files gives a new fingerprint. Changes in the code
+    of a feature are only detected through its version.
+
+    The cache is stored in the features directory of the artifact cache ([Cache] dir, default
+    working_dir/.cache). It is disabled by default and enabled with [Cache] features = true """
+
+import hashlib
+import json
+import numbers
+import os
+import tempfile
+import numpy as np
+
+from json import loads
+
+from utils.artifact_cache import ArtifactCache
+
+
+DATA_FILES = ['tgt.txt', 'ref.txt', 'tgt.parse', 'ref.parse', 'ref.index']
+
+CONFIG_FILES = ['config/scorer/scorer.cfg']
+
+
+class FeatureCache(object):
+
+    def __init__(self, directory, fingerprint):
+        self.directory = directory + '/' + fingerprint[:2] + '/' + fingerprint
+        self.fingerprint = fingerprint
+        self.hits = []
+        self.misses = []
+
+    @staticmethod
+    def from_config(config):
+
+        if not config.has_option('Cache', 'features') or not config.getboolean('Cache', 'features'):
+            return None
+
+        artifacts = ArtifactCache.from_config(config)
+        if artifacts is None:
+            return None
+
+        fingerprint = FeatureCache.dataset_fingerprint(config, artifacts)
+        artifacts.save_digests()
+
+        return FeatureCache(artifacts.directory + '/' + 'features', fingerprint)
+
+    @staticmethod
+    def dataset_fingerprint(config, artifacts):
+
+        from processors import processors
+
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        sha = hashlib.sha1()
+
+        for name in DATA_FILES:
+            sha.update(json.dumps([name, artifacts.digest(working_dir + '/' + name)]).encode('utf-8'))
+
+        for path in CONFIG_FILES + processors.COBALT_CONFIGS:
+            sha.update(json.dumps([path, artifacts.digest(path)]).encode('utf-8'))
+
+        sha.update(artifacts.key('lexical resources', 1, [], processors.cobalt_resources()).encode('utf-8'))
+
+        for name in loads(config.get('Processors', 'processors')):
+            instance = getattr(processors, name)()
+            files = instance.cache_inputs(config) + instance.cache_outputs(config)
+            sha.update(json.dumps([name, str(instance.version)]).encode('utf-8'))
+            sha.update(json.dumps([artifacts.digest(path) for path in files]).encode('utf-8'))
+            sha.update(artifacts.key(name, instance.version, [], instance.cache_resources(config),
+                                     instance.cache_settings(config)).encode('utf-8'))
+
+        if config.has_option('Processors', 'from_file'):
+            sha.update(config.get('Processors', 'from_file').encode('utf-8'))
+
+        return sha.hexdigest()
+
+    def path(self, instance):
+        return self.directory + '/' + instance.__class__.__name__ + '.' + str(instance.version) + '.npz'
+
+    def load(self, instance, length):
+
+        # Cached values of the feature, None if they are not cached
+
+        path = self.path(instance)
+
+        if not os.path.exists(path):
+            self.misses.append(str(instance))
+            return None
+
+        with np.load(path) as data:
+            values = data['values']
+            integers = data['integers']
+
+        if len(values) != length:
+            self.misses.append(str(instance))
+            return None
+
+        self.hits.append(str(instance))
+        return [int(v) if integer else float(v) for v, integer in zip(values, integers)]
+
+    def save(self, instance, feature_vector):
+
+        # Only numeric columns are cached, integers are kept as integers in the feature files
+
+        if not all(isinstance(v, numbers.Real) and not isinstance(v, (bool, np.bool_)) for v in feature_vector):
+            return
+
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.npz')
+        os.close(fd)
+        np.savez(tmp, values=np.array(feature_vector, dtype=np.float64),
+                 integers=np.array([isinstance(v, numbers.Integral) for v in feature_vector], dtype=bool))
+        os.replace(tmp, self.path(instance))
+
+    def report(self):
+        print("Feature cache: " + str(len(self.hits)) + " features loaded, " + str(len(self.misses)) + " computed")
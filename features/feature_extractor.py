@@ -1,8 +1,14 @@
 import os
 
+from features.feature_cache import FeatureCache
+from features.feature_registry import FeatureRegistry
 from features.impl.features import *
 
 
+# Built once, when the feature classes are imported
+registry = FeatureRegistry(AbstractFeature)
+
+
 class FeatureExtractor(object):
 
     def __init__(self, cfg):
@@ -11,81 +17,89 @@ class FeatureExtractor(object):
         self.feature_names = []
 
     @staticmethod
-    def extract_features_static(feature_names, sentences_tgt, sentences_ref):
+    def extract_features_static(feature_names, sentences_tgt, sentences_ref, ref_index=None, cache=None):
         print("Validating feature names...")
 
-        FeatureExtractor.validate_feature_names(feature_names, FeatureExtractor.existing_features())
+        FeatureExtractor.validate_feature_names(feature_names)
 
         print("Extracting features...")
 
-        feature_vectors = []
-
-        for my_class in sorted(list(FeatureExtractor.__iter_subclasses__(AbstractFeature)),
-                               key=lambda x: str(x)):
-
-            instance = my_class()
-
-            if str(instance) not in feature_names:
-                continue
-
-            feature_vector = []
-
-            print("Running " + str(instance))
-
-            for i, sent_tgt in enumerate(sentences_tgt):
-                instance.run(sent_tgt, sentences_ref[i])
-                feature_vector.append(instance.get_value())
-
-            feature_vectors.append(feature_vector)
+        feature_vectors = FeatureExtractor.feature_vectors(feature_names, sentences_tgt, sentences_ref, ref_index, cache)
 
         print("Finished extracting features")
 
         return [list(x) for x in zip(*feature_vectors)]
 
-    def extract_features(self, features_to_extract, sents_tgt, sents_ref):
+    def extract_features(self, features_to_extract, sents_tgt, sents_ref, ref_index=None):
         print("Validating feature names...")
 
-        self.validate_feature_names(features_to_extract, self.existing_features())
+        self.validate_feature_names(features_to_extract)
 
         print("Extracting features...")
 
-        feature_vectors = []
+        cache = FeatureCache.from_config(self.cfg) if self.cfg.has_option('Data', 'working_dir') else None
+        feature_vectors = self.feature_vectors(features_to_extract, sents_tgt, sents_ref, ref_index, cache)
 
-        for my_class in sorted(list(FeatureExtractor.__iter_subclasses__(AbstractFeature)),
-                               key=lambda x: str(x)):
+        self.vals = [list(x) for x in zip(*feature_vectors)]
 
-            instance = my_class()
+        print("Finished extracting features")
 
-            if str(instance) not in features_to_extract:
-                continue
+    @staticmethod
+    def feature_vectors(feature_names, sents_tgt, sents_ref, ref_index=None, cache=None):
 
-            feature_vector = []
+        # Columns of the selected features, read from the feature cache if it is given
+        # and the feature was already extracted on the same dataset
 
-            print("Running " + str(instance))
+        feature_vectors = []
+
+        for instance in registry.instances(feature_names):
+
+            feature_vector = cache.load(instance, len(sents_tgt)) if cache is not None else None
 
-            for i, sent_tgt in enumerate(sents_tgt):
-                instance.run(sent_tgt, sents_ref[i])
-                feature_vector.append(instance.get_value())
+            if feature_vector is None:
+                print("Running " + str(instance))
+                feature_vector = FeatureExtractor.feature_vector(instance, sents_tgt, sents_ref, ref_index)
+                if cache is not None:
+                    cache.save(instance, feature_vector)
+            else:
+                print("Loaded " + str(instance) + " from the feature cache")
 
             feature_vectors.append(feature_vector)
 
-        self.vals = [list(x) for x in zip(*feature_vectors)]
+        if cache is not None:
+            cache.report()
 
-        print("Finished extracting features")
+        return feature_vectors
 
 
     @staticmethod
-    def get_feature_names_by_group(group):
+    def feature_vector(instance, sents_tgt, sents_ref, ref_index=None):
+
+        # Reference-only features are computed once per unique reference
+        # and shared by all the candidates translating the same segment
 
-        for my_class in sorted(list(FeatureExtractor.__iter_subclasses__(AbstractFeature)),
-                                   key=lambda x: str(x)):
+        feature_vector = []
+        reference_values = {}
 
-            instance = my_class()
+        for i, sent_tgt in enumerate(sents_tgt):
 
-            if instance.get_group() != group:
+            if ref_index is not None and instance.get_reference_only():
+                if ref_index[i] not in reference_values:
+                    instance.run(sent_tgt, sents_ref[i])
+                    reference_values[ref_index[i]] = instance.get_value()
+                feature_vector.append(reference_values[ref_index[i]])
                 continue
 
-            print(instance.get_name())
+            instance.run(sent_tgt, sents_ref[i])
+            feature_vector.append(instance.get_value())
+
+        return feature_vector
+
+    @staticmethod
+    def get_feature_names_by_group(group):
+
+        for info in registry.group(group):
+            print(info.name)
 
     @staticmethod
     def get_len(my_file):
@@ -137,36 +151,14 @@ class FeatureExtractor(object):
 
     @staticmethod
     def existing_features():
-
-        my_features = []
-        for my_class in sorted(list(FeatureExtractor.__iter_subclasses__(AbstractFeature)),
-                               key=lambda x: str(x)):
-            my_features.append(str(my_class()))
-
-        return my_features
+        registry.refresh()
+        return registry.names()
 
     @staticmethod
-    def validate_feature_names(features_to_extract, feature_module_names):
+    def validate_feature_names(features_to_extract, feature_module_names=None):
+
+        registry.refresh()
 
         for f in features_to_extract:
-            if f not in feature_module_names:
+            if f not in (registry if feature_module_names is None else feature_module_names):
                 print("Warning! Feature " + f + " does not exist!")
-
-    @staticmethod
-    def __iter_subclasses__(cls, _seen=None):
-
-        if not isinstance(cls, type):
-            raise TypeError('iter_subclasses must be called with '
-                            'new-style classes, not %.100r' % cls)
-        if _seen is None:
-            _seen = set()
-        try:
-            subs = cls.__subclasses__()
-        except TypeError: # fails only when cls is type
-            subs = cls.__subclasses__(cls)
-        for sub in subs:
-            if sub not in _seen:
-                _seen.add(sub)
-                yield sub
-                for sub in FeatureExtractor.__iter_subclasses__(sub, _seen):
-                    yield sub
@@ -0,0 +1,92 @@
+from collections import namedtuple
+
+from features.impl.abstract_feature import AbstractFeature
+
+
+FeatureInfo = namedtuple("FeatureInfo", ["name", "feature_class", "group", "description", "reference_only",
+                                         "requirements"])
+
+
+class FeatureRegistry(object):
+
+    """ Feature names mapped to their classes and metadata, in the order in which the features are extracted
+    (classes sorted by their full name). Every class is instantiated once, when the registry is built """
+
+    def __init__(self, base=AbstractFeature):
+        self.base = base
+        self.features = {}
+        self.ordered = []
+        self.classes = set()
+        self.build()
+
+    def build(self):
+
+        self.features = {}
+        self.ordered = []
+        self.classes = set(iter_subclasses(self.base))
+
+        for my_class in sorted(self.classes, key=lambda x: str(x)):
+            instance = my_class()
+            info = FeatureInfo(name=instance.get_name(), feature_class=my_class, group=instance.get_group(),
+                               description=instance.get_description(), reference_only=instance.get_reference_only(),
+                               requirements=requirements(my_class))
+
+            # Several classes can have the same name, all of them are extracted
+            self.features.setdefault(info.name, []).append(info)
+            self.ordered.append(info)
+
+    def refresh(self):
+
+        # Rebuilds the registry if feature classes were defined after it was built
+
+        if len(set(iter_subclasses(self.base)) - self.classes) > 0:
+            self.build()
+
+    def __contains__(self, name):
+        return name in self.features
+
+    def names(self):
+        return [info.name for info in self.infos()]
+
+    def infos(self, names=None):
+
+        # Metadata of the selected features (all if names is None), in extraction order
+
+        selected = None if names is None else set(names)
+        return [info for info in self.ordered if selected is None or info.name in selected]
+
+    def info(self, name):
+        return self.features[name][0]
+
+    def group(self, group):
+        return [info for info in self.infos() if info.group == group]
+
+    def instances(self, names):
+
+        # Instances of the selected features only, in extraction order
+
+        return [info.feature_class() for info in self.infos(names)]
+
+
+def requirements(my_class):
+
+    # Sentence keys declared by the class or one of its bases (requires), None if they are not declared.
+    # They are not inferred from the source, features also read sentences through helpers and copies
+
+    if my_class.requires is None:
+        return None
+
+    return tuple(my_class.requires)
+
+
+def iter_subclasses(cls, _seen=None):
+
+    if _seen is None:
+        _seen = set()
+
+    for sub in cls.__subclasses__():
+        if sub not in _seen:
+            _seen.add(sub)
+            yield sub
+            for sub in iter_subclasses(sub, _seen):
+                yield sub
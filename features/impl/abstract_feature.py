@@ -2,12 +2,21 @@
 
 class AbstractFeature(object):
 
+    # Version of the feature, to be increased when run() changes
+    # (cached values of previous versions are not reused, see features.feature_cache)
+    version = '1'
+
+    # Sentence keys read by the feature, including those read by its helpers (see utils.sentence).
+    # None if they are not declared, the processors are then not pruned (see Process.required_processors)
+    requires = None
+
     def __init__(self):
         self.computable = None
         self.value = None
         self.description = None
         self.name = 'abstract_feature'
         self.group = None
+        self.reference_only = False
 
     def set_value(self, value):
         self.value = value
@@ -33,12 +42,20 @@ class AbstractFeature(object):
     def get_group(self):
         return self.group
 
+    def set_reference_only(self, reference_only):
+        self.reference_only = reference_only
+
+    def get_reference_only(self):
+        return self.reference_only
+
     def __str__(self):
         return self.name
 
 
 class AbstractChunkFeature(AbstractFeature):
 
+    requires = ['alignments', 'tokens']
+
     chunk_number = 10
 
     def __init__(self):
@@ -2,12 +2,12 @@ import math
 import numpy
 
 from scorer.scorer import Scorer
+from scorer import context_penalty
 from lex_resources import config
 from utils import word_sim
+from utils import embeddings
 from features.impl.abstract_feature import *
-from gensim import matutils
 from numpy import dot
-from scipy.spatial import distance
 from utils.clean_punctuation import CleanPunctuation
 from sent_bleu.sent_bleu import SentBleu
 from collections import Counter
@@ -16,6 +16,9 @@ from collections import Counter
 ###########################################<Common Alignment Features>##################################################
 ########################################################################################################################
 class CountWordsCandidate(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_words_candidate')
@@ -27,17 +30,24 @@ class CountWordsCandidate(AbstractFeature):
 
 
 class CountWordsReference(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_words_reference')
         AbstractFeature.set_description(self, "Number of words in the reference")
         AbstractFeature.set_group(self, "miscellaneous")
+        AbstractFeature.set_reference_only(self, True)
 
     def run(self, cand, ref):
         AbstractFeature.set_value(self, len(ref['tokens']))
 
 
 class CountContentCandidate(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_content_candidate')
@@ -55,11 +65,15 @@ class CountContentCandidate(AbstractFeature):
 
 
 class CountContentReference(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_content_reference')
         AbstractFeature.set_description(self, "Number of content words in the reference")
         AbstractFeature.set_group(self, "miscellaneous")
+        AbstractFeature.set_reference_only(self, True)
 
     def run(self, cand, ref):
         count = 0
@@ -72,6 +86,9 @@ class CountContentReference(AbstractFeature):
 
 
 class CountFunctionCandidate(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_function_candidate')
@@ -89,11 +106,15 @@ class CountFunctionCandidate(AbstractFeature):
 
 
 class CountFunctionReference(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_function_reference')
         AbstractFeature.set_description(self, "Number of function words in the reference")
         AbstractFeature.set_group(self, "miscellaneous")
+        AbstractFeature.set_reference_only(self, True)
 
     def run(self, cand, ref):
         count = 0
@@ -106,6 +127,9 @@ class CountFunctionReference(AbstractFeature):
 
 
 class CountAligned(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_aligned')
@@ -117,6 +141,9 @@ class CountAligned(AbstractFeature):
 
 
 class CountNonAlignedCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_non_aligned_candidate')
@@ -128,6 +155,9 @@ class CountNonAlignedCandidate(AbstractFeature):
 
 
 class CountNonAlignedReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_non_aligned_reference')
@@ -139,6 +169,9 @@ class CountNonAlignedReference(AbstractFeature):
 
 
 class PropNonAlignedCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_non_aligned_candidate')
@@ -155,6 +188,9 @@ class PropNonAlignedCandidate(AbstractFeature):
 
 
 class PropNonAlignedReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_non_aligned_reference')
@@ -171,6 +207,9 @@ class PropNonAlignedReference(AbstractFeature):
 
 
 class PropAlignedCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_aligned_candidate')
@@ -186,6 +225,9 @@ class PropAlignedCandidate(AbstractFeature):
 
 
 class PropAlignedReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_aligned_reference')
@@ -201,6 +243,9 @@ class PropAlignedReference(AbstractFeature):
 
 
 class CountAlignedContent(AbstractFeature):
+
+    requires = ['alignments']
+
     # Supposing content words can only be aligned to content words
 
     def __init__(self):
@@ -225,6 +270,9 @@ class CountAlignedContent(AbstractFeature):
 
 
 class CountAlignedFunction(AbstractFeature):
+
+    requires = ['alignments']
+
     # Supposing content words can only be aligned to content words
 
     def __init__(self):
@@ -249,6 +297,9 @@ class CountAlignedFunction(AbstractFeature):
 
 
 class CountNonAlignedContentCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     # Supposing content words can only be aligned to content words
 
     def __init__(self):
@@ -273,6 +324,9 @@ class CountNonAlignedContentCandidate(AbstractFeature):
 
 
 class CountNonAlignedFunctionCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     # Supposing content words can only be aligned to content words
 
     def __init__(self):
@@ -297,6 +351,9 @@ class CountNonAlignedFunctionCandidate(AbstractFeature):
 
 
 class PropNonAlignedContent(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_non_aligned_content_candidate')
@@ -319,6 +376,9 @@ class PropNonAlignedContent(AbstractFeature):
 
 
 class PropNonAlignedFunction(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_non_aligned_function_candidate')
@@ -341,6 +401,9 @@ class PropNonAlignedFunction(AbstractFeature):
 
 
 class PropAlignedContentCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     # Supposing content words can only be aligned to content words
 
     def __init__(self):
@@ -362,6 +425,9 @@ class PropAlignedContentCandidate(AbstractFeature):
 
 
 class PropAlignedFunctionCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     # Supposing content words can only be aligned to content words
 
     def __init__(self):
@@ -383,6 +449,9 @@ class PropAlignedFunctionCandidate(AbstractFeature):
 
 
 class PropAlignedContentReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     # Supposing content words can only be aligned to content words
 
     def __init__(self):
@@ -404,6 +473,9 @@ class PropAlignedContentReference(AbstractFeature):
 
 
 class PropAlignedFunctionReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     # Supposing content words can only be aligned to content words
 
     def __init__(self):
@@ -426,6 +498,8 @@ class PropAlignedFunctionReference(AbstractFeature):
 
 class MWASimilarity(AbstractFeature):
 
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'mwa')
@@ -460,6 +534,9 @@ class MWASimilarity(AbstractFeature):
 
 
 class CobaltPropExactLexExactPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_exact_lex_exact_pos')
@@ -486,6 +563,9 @@ class CobaltPropExactLexExactPos(AbstractFeature):
 
 
 class CountExactLexExactPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_exact_lex_exact_pos')
@@ -511,6 +591,9 @@ class CountExactLexExactPos(AbstractFeature):
 
 
 class PropSynLexExactPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_syn_lex_exact_pos')
@@ -537,6 +620,9 @@ class PropSynLexExactPos(AbstractFeature):
 
 
 class CountSynLexExactPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_syn_lex_exact_pos')
@@ -562,6 +648,9 @@ class CountSynLexExactPos(AbstractFeature):
 
 
 class PropParaLexExactPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_para_lex_exact_pos')
@@ -588,6 +677,9 @@ class PropParaLexExactPos(AbstractFeature):
 
 
 class CountParaLexExactPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_para_lex_exact_pos')
@@ -614,6 +706,9 @@ class CountParaLexExactPos(AbstractFeature):
 
 
 class PropExactLexCoarsePos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_exact_lex_coarse_pos')
@@ -640,6 +735,9 @@ class PropExactLexCoarsePos(AbstractFeature):
 
 
 class CountExactLexCoarsePos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_exact_lex_coarse_pos')
@@ -665,6 +763,9 @@ class CountExactLexCoarsePos(AbstractFeature):
 
 
 class PropSynLexCoarsePos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_syn_lex_coarse_pos')
@@ -691,6 +792,9 @@ class PropSynLexCoarsePos(AbstractFeature):
 
 
 class CountSynLexCoarsePos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_syn_lex_coarse_pos')
@@ -716,6 +820,9 @@ class CountSynLexCoarsePos(AbstractFeature):
 
 
 class PropParaLexCoarsePos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_para_lex_coarse_pos')
@@ -742,6 +849,9 @@ class PropParaLexCoarsePos(AbstractFeature):
 
 
 class CountParaLexCoarsePos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_para_lex_coarse_pos')
@@ -768,6 +878,9 @@ class CountParaLexCoarsePos(AbstractFeature):
 
 
 class PropSynLexDiffPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_syn_lex_diff_pos')
@@ -794,6 +907,9 @@ class PropSynLexDiffPos(AbstractFeature):
 
 
 class CountSynLexDiffPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_syn_lex_diff_pos')
@@ -819,6 +935,9 @@ class CountSynLexDiffPos(AbstractFeature):
 
 
 class PropParaLexDiffPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_para_lex_diff_pos')
@@ -845,6 +964,9 @@ class PropParaLexDiffPos(AbstractFeature):
 
 
 class CountParaLexDiffPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_para_lex_diff_pos')
@@ -870,6 +992,9 @@ class CountParaLexDiffPos(AbstractFeature):
 
 
 class PropDistribLexExactPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_distrib_lex_exact_pos')
@@ -896,6 +1021,9 @@ class PropDistribLexExactPos(AbstractFeature):
 
 
 class CountDistribLexExactPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_distrib_lex_exact_pos')
@@ -922,6 +1050,9 @@ class CountDistribLexExactPos(AbstractFeature):
 
 
 class PropDistribLexCoarsePos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_distrib_lex_coarse_pos')
@@ -948,6 +1079,9 @@ class PropDistribLexCoarsePos(AbstractFeature):
 
 
 class CountDistribLexCoarsePos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_distrib_lex_coarse_pos')
@@ -974,6 +1108,9 @@ class CountDistribLexCoarsePos(AbstractFeature):
 
 
 class PropDistribLexDiffPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_distrib_lex_diff_pos')
@@ -1000,6 +1137,9 @@ class PropDistribLexDiffPos(AbstractFeature):
 
 
 class CountDistribLexDiffPos(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_distrib_lex_diff_pos')
@@ -1025,6 +1165,9 @@ class CountDistribLexDiffPos(AbstractFeature):
 
 
 class PropPosExact(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pos_exact')
@@ -1049,6 +1192,9 @@ class PropPosExact(AbstractFeature):
 
 
 class PropPosCoarse(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pos_coarse')
@@ -1073,6 +1219,9 @@ class PropPosCoarse(AbstractFeature):
 
 
 class PropPosDiff(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pos_diff')
@@ -1097,6 +1246,9 @@ class PropPosDiff(AbstractFeature):
 
 
 class PropLexExact(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_lex_exact')
@@ -1121,6 +1273,9 @@ class PropLexExact(AbstractFeature):
 
 
 class PropLexSyn(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_lex_syn')
@@ -1145,6 +1300,9 @@ class PropLexSyn(AbstractFeature):
 
 
 class PropLexPara(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_lex_para')
@@ -1169,6 +1327,9 @@ class PropLexPara(AbstractFeature):
 
 
 class PropLexDistrib(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_lex_distrib')
@@ -1199,6 +1360,9 @@ class PropLexDistrib(AbstractFeature):
 ########################################################################################################################
 
 class AvgPenExactCandidate(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'avg_pen_exact_candidate')
@@ -1208,45 +1372,24 @@ class AvgPenExactCandidate(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            word_candidate = cand['parse'][index[0] - 1]
-            word_reference = ref['parse'][index[1] - 1]
-
-            if word_sim.word_relatedness_feature(word_candidate, word_reference) == 'Exact' \
-                    and not word_sim.comparePos(word_candidate.pos, word_reference.pos) == 'None':
-
-                for dep_label in cand['alignments'][2][i]['srcDiff']:
-                    if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                        difference += 1
-
-                for dep_label in cand['alignments'][2][i]['srcCon']:
-                    if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                        context += 1
-
-                penalty = 0.0
-                if context != 0:
-                    penalty = difference / context * math.log(context + 1.0)
-
-                if penalty > 0:
-                    penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        exact, non_exact = context_penalty.word_masks(arrays, cand, ref)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['srcDiff'], arrays.clean['srcCon'], exact)
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, numpy.mean(penalties))
+            AbstractFeature.set_value(self, float(numpy.mean(penalties)))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class AvgPenExactReference(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'avg_pen_exact_reference')
@@ -1257,45 +1400,24 @@ class AvgPenExactReference(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            word_candidate = cand['parse'][index[0] - 1]
-            word_reference = ref['parse'][index[1] - 1]
-
-            if word_sim.word_relatedness_feature(word_candidate, word_reference) == 'Exact' \
-                    and not word_sim.comparePos(word_candidate.pos, word_reference.pos) == 'None':
-
-                for dep_label in cand['alignments'][2][i]['tgtDiff']:
-                    if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                        difference += 1
-
-                for dep_label in cand['alignments'][2][i]['tgtCon']:
-                    if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                        context += 1
-
-                penalty = 0.0
-                if context != 0:
-                    penalty = difference / context * math.log(context + 1.0)
-
-                if penalty > 0:
-                    penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        exact, non_exact = context_penalty.word_masks(arrays, cand, ref)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['tgtDiff'], arrays.clean['tgtCon'], exact)
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, numpy.mean(penalties))
+            AbstractFeature.set_value(self, float(numpy.mean(penalties)))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class AvgPenNonExactCandidate(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'avg_pen_non_exact_candidate')
@@ -1305,45 +1427,24 @@ class AvgPenNonExactCandidate(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            word_candidate = cand['parse'][index[0] - 1]
-            word_reference = ref['parse'][index[1] - 1]
-
-            if not word_sim.word_relatedness_feature(word_candidate, word_reference) == 'Exact' \
-                    and not word_sim.comparePos(word_candidate.pos, word_reference.pos) == 'Exact':
-
-                for dep_label in cand['alignments'][2][i]['srcDiff']:
-                    if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                        difference += 1
-
-                for dep_label in cand['alignments'][2][i]['srcCon']:
-                    if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                        context += 1
-
-                penalty = 0.0
-                if context != 0:
-                    penalty = difference / context * math.log(context + 1.0)
-
-                if penalty > 0:
-                    penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        exact, non_exact = context_penalty.word_masks(arrays, cand, ref)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['srcDiff'], arrays.clean['srcCon'], non_exact)
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, numpy.mean(penalties))
+            AbstractFeature.set_value(self, float(numpy.mean(penalties)))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class AvgPenNonExactReference(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'avg_pen_non_exact_reference')
@@ -1353,45 +1454,24 @@ class AvgPenNonExactReference(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            word_candidate = cand['parse'][index[0] - 1]
-            word_reference = ref['parse'][index[1] - 1]
-
-            if not word_sim.word_relatedness_feature(word_candidate, word_reference) == 'Exact' \
-                    and not word_sim.comparePos(word_candidate.pos, word_reference.pos) == 'Exact':
-
-                for dep_label in cand['alignments'][2][i]['tgtDiff']:
-                    if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                        difference += 1
-
-                for dep_label in cand['alignments'][2][i]['tgtCon']:
-                    if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                        context += 1
-
-                penalty = 0.0
-                if context != 0:
-                    penalty = difference / context * math.log(context + 1.0)
-
-                if penalty > 0:
-                    penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        exact, non_exact = context_penalty.word_masks(arrays, cand, ref)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['tgtDiff'], arrays.clean['tgtCon'], non_exact)
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, numpy.mean(penalties))
+            AbstractFeature.set_value(self, float(numpy.mean(penalties)))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class PropPenExactCandidate(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pen_exact_candidate')
@@ -1401,25 +1481,14 @@ class PropPenExactCandidate(AbstractFeature):
 
     def run(self, cand, ref):
 
-        counter_words = 0
-        counter_penalties = 0
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            word_candidate = cand['parse'][index[0] - 1]
-            word_reference = ref['parse'][index[1] - 1]
-
-            if word_sim.word_relatedness_feature(word_candidate, word_reference) == 'Exact' \
-                    and not word_sim.comparePos(word_candidate.pos, word_reference.pos) == 'None':
-
-                counter_words += 1
-
-                if len(cand['alignments'][2][i]['srcDiff']) > 0:
-                    counter_penalties += 1
+        arrays = context_penalty.sentence_arrays(cand)
+        exact, non_exact = context_penalty.word_masks(arrays, cand, ref)
+        counter_words = numpy.count_nonzero(exact)
+        counter_penalties = numpy.count_nonzero(exact & (arrays.raw['srcDiff'] > 0))
 
         if counter_words > 0:
             AbstractFeature.set_value(self, counter_penalties / float(counter_words))
@@ -1428,6 +1497,9 @@ class PropPenExactCandidate(AbstractFeature):
 
 
 class PropPenExactReference(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pen_exact_reference')
@@ -1437,25 +1509,14 @@ class PropPenExactReference(AbstractFeature):
 
     def run(self, cand, ref):
 
-        counter_words = 0
-        counter_penalties = 0
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            word_candidate = cand['parse'][index[0] - 1]
-            word_reference = ref['parse'][index[1] - 1]
-
-            if word_sim.word_relatedness_feature(word_candidate, word_reference) == 'Exact' \
-                    and not word_sim.comparePos(word_candidate.pos, word_reference.pos) == 'None':
-
-                counter_words += 1
-
-                if len(cand['alignments'][2][i]['tgtDiff']) > 0:
-                    counter_penalties += 1
+        arrays = context_penalty.sentence_arrays(cand)
+        exact, non_exact = context_penalty.word_masks(arrays, cand, ref)
+        counter_words = numpy.count_nonzero(exact)
+        counter_penalties = numpy.count_nonzero(exact & (arrays.raw['tgtDiff'] > 0))
 
         if counter_words > 0:
             AbstractFeature.set_value(self, counter_penalties / float(counter_words))
@@ -1464,6 +1525,9 @@ class PropPenExactReference(AbstractFeature):
 
 
 class PropPenNonExactCandidate(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pen_non_exact_candidate')
@@ -1473,25 +1537,14 @@ class PropPenNonExactCandidate(AbstractFeature):
 
     def run(self, cand, ref):
 
-        counter_words = 0
-        counter_penalties = 0
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            word_candidate = cand['parse'][index[0] - 1]
-            word_reference = ref['parse'][index[1] - 1]
-
-            if not word_sim.word_relatedness_feature(word_candidate, word_reference) == 'Exact' \
-                    and not word_sim.comparePos(word_candidate.pos, word_reference.pos) == 'Exact':
-
-                counter_words += 1
-
-                if len(cand['alignments'][2][i]['srcDiff']) > 0:
-                    counter_penalties += 1
+        arrays = context_penalty.sentence_arrays(cand)
+        exact, non_exact = context_penalty.word_masks(arrays, cand, ref)
+        counter_words = numpy.count_nonzero(non_exact)
+        counter_penalties = numpy.count_nonzero(non_exact & (arrays.raw['srcDiff'] > 0))
 
         if counter_words > 0:
             AbstractFeature.set_value(self, counter_penalties / float(counter_words))
@@ -1500,6 +1553,9 @@ class PropPenNonExactCandidate(AbstractFeature):
 
 
 class PropPenNonExactReference(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pen_non_exact_reference')
@@ -1509,25 +1565,14 @@ class PropPenNonExactReference(AbstractFeature):
 
     def run(self, cand, ref):
 
-        counter_words = 0
-        counter_penalties = 0
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            word_candidate = cand['parse'][index[0] - 1]
-            word_reference = ref['parse'][index[1] - 1]
-
-            if not word_sim.word_relatedness_feature(word_candidate, word_reference) == 'Exact' \
-                    and not word_sim.comparePos(word_candidate.pos, word_reference.pos) == 'Exact':
-
-                counter_words += 1
-
-                if len(cand['alignments'][2][i]['tgtDiff']) > 0:
-                    counter_penalties += 1
+        arrays = context_penalty.sentence_arrays(cand)
+        exact, non_exact = context_penalty.word_masks(arrays, cand, ref)
+        counter_words = numpy.count_nonzero(non_exact)
+        counter_penalties = numpy.count_nonzero(non_exact & (arrays.raw['tgtDiff'] > 0))
 
         if counter_words > 0:
             AbstractFeature.set_value(self, counter_penalties / float(counter_words))
@@ -1536,6 +1581,9 @@ class PropPenNonExactReference(AbstractFeature):
 
 
 class AvgPenCandidate(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'avg_pen_candidate')
@@ -1545,39 +1593,23 @@ class AvgPenCandidate(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            for dep_label in cand['alignments'][2][i]['srcDiff']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    difference += 1
-
-            for dep_label in cand['alignments'][2][i]['srcCon']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    context += 1
-
-            penalty = 0.0
-            if context != 0:
-                penalty = difference / context * math.log(context + 1.0)
-
-            if penalty > 0:
-                penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['srcDiff'], arrays.clean['srcCon'])
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, numpy.mean(penalties))
+            AbstractFeature.set_value(self, float(numpy.mean(penalties)))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class AvgPentReference(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'avg_pen_reference')
@@ -1587,39 +1619,23 @@ class AvgPentReference(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            for dep_label in cand['alignments'][2][i]['tgtDiff']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    difference += 1
-
-            for dep_label in cand['alignments'][2][i]['tgtCon']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    context += 1
-
-            penalty = 0.0
-            if context != 0:
-                penalty = difference / context * math.log(context + 1.0)
-
-            if penalty > 0:
-                penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['tgtDiff'], arrays.clean['tgtCon'])
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, numpy.mean(penalties))
+            AbstractFeature.set_value(self, float(numpy.mean(penalties)))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class MinPenCandidate(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'min_pen_candidate')
@@ -1629,39 +1645,23 @@ class MinPenCandidate(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            for dep_label in cand['alignments'][2][i]['srcDiff']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    difference += 1
-
-            for dep_label in cand['alignments'][2][i]['srcCon']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    context += 1
-
-            penalty = 0.0
-            if context != 0:
-                penalty = difference / context * math.log(context + 1.0)
-
-            if penalty > 0:
-                penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['srcDiff'], arrays.clean['srcCon'])
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, min(penalties))
+            AbstractFeature.set_value(self, float(penalties.min()))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class MinPentReference(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'min_pen_reference')
@@ -1671,39 +1671,23 @@ class MinPentReference(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            for dep_label in cand['alignments'][2][i]['tgtDiff']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    difference += 1
-
-            for dep_label in cand['alignments'][2][i]['tgtCon']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    context += 1
-
-            penalty = 0.0
-            if context != 0:
-                penalty = difference / context * math.log(context + 1.0)
-
-            if penalty > 0:
-                penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['tgtDiff'], arrays.clean['tgtCon'])
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, min(penalties))
+            AbstractFeature.set_value(self, float(penalties.min()))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class MaxPenCandidate(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'max_pen_candidate')
@@ -1713,39 +1697,23 @@ class MaxPenCandidate(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            for dep_label in cand['alignments'][2][i]['srcDiff']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    difference += 1
-
-            for dep_label in cand['alignments'][2][i]['srcCon']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    context += 1
-
-            penalty = 0.0
-            if context != 0:
-                penalty = difference / context * math.log(context + 1.0)
-
-            if penalty > 0:
-                penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['srcDiff'], arrays.clean['srcCon'])
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, max(penalties))
+            AbstractFeature.set_value(self, float(penalties.max()))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class MaxPentReference(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'max_pen_reference')
@@ -1755,39 +1723,23 @@ class MaxPentReference(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            for dep_label in cand['alignments'][2][i]['tgtDiff']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    difference += 1
-
-            for dep_label in cand['alignments'][2][i]['tgtCon']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    context += 1
-
-            penalty = 0.0
-            if context != 0:
-                penalty = difference / context * math.log(context + 1.0)
-
-            if penalty > 0:
-                penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['tgtDiff'], arrays.clean['tgtCon'])
 
         if len(penalties) > 0:
-            AbstractFeature.set_value(self, max(penalties))
+            AbstractFeature.set_value(self, float(penalties.max()))
         else:
             AbstractFeature.set_value(self, 0)
 
 
 class PropPen(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pen')
@@ -1800,23 +1752,16 @@ class PropPen(AbstractFeature):
             AbstractFeature.set_value(self, -1)
             return
 
-        counter_penalties = 0.0
-        counter_words = 0.0
-
-        for i, index in enumerate(cand['alignments'][0]):
+        arrays = context_penalty.sentence_arrays(cand)
+        counter_penalties = numpy.count_nonzero((arrays.raw['srcDiff'] > 0) | (arrays.raw['tgtDiff'] > 0))
 
-            counter_words += 1
+        AbstractFeature.set_value(self, counter_penalties / float(len(arrays)))
 
-            if len(cand['alignments'][2][i]['srcDiff']) > 0 or len(cand['alignments'][2][i]['tgtDiff']) > 0:
-                counter_penalties += 1
 
-        if counter_words > 0:
-            AbstractFeature.set_value(self, counter_penalties / float(counter_words))
-        else:
-            AbstractFeature.set_value(self, 0.0)
+class CountPen(AbstractFeature):
 
+    requires = ['alignments']
 
-class CountPen(AbstractFeature):
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_pen')
@@ -1829,17 +1774,16 @@ class CountPen(AbstractFeature):
             AbstractFeature.set_value(self, -1)
             return
 
-        counter_penalties = 0.0
+        arrays = context_penalty.sentence_arrays(cand)
+        counter_penalties = numpy.count_nonzero((arrays.raw['srcDiff'] > 0) | (arrays.raw['tgtDiff'] > 0))
 
-        for i, index in enumerate(cand['alignments'][0]):
+        AbstractFeature.set_value(self, float(counter_penalties))
 
-            if len(cand['alignments'][2][i]['srcDiff']) > 0 or len(cand['alignments'][2][i]['tgtDiff']) > 0:
-                counter_penalties += 1
 
-        AbstractFeature.set_value(self, counter_penalties)
+class PropPenHigh(AbstractFeature):
 
+    requires = ['alignments', 'tokens']
 
-class PropPenHigh(AbstractFeature):
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pen_high')
@@ -1851,38 +1795,15 @@ class PropPenHigh(AbstractFeature):
 
     def run(self, cand, ref):
 
-        my_scorer = Scorer()
-        difference = 0.0
-        context = 0.0
-        penalties = []
-
         if len(cand['alignments'][0]) == 0:
             AbstractFeature.set_value(self, -1)
             return
 
-        for i, index in enumerate(cand['alignments'][0]):
-
-            for dep_label in cand['alignments'][2][i]['tgtDiff']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    difference += 1
-
-            for dep_label in cand['alignments'][2][i]['tgtCon']:
-                if not dep_label.split('_')[0] in my_scorer.noisy_types:
-                    context += 1
-
-            penalty = 0.0
-            if context != 0:
-                penalty = difference / context * math.log(context + 1.0)
-
-            if penalty > 0:
-                penalties.append(penalty)
+        arrays = context_penalty.sentence_arrays(cand)
+        penalties = context_penalty.cumulative_penalties(arrays.clean['tgtDiff'], arrays.clean['tgtCon'])
 
         avg_pen = 1.0
-        count_high = 0
-
-        for pen in penalties:
-            if pen > avg_pen:
-                count_high += 1
+        count_high = numpy.count_nonzero(penalties > avg_pen)
 
         AbstractFeature.set_value(self, count_high / float(len(cand['tokens'])))
 
@@ -1895,6 +1816,9 @@ class PropPenHigh(AbstractFeature):
 
 
 class FragmentationPenalty(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'fragmentation_penalty')
@@ -1928,6 +1852,9 @@ class FragmentationPenalty(AbstractFeature):
 
 
 class FragmentationPenaltyParametrized(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'fragmentation_penalty_parametrized')
@@ -1949,6 +1876,9 @@ class FragmentationPenaltyParametrized(AbstractFeature):
 
 
 class CountChunks(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_chunks')
@@ -1963,6 +1893,8 @@ class CountChunks(AbstractFeature):
 
 class MeteorPrecision(AbstractFeature):
 
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_precision_parametrized')
@@ -2013,6 +1945,8 @@ class MeteorPrecision(AbstractFeature):
 
 class MeteorRecall(AbstractFeature):
 
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_recall_parametrized')
@@ -2052,6 +1986,8 @@ class MeteorRecall(AbstractFeature):
 
 class MeteorF(AbstractFeature):
 
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_f_parametrized')
@@ -2098,6 +2034,9 @@ class MeteorF(AbstractFeature):
 
 
 class MeteorPropExactCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_exact_candidate')
@@ -2121,6 +2060,9 @@ class MeteorPropExactCandidate(AbstractFeature):
 
 
 class MeteorPropExactReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_exact_reference')
@@ -2144,6 +2086,9 @@ class MeteorPropExactReference(AbstractFeature):
 
 
 class MeteorPropExactContentCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_exact_content_candidate')
@@ -2164,6 +2109,9 @@ class MeteorPropExactContentCandidate(AbstractFeature):
 
 
 class MeteorPropExactContentReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_exact_content_reference')
@@ -2184,6 +2132,9 @@ class MeteorPropExactContentReference(AbstractFeature):
 
 
 class MeteorPropExactFunctionCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_exact_function_candidate')
@@ -2204,6 +2155,9 @@ class MeteorPropExactFunctionCandidate(AbstractFeature):
 
 
 class MeteorPropExactFunctionReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_exact_function_reference')
@@ -2224,6 +2178,9 @@ class MeteorPropExactFunctionReference(AbstractFeature):
 
 
 class MeteorPropFuzzyCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_fuzzy_candidate')
@@ -2246,7 +2203,10 @@ class MeteorPropFuzzyCandidate(AbstractFeature):
             AbstractFeature.set_value(self, -1)
 
 
-class MeteorPropFuzzyReference(AbstractFeature):
+class MeteorPropFuzzyReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_fuzzy_reference')
@@ -2270,6 +2230,9 @@ class MeteorPropFuzzyReference(AbstractFeature):
 
 
 class MeteorPropFuzzyContentCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_fuzzy_content_candidate')
@@ -2290,6 +2253,9 @@ class MeteorPropFuzzyContentCandidate(AbstractFeature):
 
 
 class MeteorPropFuzzyContentReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_fuzzy_content_reference')
@@ -2310,6 +2276,9 @@ class MeteorPropFuzzyContentReference(AbstractFeature):
 
 
 class MeteorPropFuzzyFunctionCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_fuzzy_function_candidate')
@@ -2330,6 +2299,9 @@ class MeteorPropFuzzyFunctionCandidate(AbstractFeature):
 
 
 class MeteorPropFuzzyFunctionReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_fuzzy_function_reference')
@@ -2350,6 +2322,9 @@ class MeteorPropFuzzyFunctionReference(AbstractFeature):
 
 
 class MeteorPropStemCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_stem_candidate')
@@ -2373,6 +2348,9 @@ class MeteorPropStemCandidate(AbstractFeature):
 
 
 class MeteorPropStemReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_stem_reference')
@@ -2396,6 +2374,9 @@ class MeteorPropStemReference(AbstractFeature):
 
 
 class MeteorPropStemContentCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_stem_content_candidate')
@@ -2416,6 +2397,9 @@ class MeteorPropStemContentCandidate(AbstractFeature):
 
 
 class MeteorPropStemContentReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_stem_content_reference')
@@ -2436,6 +2420,9 @@ class MeteorPropStemContentReference(AbstractFeature):
 
 
 class MeteorPropStemFunctionCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_stem_function_candidate')
@@ -2456,6 +2443,9 @@ class MeteorPropStemFunctionCandidate(AbstractFeature):
 
 
 class MeteorPropStemFunctionReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_stem_function_reference')
@@ -2476,6 +2466,9 @@ class MeteorPropStemFunctionReference(AbstractFeature):
 
 
 class MeteorPropSynonymCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_synonym_candidate')
@@ -2499,6 +2492,9 @@ class MeteorPropSynonymCandidate(AbstractFeature):
 
 
 class MeteorPropSynonymReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_synonym_reference')
@@ -2522,6 +2518,9 @@ class MeteorPropSynonymReference(AbstractFeature):
 
 
 class MeteorPropSynonymContentCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_synonym_content_candidate')
@@ -2543,6 +2542,9 @@ class MeteorPropSynonymContentCandidate(AbstractFeature):
 
 
 class MeteorPropSynonymContentReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_synonym_content_reference')
@@ -2564,6 +2566,9 @@ class MeteorPropSynonymContentReference(AbstractFeature):
 
 
 class MeteorPropSynonymFunctionCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_synonym_function_candidate')
@@ -2585,6 +2590,9 @@ class MeteorPropSynonymFunctionCandidate(AbstractFeature):
 
 
 class MeteorPropSynonymFunctionReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_synonym_function_reference')
@@ -2606,6 +2614,9 @@ class MeteorPropSynonymFunctionReference(AbstractFeature):
 
 
 class MeteorPropParaphraseCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_paraphrase_candidate')
@@ -2629,6 +2640,9 @@ class MeteorPropParaphraseCandidate(AbstractFeature):
 
 
 class MeteorPropParaphraseReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_paraphrase_reference')
@@ -2652,6 +2666,9 @@ class MeteorPropParaphraseReference(AbstractFeature):
 
 
 class MeteorPropParaphraseContentCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_paraphrase_content_candidate')
@@ -2673,6 +2690,9 @@ class MeteorPropParaphraseContentCandidate(AbstractFeature):
 
 
 class MeteorPropParaphraseContentReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_paraphrase_content_reference')
@@ -2694,6 +2714,9 @@ class MeteorPropParaphraseContentReference(AbstractFeature):
 
 
 class MeteorPropParaphraseFunctionCandidate(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_paraphrase_function_candidate')
@@ -2715,6 +2738,9 @@ class MeteorPropParaphraseFunctionCandidate(AbstractFeature):
 
 
 class MeteorPropParaphraseFunctionReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor_prop_paraphrase_function_reference')
@@ -2742,6 +2768,9 @@ class MeteorPropParaphraseFunctionReference(AbstractFeature):
 ########################################################################################################################
 
 class BleuPrecisionUnigram(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'bleu_precision_unigram')
@@ -2760,6 +2789,9 @@ class BleuPrecisionUnigram(AbstractFeature):
 
 
 class BleuPrecisionBigram(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'bleu_precision_bigram')
@@ -2778,6 +2810,9 @@ class BleuPrecisionBigram(AbstractFeature):
 
 
 class BleuPrecisionTrigram(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'bleu_precision_trigram')
@@ -2796,6 +2831,9 @@ class BleuPrecisionTrigram(AbstractFeature):
 
 
 class BleuPrecisionFourgram(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'bleu_precision_fourgram')
@@ -2814,6 +2852,9 @@ class BleuPrecisionFourgram(AbstractFeature):
 
 
 class BleuBrevityPenalty(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'bleu_brevity_penalty')
@@ -2834,6 +2875,8 @@ class BleuBrevityPenalty(AbstractFeature):
 
 class PropNouns(AbstractFeature):
 
+    requires = ['parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_nouns')
@@ -2852,6 +2895,8 @@ class PropNouns(AbstractFeature):
 
 class PropAdjectives(AbstractFeature):
 
+    requires = ['parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_adjectives')
@@ -2870,6 +2915,8 @@ class PropAdjectives(AbstractFeature):
 
 class PropVerbs(AbstractFeature):
 
+    requires = ['parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_verbs')
@@ -2888,6 +2935,8 @@ class PropVerbs(AbstractFeature):
 
 class PropVerbsFlex(AbstractFeature):
 
+    requires = ['parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_verbs_flex')
@@ -2906,6 +2955,8 @@ class PropVerbsFlex(AbstractFeature):
 
 class PropNounsNonAlignedCand(AbstractFeature):
 
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_nouns_non_aligned_cand')
@@ -2925,6 +2976,8 @@ class PropNounsNonAlignedCand(AbstractFeature):
 
 class PropNounsNonAlignedRef(AbstractFeature):
 
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_nouns_non_aligned_ref')
@@ -2944,6 +2997,8 @@ class PropNounsNonAlignedRef(AbstractFeature):
 
 class PropAdjectivesNonAlignedCand(AbstractFeature):
 
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_adjectives_non_aligned_cand')
@@ -2963,6 +3018,8 @@ class PropAdjectivesNonAlignedCand(AbstractFeature):
 
 class PropAdjectivesNonAlignedRef(AbstractFeature):
 
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_adjectives_non_aligned_ref')
@@ -2982,6 +3039,8 @@ class PropAdjectivesNonAlignedRef(AbstractFeature):
 
 class PropVerbsNonAlignedCand(AbstractFeature):
 
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_verbs_non_aligned_cand')
@@ -3001,6 +3060,8 @@ class PropVerbsNonAlignedCand(AbstractFeature):
 
 class PropVerbsNonAlignedRef(AbstractFeature):
 
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_verbs_non_aligned_ref')
@@ -3020,6 +3081,8 @@ class PropVerbsNonAlignedRef(AbstractFeature):
 
 class PropVerbsFlexNonAlignedCand(AbstractFeature):
 
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_verbs_flex_non_aligned_cand')
@@ -3039,6 +3102,8 @@ class PropVerbsFlexNonAlignedCand(AbstractFeature):
 
 class PropVerbsFlexNonAlignedRef(AbstractFeature):
 
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_verbs_flex_non_aligned_ref')
@@ -3057,6 +3122,9 @@ class PropVerbsFlexNonAlignedRef(AbstractFeature):
 
 
 class BackoffNonAlignedAvg(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_non_aligned_avg')
@@ -3065,7 +3133,7 @@ class BackoffNonAlignedAvg(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3080,7 +3148,7 @@ class BackoffNonAlignedAvg(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1015'])
+                backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.mean(backoffs))
@@ -3090,6 +3158,8 @@ class BackoffNonAlignedAvg(AbstractFeature):
 
 class BackoffNonAlignedMin(AbstractFeature):
 
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_non_aligned_min')
@@ -3098,7 +3168,7 @@ class BackoffNonAlignedMin(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3113,7 +3183,7 @@ class BackoffNonAlignedMin(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1015'])
+                backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, min(backoffs))
@@ -3122,6 +3192,9 @@ class BackoffNonAlignedMin(AbstractFeature):
 
 
 class BackoffNonAlignedMax(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_non_aligned_max')
@@ -3130,7 +3203,7 @@ class BackoffNonAlignedMax(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3145,7 +3218,7 @@ class BackoffNonAlignedMax(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1015'])
+                backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, max(backoffs))
@@ -3154,6 +3227,9 @@ class BackoffNonAlignedMax(AbstractFeature):
 
 
 class BackoffNonAlignedMedian(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_non_aligned_median')
@@ -3162,7 +3238,7 @@ class BackoffNonAlignedMedian(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3177,7 +3253,7 @@ class BackoffNonAlignedMedian(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1015'])
+                backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, max(backoffs))
@@ -3186,6 +3262,9 @@ class BackoffNonAlignedMedian(AbstractFeature):
 
 
 class BackoffNonAlignedMode(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_non_aligned_mode')
@@ -3194,7 +3273,7 @@ class BackoffNonAlignedMode(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3209,7 +3288,7 @@ class BackoffNonAlignedMode(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1015'])
+                backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt == 0:
             AbstractFeature.set_value(self, -1)
@@ -3227,6 +3306,9 @@ class BackoffNonAlignedMode(AbstractFeature):
 
 
 class BackoffBackNonAlignedAvg(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_non_aligned_avg')
@@ -3235,7 +3317,7 @@ class BackoffBackNonAlignedAvg(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3250,7 +3332,7 @@ class BackoffBackNonAlignedAvg(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1041'])
+                backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.mean(backoffs))
@@ -3259,6 +3341,9 @@ class BackoffBackNonAlignedAvg(AbstractFeature):
 
 
 class BackoffBackNonAlignedMin(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_non_aligned_min')
@@ -3267,7 +3352,7 @@ class BackoffBackNonAlignedMin(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3282,7 +3367,7 @@ class BackoffBackNonAlignedMin(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1041'])
+                backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.min(backoffs))
@@ -3291,6 +3376,9 @@ class BackoffBackNonAlignedMin(AbstractFeature):
 
 
 class BackoffBackNonAlignedMax(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_non_aligned_max')
@@ -3299,7 +3387,7 @@ class BackoffBackNonAlignedMax(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3314,7 +3402,7 @@ class BackoffBackNonAlignedMax(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1041'])
+                backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.max(backoffs))
@@ -3323,6 +3411,9 @@ class BackoffBackNonAlignedMax(AbstractFeature):
 
 
 class BackoffBackNonAlignedMedian(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_non_aligned_median')
@@ -3331,7 +3422,7 @@ class BackoffBackNonAlignedMedian(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3346,7 +3437,7 @@ class BackoffBackNonAlignedMedian(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1041'])
+                backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.median(backoffs))
@@ -3355,6 +3446,9 @@ class BackoffBackNonAlignedMedian(AbstractFeature):
 
 
 class BackoffBackNonAlignedMode(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_non_aligned_mode')
@@ -3363,7 +3457,7 @@ class BackoffBackNonAlignedMode(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3378,7 +3472,7 @@ class BackoffBackNonAlignedMode(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1041'])
+                backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt == 0:
             AbstractFeature.set_value(self, -1)
@@ -3396,6 +3490,9 @@ class BackoffBackNonAlignedMode(AbstractFeature):
 
 
 class BackoffAvg(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_avg')
@@ -3404,7 +3501,7 @@ class BackoffAvg(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3419,7 +3516,7 @@ class BackoffAvg(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1015'])
+            backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.mean(backoffs))
@@ -3428,6 +3525,9 @@ class BackoffAvg(AbstractFeature):
 
 
 class BackoffMin(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_min')
@@ -3436,7 +3536,7 @@ class BackoffMin(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3450,7 +3550,7 @@ class BackoffMin(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1015'])
+            backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, min(backoffs))
@@ -3459,6 +3559,9 @@ class BackoffMin(AbstractFeature):
 
 
 class BackoffMax(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_max')
@@ -3467,7 +3570,7 @@ class BackoffMax(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3481,7 +3584,7 @@ class BackoffMax(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1015'])
+            backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, max(backoffs))
@@ -3490,6 +3593,9 @@ class BackoffMax(AbstractFeature):
 
 
 class BackoffMedian(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_median')
@@ -3498,7 +3604,7 @@ class BackoffMedian(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3512,7 +3618,7 @@ class BackoffMedian(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1015'])
+            backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, max(backoffs))
@@ -3521,6 +3627,9 @@ class BackoffMedian(AbstractFeature):
 
 
 class BackoffMode(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_mode')
@@ -3529,7 +3638,7 @@ class BackoffMode(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3543,7 +3652,7 @@ class BackoffMode(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1015'])
+            backoffs.append(cand['quest_word']['WCE1015'][i])
 
         if cnt == 0:
             AbstractFeature.set_value(self, -1)
@@ -3561,6 +3670,9 @@ class BackoffMode(AbstractFeature):
 
 
 class BackoffBackAvg(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_avg')
@@ -3569,7 +3681,7 @@ class BackoffBackAvg(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3583,7 +3695,7 @@ class BackoffBackAvg(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1041'])
+            backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.mean(backoffs))
@@ -3592,6 +3704,9 @@ class BackoffBackAvg(AbstractFeature):
 
 
 class BackoffBackMin(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_min')
@@ -3600,7 +3715,7 @@ class BackoffBackMin(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3614,7 +3729,7 @@ class BackoffBackMin(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1041'])
+            backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.min(backoffs))
@@ -3623,6 +3738,9 @@ class BackoffBackMin(AbstractFeature):
 
 
 class BackoffBackMax(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_max')
@@ -3631,7 +3749,7 @@ class BackoffBackMax(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3645,7 +3763,7 @@ class BackoffBackMax(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1041'])
+            backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.max(backoffs))
@@ -3654,6 +3772,9 @@ class BackoffBackMax(AbstractFeature):
 
 
 class BackoffBackMedian(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_median')
@@ -3662,7 +3783,7 @@ class BackoffBackMedian(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3676,7 +3797,7 @@ class BackoffBackMedian(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1041'])
+            backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.median(backoffs))
@@ -3686,6 +3807,8 @@ class BackoffBackMedian(AbstractFeature):
 
 class BackoffBackMode(AbstractFeature):
 
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_back_mode')
@@ -3694,7 +3817,7 @@ class BackoffBackMode(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1041']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3708,7 +3831,7 @@ class BackoffBackMode(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1041'])
+            backoffs.append(cand['quest_word']['WCE1041'][i])
 
         if cnt == 0:
             AbstractFeature.set_value(self, -1)
@@ -3727,6 +3850,8 @@ class BackoffBackMode(AbstractFeature):
 
 class LongestNgramNonAlignedAvg(AbstractFeature):
 
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_non_aligned_avg')
@@ -3735,7 +3860,7 @@ class LongestNgramNonAlignedAvg(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3750,7 +3875,7 @@ class LongestNgramNonAlignedAvg(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1037'])
+                backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.mean(backoffs))
@@ -3760,6 +3885,8 @@ class LongestNgramNonAlignedAvg(AbstractFeature):
 
 class LongestNgramNonAlignedMin(AbstractFeature):
 
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_non_aligned_min')
@@ -3768,7 +3895,7 @@ class LongestNgramNonAlignedMin(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3783,7 +3910,7 @@ class LongestNgramNonAlignedMin(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1037'])
+                backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.min(backoffs))
@@ -3793,6 +3920,8 @@ class LongestNgramNonAlignedMin(AbstractFeature):
 
 class LongestNgramNonAlignedMax(AbstractFeature):
 
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_non_aligned_max')
@@ -3801,7 +3930,7 @@ class LongestNgramNonAlignedMax(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3816,7 +3945,7 @@ class LongestNgramNonAlignedMax(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1037'])
+                backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.max(backoffs))
@@ -3826,6 +3955,8 @@ class LongestNgramNonAlignedMax(AbstractFeature):
 
 class LongestNgramNonAlignedMedian(AbstractFeature):
 
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_non_aligned_median')
@@ -3834,7 +3965,7 @@ class LongestNgramNonAlignedMedian(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3849,7 +3980,7 @@ class LongestNgramNonAlignedMedian(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1037'])
+                backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.median(backoffs))
@@ -3859,6 +3990,8 @@ class LongestNgramNonAlignedMedian(AbstractFeature):
 
 class LongestNgramNonAlignedMode(AbstractFeature):
 
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_non_aligned_mode')
@@ -3867,7 +4000,7 @@ class LongestNgramNonAlignedMode(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3882,7 +4015,7 @@ class LongestNgramNonAlignedMode(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                backoffs.append(cand['quest_word'][i]['WCE1037'])
+                backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt == 0:
             AbstractFeature.set_value(self, -1)
@@ -3901,6 +4034,8 @@ class LongestNgramNonAlignedMode(AbstractFeature):
 
 class LongestNgramAvg(AbstractFeature):
 
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_avg')
@@ -3909,7 +4044,7 @@ class LongestNgramAvg(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3923,7 +4058,7 @@ class LongestNgramAvg(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1037'])
+            backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.mean(backoffs))
@@ -3933,6 +4068,8 @@ class LongestNgramAvg(AbstractFeature):
 
 class LongestNgramMin(AbstractFeature):
 
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_min')
@@ -3941,7 +4078,7 @@ class LongestNgramMin(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3955,7 +4092,7 @@ class LongestNgramMin(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1037'])
+            backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.min(backoffs))
@@ -3964,6 +4101,9 @@ class LongestNgramMin(AbstractFeature):
 
 
 class LongestNgramMax(AbstractFeature):
+
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_max')
@@ -3972,7 +4112,7 @@ class LongestNgramMax(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -3986,7 +4126,7 @@ class LongestNgramMax(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1037'])
+            backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.max(backoffs))
@@ -3996,6 +4136,8 @@ class LongestNgramMax(AbstractFeature):
 
 class LongestNgramMedian(AbstractFeature):
 
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_median')
@@ -4004,7 +4146,7 @@ class LongestNgramMedian(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -4018,7 +4160,7 @@ class LongestNgramMedian(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1037'])
+            backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt > 0:
             AbstractFeature.set_value(self, numpy.median(backoffs))
@@ -4028,6 +4170,8 @@ class LongestNgramMedian(AbstractFeature):
 
 class LongestNgramMode(AbstractFeature):
 
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'longest_ngram_mode')
@@ -4036,7 +4180,7 @@ class LongestNgramMode(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1037']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         backoffs = []
@@ -4050,7 +4194,7 @@ class LongestNgramMode(AbstractFeature):
                 continue
 
             cnt += 1
-            backoffs.append(cand['quest_word'][i]['WCE1037'])
+            backoffs.append(cand['quest_word']['WCE1037'][i])
 
         if cnt == 0:
             AbstractFeature.set_value(self, -1)
@@ -4068,6 +4212,9 @@ class LongestNgramMode(AbstractFeature):
 
 
 class BackoffDirectAvg(AbstractFeature):
+
+    requires = ['language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_direct_avg')
@@ -4099,6 +4246,9 @@ class BackoffDirectAvg(AbstractFeature):
 
 
 class POSBackoffDirectAvg(AbstractFeature):
+
+    requires = ['pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_backoff_direct_avg')
@@ -4130,6 +4280,9 @@ class POSBackoffDirectAvg(AbstractFeature):
 
 
 class BackoffDirectMedian(AbstractFeature):
+
+    requires = ['language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_direct_median')
@@ -4161,6 +4314,9 @@ class BackoffDirectMedian(AbstractFeature):
 
 
 class POSBackoffDirectMedian(AbstractFeature):
+
+    requires = ['pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_backoff_direct_median')
@@ -4193,6 +4349,8 @@ class POSBackoffDirectMedian(AbstractFeature):
 
 class BackoffDirectMin(AbstractFeature):
 
+    requires = ['language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_direct_min')
@@ -4225,6 +4383,8 @@ class BackoffDirectMin(AbstractFeature):
 
 class POSBackoffDirectMin(AbstractFeature):
 
+    requires = ['pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_backoff_direct_min')
@@ -4257,6 +4417,8 @@ class POSBackoffDirectMin(AbstractFeature):
 
 class BackoffDirectMax(AbstractFeature):
 
+    requires = ['language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_direct_max')
@@ -4289,6 +4451,8 @@ class BackoffDirectMax(AbstractFeature):
 
 class POSBackoffDirectMax(AbstractFeature):
 
+    requires = ['pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_backoff_direct_max')
@@ -4321,6 +4485,8 @@ class POSBackoffDirectMax(AbstractFeature):
 
 class BackoffDirectMode(AbstractFeature):
 
+    requires = ['language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'backoff_direct_mode')
@@ -4361,6 +4527,8 @@ class BackoffDirectMode(AbstractFeature):
 
 class POSBackoffDirectMode(AbstractFeature):
 
+    requires = ['pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_backoff_direct_mode')
@@ -4401,6 +4569,8 @@ class POSBackoffDirectMode(AbstractFeature):
 
 class BackDirectNonAlignedAvg(AbstractFeature):
 
+    requires = ['alignments', 'language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'back_direct_non_aligned_avg')
@@ -4440,6 +4610,8 @@ class BackDirectNonAlignedAvg(AbstractFeature):
 
 class POSBackDirectNonAlignedAvg(AbstractFeature):
 
+    requires = ['alignments', 'pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_back_direct_non_aligned_avg')
@@ -4479,6 +4651,8 @@ class POSBackDirectNonAlignedAvg(AbstractFeature):
 
 class BackDirectNonAlignedMedian(AbstractFeature):
 
+    requires = ['alignments', 'language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'back_direct_non_aligned_median')
@@ -4518,6 +4692,8 @@ class BackDirectNonAlignedMedian(AbstractFeature):
 
 class POSBackDirectNonAlignedMedian(AbstractFeature):
 
+    requires = ['alignments', 'pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_back_direct_non_aligned_median')
@@ -4557,6 +4733,8 @@ class POSBackDirectNonAlignedMedian(AbstractFeature):
 
 class BackDirectNonAlignedMin(AbstractFeature):
 
+    requires = ['alignments', 'language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'back_direct_non_aligned_min')
@@ -4596,6 +4774,8 @@ class BackDirectNonAlignedMin(AbstractFeature):
 
 class POSBackDirectNonAlignedMin(AbstractFeature):
 
+    requires = ['alignments', 'pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_back_direct_non_aligned_min')
@@ -4635,6 +4815,8 @@ class POSBackDirectNonAlignedMin(AbstractFeature):
 
 class BackDirectNonAlignedMax(AbstractFeature):
 
+    requires = ['alignments', 'language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'back_direct_non_aligned_max')
@@ -4674,6 +4856,8 @@ class BackDirectNonAlignedMax(AbstractFeature):
 
 class POSBackDirectNonAlignedMax(AbstractFeature):
 
+    requires = ['alignments', 'pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_back_direct_non_aligned_max')
@@ -4713,6 +4897,8 @@ class POSBackDirectNonAlignedMax(AbstractFeature):
 
 class BackDirectNonAlignedMode(AbstractFeature):
 
+    requires = ['alignments', 'language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'back_direct_non_aligned_mode')
@@ -4761,6 +4947,8 @@ class BackDirectNonAlignedMode(AbstractFeature):
 
 class POSBackDirectNonAlignedMode(AbstractFeature):
 
+    requires = ['alignments', 'pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_back_direct_non_aligned_mode')
@@ -4808,6 +4996,8 @@ class POSBackDirectNonAlignedMode(AbstractFeature):
 
 class CountShortNgramNonAligned(AbstractFeature):
 
+    requires = ['alignments', 'language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_short_ngram_non_aligned')
@@ -4838,6 +5028,8 @@ class CountShortNgramNonAligned(AbstractFeature):
 
 class POSCountShortNgramNonAligned(AbstractFeature):
 
+    requires = ['alignments', 'pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_count_short_ngram_non_aligned')
@@ -4868,6 +5060,8 @@ class POSCountShortNgramNonAligned(AbstractFeature):
 
 class PropShortNgramNonAligned(AbstractFeature):
 
+    requires = ['alignments', 'language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_short_ngram_non_aligned')
@@ -4898,6 +5092,8 @@ class PropShortNgramNonAligned(AbstractFeature):
 
 class POSPropShortNgramNonAligned(AbstractFeature):
 
+    requires = ['alignments', 'pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_prop_short_ngram_non_aligned')
@@ -4928,6 +5124,8 @@ class POSPropShortNgramNonAligned(AbstractFeature):
 
 class POSPropLowProb(AbstractFeature):
 
+    requires = ['parse', 'pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_prop_low_prob')
@@ -4947,6 +5145,9 @@ class POSPropLowProb(AbstractFeature):
 
 
 class POSCountLowProb(AbstractFeature):
+
+    requires = ['parse', 'pos_language_model_word_features']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_count_low_prob')
@@ -4966,6 +5167,9 @@ class POSCountLowProb(AbstractFeature):
 
 
 class PropShortNgram(AbstractFeature):
+
+    requires = ['language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_short_ngram')
@@ -4985,6 +5189,9 @@ class PropShortNgram(AbstractFeature):
 
 
 class CountShortNgram(AbstractFeature):
+
+    requires = ['language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_short_ngram')
@@ -5004,6 +5211,9 @@ class CountShortNgram(AbstractFeature):
 
 
 class POSPropShortNgram(AbstractFeature):
+
+    requires = ['pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_prop_short_ngram')
@@ -5023,6 +5233,9 @@ class POSPropShortNgram(AbstractFeature):
 
 
 class POSCountShortNgram(AbstractFeature):
+
+    requires = ['pos_language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_count_short_ngram')
@@ -5042,6 +5255,9 @@ class POSCountShortNgram(AbstractFeature):
 
 
 class CountBackoffLowNonAligned(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_backoff_low_non_aligned')
@@ -5050,7 +5266,7 @@ class CountBackoffLowNonAligned(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         errors = 0
@@ -5065,7 +5281,7 @@ class CountBackoffLowNonAligned(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                if 1 < cand['quest_word'][i]['WCE1015'] <= 4 or 1 < cand['quest_word'][i]['WCE1041'] <= 4:
+                if 1 < cand['quest_word']['WCE1015'][i] <= 4 or 1 < cand['quest_word']['WCE1041'][i] <= 4:
                     errors += 1
 
         if cnt > 0:
@@ -5075,6 +5291,9 @@ class CountBackoffLowNonAligned(AbstractFeature):
 
 
 class PropBackoffLowNonAligned(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_backoff_low_non_aligned')
@@ -5083,7 +5302,7 @@ class PropBackoffLowNonAligned(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         errors = 0
@@ -5098,7 +5317,7 @@ class PropBackoffLowNonAligned(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                if 1 < cand['quest_word'][i]['WCE1015'] <= 4 or 1 < cand['quest_word'][i]['WCE1041'] <= 4:
+                if 1 < cand['quest_word']['WCE1015'][i] <= 4 or 1 < cand['quest_word']['WCE1041'][i] <= 4:
                     errors += 1
 
         if cnt == 0:
@@ -5110,6 +5329,9 @@ class PropBackoffLowNonAligned(AbstractFeature):
 
 
 class CountBackoffMediumNonAligned(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_backoff_medium_non_aligned')
@@ -5118,7 +5340,7 @@ class CountBackoffMediumNonAligned(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         errors = 0
@@ -5133,7 +5355,7 @@ class CountBackoffMediumNonAligned(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                if 4 < cand['quest_word'][i]['WCE1015'] < 7 or 4 < cand['quest_word'][i]['WCE1041'] < 7:
+                if 4 < cand['quest_word']['WCE1015'][i] < 7 or 4 < cand['quest_word']['WCE1041'][i] < 7:
                     errors += 1
 
         if cnt > 0:
@@ -5144,6 +5366,8 @@ class CountBackoffMediumNonAligned(AbstractFeature):
 
 class PropBackoffMediumNonAligned(AbstractFeature):
 
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_backoff_medium_non_aligned')
@@ -5152,7 +5376,7 @@ class PropBackoffMediumNonAligned(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         errors = 0
@@ -5167,7 +5391,7 @@ class PropBackoffMediumNonAligned(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                if 4 < cand['quest_word'][i]['WCE1015'] < 7 or 4 < cand['quest_word'][i]['WCE1041'] < 7:
+                if 4 < cand['quest_word']['WCE1015'][i] < 7 or 4 < cand['quest_word']['WCE1041'][i] < 7:
                     errors += 1
 
         if cnt == 0:
@@ -5179,6 +5403,8 @@ class PropBackoffMediumNonAligned(AbstractFeature):
 
 class CountBackoffHighNonAligned(AbstractFeature):
 
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_backoff_high_non_aligned')
@@ -5187,7 +5413,7 @@ class CountBackoffHighNonAligned(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         errors = 0
@@ -5202,7 +5428,7 @@ class CountBackoffHighNonAligned(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                if cand['quest_word'][i]['WCE1015'] == 7 or cand['quest_word'][i]['WCE1041'] == 7:
+                if cand['quest_word']['WCE1015'][i] == 7 or cand['quest_word']['WCE1041'][i] == 7:
                     errors += 1
 
         if cnt > 0:
@@ -5213,6 +5439,8 @@ class CountBackoffHighNonAligned(AbstractFeature):
 
 class PropBackoffHighNonAligned(AbstractFeature):
 
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_backoff_high_non_aligned')
@@ -5221,7 +5449,7 @@ class PropBackoffHighNonAligned(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         errors = 0
@@ -5236,7 +5464,7 @@ class PropBackoffHighNonAligned(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                if cand['quest_word'][i]['WCE1015'] == 7 or cand['quest_word'][i]['WCE1041'] == 7:
+                if cand['quest_word']['WCE1015'][i] == 7 or cand['quest_word']['WCE1041'][i] == 7:
                     errors += 1
 
         if cnt == 0:
@@ -5248,6 +5476,9 @@ class PropBackoffHighNonAligned(AbstractFeature):
 
 
 class LangModProbSrilm(AbstractFeature):
+
+    requires = ['language_model_sentence_features']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'lang_mod_prob_srilm')
@@ -5258,6 +5489,9 @@ class LangModProbSrilm(AbstractFeature):
         AbstractFeature.set_value(self, cand['language_model_sentence_features'][1])
 
 class POSLangModProbSrilm(AbstractFeature):
+
+    requires = ['pos_language_model_sentence_features']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_lang_mod_prob_srilm')
@@ -5269,6 +5503,9 @@ class POSLangModProbSrilm(AbstractFeature):
 
 
 class LangModPerlexSrilm(AbstractFeature):
+
+    requires = ['language_model_sentence_features']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'lang_mod_perplex_srilm')
@@ -5280,6 +5517,9 @@ class LangModPerlexSrilm(AbstractFeature):
 
 
 class POSLangModPerplexSrilm(AbstractFeature):
+
+    requires = ['pos_language_model_sentence_features']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'pos_lang_mod_perplex_srilm')
@@ -5291,6 +5531,9 @@ class POSLangModPerplexSrilm(AbstractFeature):
 
 
 class LangModProb(AbstractFeature):
+
+    requires = ['quest_sentence']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'lang_mod_prob')
@@ -5302,6 +5545,9 @@ class LangModProb(AbstractFeature):
 
 
 class LangModPerlex(AbstractFeature):
+
+    requires = ['quest_sentence']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'lang_mod_perplex')
@@ -5313,6 +5559,9 @@ class LangModPerlex(AbstractFeature):
 
 
 class LangModPerlex2(AbstractFeature):
+
+    requires = ['quest_sentence']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'lang_mod_perplex2')
@@ -5324,6 +5573,9 @@ class LangModPerlex2(AbstractFeature):
 
 
 class CountNonAlignedOOVSrilm(AbstractFeature):
+
+    requires = ['alignments', 'language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_non_aligned_oov_srilm')
@@ -5359,6 +5611,9 @@ class CountNonAlignedOOVSrilm(AbstractFeature):
 
 
 class PropNonAlignedOOVSrilm(AbstractFeature):
+
+    requires = ['alignments', 'language_model_word_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_non_aligned_oov_srilm')
@@ -5394,6 +5649,9 @@ class PropNonAlignedOOVSrilm(AbstractFeature):
 
 
 class CountNonAlignedOOV(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_non_aligned_oov')
@@ -5402,7 +5660,7 @@ class CountNonAlignedOOV(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         oov = 0
@@ -5417,7 +5675,7 @@ class CountNonAlignedOOV(AbstractFeature):
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
                 cnt += 1
-                if cand['quest_word'][i]['WCE1015'] == 1:
+                if cand['quest_word']['WCE1015'][i] == 1:
                     oov += 1
 
         if cnt > 0:
@@ -5427,6 +5685,9 @@ class CountNonAlignedOOV(AbstractFeature):
 
 
 class PropNonAlignedOOV(AbstractFeature):
+
+    requires = ['alignments', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_non_aligned_oov')
@@ -5435,7 +5696,7 @@ class PropNonAlignedOOV(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         oov = 0
@@ -5448,7 +5709,7 @@ class PropNonAlignedOOV(AbstractFeature):
                 continue
 
             if i + 1 not in [x[0] for x in cand['alignments'][0]]:
-                if cand['quest_word'][i]['WCE1015'] == 1:
+                if cand['quest_word']['WCE1015'][i] == 1:
                     oov += 1
 
         if len(cand['alignments'][0]) != len(cand['tokens']):
@@ -5459,6 +5720,8 @@ class PropNonAlignedOOV(AbstractFeature):
 
 class CountOOVSrilm(AbstractFeature):
 
+    requires = ['language_model_sentence_features']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_oov_srilm')
@@ -5471,6 +5734,8 @@ class CountOOVSrilm(AbstractFeature):
 
 class PropOOVSrilm(AbstractFeature):
 
+    requires = ['language_model_sentence_features', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_oov_srilm')
@@ -5483,6 +5748,8 @@ class PropOOVSrilm(AbstractFeature):
 
 class CountOOV(AbstractFeature):
 
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_oov')
@@ -5500,7 +5767,7 @@ class CountOOV(AbstractFeature):
             if word.lower().isdigit():
                 continue
 
-            if cand['quest_word'][i]['WCE1015'] == 1:
+            if cand['quest_word']['WCE1015'][i] == 1:
                 oov += 1
 
         AbstractFeature.set_value(self, oov)
@@ -5508,6 +5775,8 @@ class CountOOV(AbstractFeature):
 
 class PropOOV(AbstractFeature):
 
+    requires = ['quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_oov')
@@ -5516,7 +5785,7 @@ class PropOOV(AbstractFeature):
 
     def run(self, cand, ref):
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             raise ValueError("The lengths of different data in the sentence object do not match")
 
         oov = 0
@@ -5529,7 +5798,7 @@ class PropOOV(AbstractFeature):
             if word.lower().isdigit():
                 continue
 
-            if cand['quest_word'][i]['WCE1015'] == 1:
+            if cand['quest_word']['WCE1015'][i] == 1:
                 oov += 1
 
         result = oov / float(len(cand['tokens']))
@@ -5541,6 +5810,9 @@ class PropOOV(AbstractFeature):
 
 
 class ContextMatch(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'context_match')
@@ -5600,6 +5872,9 @@ class ContextMatch(AbstractFeature):
 
 
 class MatchContextSimilarity(AbstractFeature):
+
+    requires = ['tokens', 'parse', 'alignments', 'word_vectors']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'match_context_similarity')
@@ -5608,6 +5883,8 @@ class MatchContextSimilarity(AbstractFeature):
 
     def run(self, cand, ref):
 
+        from gensim import matutils
+
         cleaner = CleanPunctuation()
 
         cl_cand, cl_ref = cleaner.clean_punctuation(cand, ref)
@@ -5671,6 +5948,9 @@ class MatchContextSimilarity(AbstractFeature):
 
 
 class LengthsRatio(AbstractFeature):
+
+    requires = ['tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'lengths_ratio')
@@ -5682,6 +5962,9 @@ class LengthsRatio(AbstractFeature):
 
 
 class AvgPosProb(AbstractFeature):
+
+    requires = ['alignments', 'pos_lang_model', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'avg_pos_prob')
@@ -5710,6 +5993,9 @@ class AvgPosProb(AbstractFeature):
 
 
 class MinPosProb(AbstractFeature):
+
+    requires = ['alignments', 'pos_lang_model', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'min_pos_prob')
@@ -5738,6 +6024,9 @@ class MinPosProb(AbstractFeature):
 
 
 class MaxPosProb(AbstractFeature):
+
+    requires = ['alignments', 'pos_lang_model', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'max_pos_prob')
@@ -5766,6 +6055,9 @@ class MaxPosProb(AbstractFeature):
 
 
 class CountPosProb(AbstractFeature):
+
+    requires = ['alignments', 'pos_lang_model', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_pos_prob')
@@ -5795,6 +6087,9 @@ class CountPosProb(AbstractFeature):
 
 
 class PropPosProb(AbstractFeature):
+
+    requires = ['alignments', 'pos_lang_model', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'prop_pos_prob')
@@ -5820,6 +6115,9 @@ class PropPosProb(AbstractFeature):
 
 
 class Bleu(AbstractFeature):
+
+    requires = ['bleu']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'bleu')
@@ -5830,6 +6128,9 @@ class Bleu(AbstractFeature):
 
 
 class Meteor(AbstractFeature):
+
+    requires = ['meteor']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'meteor')
@@ -5840,6 +6141,9 @@ class Meteor(AbstractFeature):
 
 
 class Cobalt(AbstractFeature):
+
+    requires = ['alignments', 'parse']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'cobalt')
@@ -5853,6 +6157,9 @@ class Cobalt(AbstractFeature):
 
 
 class CobaltFromFile(AbstractFeature):
+
+    requires = ['cobalt']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'cobalt_from_file')
@@ -5863,6 +6170,9 @@ class CobaltFromFile(AbstractFeature):
 
 
 class VizWordQuest(AbstractFeature):
+
+    requires = ['parse', 'quest_word', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'viz_word_quest')
@@ -5873,18 +6183,21 @@ class VizWordQuest(AbstractFeature):
         print(' '.join([x.form for x in ref['parse']]))
         print(' '.join([x.form for x in cand['parse']]))
 
-        if len(cand['tokens']) != len(cand['quest_word']):
+        if len(cand['tokens']) != len(cand['quest_word']['WCE1015']):
             print("Sentence lengths do not match!")
             return
 
         for i, word in enumerate(cand['tokens']):
-            print(word + '\t' + str(cand['quest_word'][i]['WCE1015']) + '\t' + str(cand['quest_word'][i]['WCE1041']) + \
-                  '\t' + str((cand['quest_word'][i]['WCE1015'] + cand['quest_word'][i]['WCE1041']) / float(2)))
+            print(word + '\t' + str(cand['quest_word']['WCE1015'][i]) + '\t' + str(cand['quest_word']['WCE1041'][i]) + \
+                  '\t' + str((cand['quest_word']['WCE1015'][i] + cand['quest_word']['WCE1041'][i]) / float(2)))
 
         AbstractFeature.set_value(self, 'NaN')
 
 
 class AvgDistanceNonAlignedTest(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'avg_distance_non_aligned_test')
@@ -5915,6 +6228,9 @@ class AvgDistanceNonAlignedTest(AbstractFeature):
 
 
 class AvgDistanceNonAlignedReference(AbstractFeature):
+
+    requires = ['alignments', 'tokens']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'avg_distance_non_aligned_reference')
@@ -5945,6 +6261,9 @@ class AvgDistanceNonAlignedReference(AbstractFeature):
 
 
 class MedianCosineDifference(AbstractFeature):
+
+    requires = ['tokens', 'word_vectors']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'median_cosine_difference')
@@ -5977,20 +6296,18 @@ class MedianCosineDifference(AbstractFeature):
     @staticmethod
     def cosine_similarities_sequence(sentence_object, content_words_indexes):
 
-        similarities = []
-        for i, idx in enumerate(content_words_indexes):
-
-            if i >= len(content_words_indexes) - 1:
-                break
+        # Cosines between all adjacent content words at once
 
-            sim = dot(matutils.unitvec(sentence_object['word_vectors'][idx]),
-                      matutils.unitvec(sentence_object['word_vectors'][content_words_indexes[i + 1]]))
-            similarities.append(sim)
+        indexes = numpy.asarray(content_words_indexes, dtype=int)
+        unit = embeddings.unit_rows(sentence_object['word_vectors'][indexes])
 
-        return similarities
+        return numpy.sum(unit[:-1] * unit[1:], axis=1)
 
 
 class MedianCosineCandidate(AbstractFeature):
+
+    requires = ['tokens', 'word_vectors']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'median_cosine_candidate')
@@ -6011,11 +6328,15 @@ class MedianCosineCandidate(AbstractFeature):
 
 
 class MedianCosineReference(AbstractFeature):
+
+    requires = ['tokens', 'word_vectors']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'median_cosine_reference')
         AbstractFeature.set_description(self,
                                         "Median cosine similarity between adjacent words in the reference translation")
+        AbstractFeature.set_reference_only(self, True)
 
     def run(self, cand, ref):
 
@@ -6032,6 +6353,12 @@ class MedianCosineReference(AbstractFeature):
 
 
 class MedianCosineCandidateNonAligned(AbstractFeature):
+
+    requires = ['tokens', 'word_vectors', 'alignments']
+
+    # Set to True to print the similarities of each non-aligned word
+    debug = False
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'median_cosine_candidate_non_aligned')
@@ -6040,10 +6367,9 @@ class MedianCosineCandidateNonAligned(AbstractFeature):
 
     def run(self, cand, ref):
 
-        print(' '.join(ref['tokens']))
-        print(' '.join(cand['tokens']))
-
-        similarities = []
+        if self.debug:
+            print(' '.join(ref['tokens']))
+            print(' '.join(cand['tokens']))
 
         content_indexes = MedianCosineDifference.content_words_indexes(cand['tokens'])
 
@@ -6051,79 +6377,69 @@ class MedianCosineCandidateNonAligned(AbstractFeature):
             AbstractFeature.set_value(self, -1.0)
             return
 
-        non_aligned_content_indexes = self.non_aligned_content_words_indexes(cand, content_indexes)
+        non_aligned_positions = self.non_aligned_content_words_positions(cand, content_indexes)
 
-        if len(non_aligned_content_indexes) == 0:
+        if len(non_aligned_positions) == 0:
             AbstractFeature.set_value(self, 1.0)
             return
 
-        print("Non-aligned: " + ' '.join([cand['tokens'][x] for x in non_aligned_content_indexes]))
+        if self.debug:
+            print("Non-aligned: " + ' '.join([cand['tokens'][content_indexes[x]] for x in non_aligned_positions]))
 
-        for index in non_aligned_content_indexes:
-            context_words = self.get_context_words(index, content_indexes)
+        similarities = self.cosine_similarity_neighbors(cand, content_indexes, non_aligned_positions)
 
-            if len(context_words) == 0:
-                continue
+        AbstractFeature.set_value(self, numpy.median(similarities))
 
-            avg_similarity = self.cosine_similarity_neighbors(cand, index, context_words)
+    @staticmethod
+    def cosine_similarity_neighbors(sentence_object, content_indexes, positions):
 
-            similarities.append(avg_similarity)
+        # Average cosine similarity of each word (given by its position among the content words)
+        # to the previous and the next content words
 
-        AbstractFeature.set_value(self, numpy.median(similarities))
+        unit = embeddings.unit_rows(sentence_object['word_vectors'][numpy.asarray(content_indexes, dtype=int)])
+        adjacent = numpy.sum(unit[:-1] * unit[1:], axis=1)
 
+        has_prev = positions > 0
+        has_next = positions < len(content_indexes) - 1
 
-    @staticmethod
-    def get_context_words(target_word_idx, content_indexes):
+        totals = numpy.zeros(len(positions))
+        totals[has_prev] += adjacent[positions[has_prev] - 1]
+        totals[has_next] += adjacent[positions[has_next]]
+        averages = totals / (has_prev.astype(int) + has_next.astype(int))
 
-        context_word_indexes = []
-        for i, word_idx in enumerate(content_indexes):
-            if word_idx == target_word_idx:
-                if i > 0:
-                    context_word_indexes.append(content_indexes[i - 1])
-                if i < len(content_indexes) - 1:
-                    context_word_indexes.append(content_indexes[i + 1])
+        if MedianCosineCandidateNonAligned.debug:
+            for k, position in enumerate(positions):
+                print("Average context similarity for the word " +
+                      sentence_object['tokens'][content_indexes[position]] + " is " + str(averages[k]))
 
-        return context_word_indexes
+        return averages
 
     @staticmethod
-    def cosine_similarity_neighbors(sentence_object, target_word_idx, context_words_idxs):
+    def non_aligned_content_words_positions(cand, content_indexes):
 
-        similarities = []
-        for context_words_idx in context_words_idxs:
-            similarity = dot(matutils.unitvec(sentence_object['word_vectors'][target_word_idx]),
-                             matutils.unitvec(sentence_object['word_vectors'][context_words_idx]))
-            similarities.append(similarity)
-            print("Candidate word: " + sentence_object['tokens'][target_word_idx] + " similarity to context word " +
-                  sentence_object['tokens'][context_words_idx] + " is " + str(similarity))
-
-        average = numpy.mean(similarities)
-        print("Average context similarity for the word " + sentence_object['tokens'][target_word_idx] + " is " + str(
-            average))
-        return average
+        aligned = set(x[0] for x in cand['alignments'][0])
 
-    @staticmethod
-    def non_aligned_content_words_indexes(cand, content_indexes):
+        return numpy.array([i for i, index in enumerate(content_indexes) if index + 1 not in aligned], dtype=int)
 
-        non_aligned = []
-        for index in content_indexes:
-            if index + 1 not in [x[0] for x in cand['alignments'][0]]:
-                non_aligned.append(index)
 
-        return non_aligned
+class CosineSimilarity(AbstractFeature):
 
+    requires = ['sent_vector']
 
-class CosineSimilarity(AbstractFeature):
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'cosine_similarity')
         AbstractFeature.set_description(self, "Cosine similarity between candidate and reference sentence vectors")
 
     def run(self, cand, ref):
-        AbstractFeature.set_value(self,
-                                  dot(matutils.unitvec(cand['sent_vector']), matutils.unitvec(ref['sent_vector'])))
+        unit = embeddings.unit_rows([cand['sent_vector'], ref['sent_vector']])
+        AbstractFeature.set_value(self, float(dot(unit[0], unit[1])))
 
 
 class EuclidDistance(AbstractFeature):
+
+    requires = ['sent_vector']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'euclid_distance')
@@ -6131,25 +6447,26 @@ class EuclidDistance(AbstractFeature):
                                         "Euclidean distance (L2) between candidate and reference sentence vectors")
 
     def run(self, cand, ref):
-        AbstractFeature.set_value(self, distance.euclidean(cand['sent_vector'], ref['sent_vector']))
+        AbstractFeature.set_value(self, float(numpy.linalg.norm(numpy.subtract(cand['sent_vector'], ref['sent_vector']))))
 
 
 class L1Distance(AbstractFeature):
+
+    requires = ['sent_vector']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'l1_distance')
         AbstractFeature.set_description(self, "L1 distance between candidate and reference sentence vectors")
 
     def run(self, cand, ref):
-        distances = []
+        AbstractFeature.set_value(self, float(numpy.sum(numpy.abs(numpy.subtract(cand['sent_vector'], ref['sent_vector'])))))
 
-        for i, val in enumerate(cand['sent_vector']):
-            distances.append(math.fabs(val - ref['sent_vector'][i]))
 
-        AbstractFeature.set_value(self, numpy.sum(distances))
+class RandomNumber(AbstractFeature):
 
+    requires = []
 
-class RandomNumber(AbstractFeature):
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'random_number')
@@ -6161,6 +6478,9 @@ class RandomNumber(AbstractFeature):
 
 
 class CountWordsAlignedInWrongOrderRef(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_words_aligned_in_wrong_order_ref')
@@ -6180,6 +6500,9 @@ class CountWordsAlignedInWrongOrderRef(AbstractFeature):
 
 
 class CountWordsAlignedInWrongOrderCand(AbstractFeature):
+
+    requires = ['alignments']
+
     def __init__(self):
         AbstractFeature.__init__(self)
         AbstractFeature.set_name(self, 'count_words_aligned_in_wrong_order_cand')
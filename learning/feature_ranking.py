@@ -0,0 +1,226 @@
+'''
+feature_ranking -- Recursive feature elimination for the learning methods of learn_model
+
+Features are ranked by recursively fitting the estimator and eliminating the
+features with the smallest weights (coef_ or feature_importances_), as
+sklearn RFE and RFECV do, with the following differences:
+
+    - the number of features eliminated at each round follows a step schedule;
+    - the cross-validation folds of a round are fitted in parallel, together
+      with the fit on the whole training set that decides the eliminated
+      features;
+    - estimators with a warm_start parameter start each refit from the
+      weights of the previous round;
+    - with cross-validation, the elimination stops once the score has not
+      improved for a number of rounds;
+    - the ranks are written to the output file as soon as they are decided.
+
+The options are read from the "rfe" section of the learning configuration:
+
+    step: features eliminated at each round, a fraction of the remaining
+          features if lower than 1 (default 1)
+    schedule: list of [threshold, step] pairs, the step of the highest
+          threshold lower than the number of remaining features is used
+          (e.g. [[100, 10], [30, 2], [0, 1]])
+    cv: number of cross-validation folds, no cross-validation if not set
+        (stratified folds for classification scorers, as sklearn RFECV)
+    scorer: name of the cross-validation scorer (see set_scorer_functions)
+    patience: rounds without improvement before stopping (default: no early stop)
+    tol: minimum improvement of the score (default 0.0)
+    n_jobs: number of workers, -1 or None for all cores (default 1)
+'''
+import logging as log
+import numpy as np
+
+from collections import namedtuple
+from sklearn.base import clone
+from sklearn.externals.joblib import Parallel, delayed
+
+from learning.model_search import CLASSIFICATION, FoldCache, LOSSES, score_value, worker_count
+
+
+FeatureRanking = namedtuple("FeatureRanking", ["estimator", "support", "ranking", "scores"])
+
+
+def step_schedule(n_features, n_select, step=1, schedule=None):
+    '''
+    Number of features eliminated at each round, from n_features down to n_select.
+    '''
+    steps = []
+    remaining = n_features
+
+    while remaining > n_select:
+        value = step
+        if schedule:
+            for threshold, threshold_step in sorted(schedule, reverse=True):
+                if remaining > threshold:
+                    value = threshold_step
+                    break
+
+        if 0 < value < 1:
+            value = max(1, int(value * remaining))
+
+        value = min(int(value), remaining - n_select)
+        steps.append(value)
+        remaining -= value
+
+    return steps
+
+
+def importances(model):
+    if hasattr(model, 'coef_'):
+        coef = np.abs(np.asarray(model.coef_))
+        return coef.sum(axis=0) if coef.ndim > 1 else coef
+    if hasattr(model, 'feature_importances_'):
+        return np.asarray(model.feature_importances_)
+    raise RuntimeError("The estimator does not expose \"coef_\" or \"feature_importances_\"")
+
+
+def warm_model(estimator, previous, keep):
+    '''
+    Clones the estimator, if it supports warm start the clone is initialized
+    with the weights of the previous round for the remaining features.
+    '''
+    model = clone(estimator)
+
+    if previous is None or 'warm_start' not in model.get_params() or not hasattr(previous, 'coef_'):
+        return model
+
+    model.set_params(warm_start=True)
+    model.coef_ = np.array(np.asarray(previous.coef_)[..., keep])
+    if hasattr(previous, 'intercept_'):
+        model.intercept_ = previous.intercept_
+
+    return model
+
+
+def fit_fold(model, X_train, y_train, X_test, y_test, score_func):
+    model.fit(X_train, y_train)
+    if X_test is None:
+        return model, None
+    return model, score_value(score_func(y_test, model.predict(X_test)))
+
+
+def write_ranks(output, feature_names, ranking, indexes):
+    if output is None:
+        return
+    for i in indexes:
+        output.write(feature_names[i] + "\t" + str(ranking[i]) + "\n")
+    output.flush()
+
+
+def improves(score, best, scorer_name, tol):
+    if best is None:
+        return True
+    if scorer_name in LOSSES:
+        return score < best - tol
+    return score > best + tol
+
+
+def rank_features(estimator, X, y, n_features_to_select=1, step=1, schedule=None, cv=None,
+                  scorer=None, patience=None, tol=0.0, n_jobs=1, feature_names=None, output=None):
+    '''
+    Ranks the features by recursive feature elimination.
+
+    @param scorer: (name, function) pair, used with cross-validation.
+    @param output: file object, receives a "name<TAB>rank" line per feature as soon as its rank is decided.
+    @return: a FeatureRanking with the estimator fitted on the selected features, the support
+    mask, the ranks (1 for the selected features) and the list of (number of features, score) pairs.
+    '''
+    n_features = X.shape[1]
+    steps = step_schedule(n_features, n_features_to_select, step, schedule)
+    rounds = len(steps)
+    workers = worker_count(X, n_jobs)
+
+    if feature_names is None:
+        feature_names = [str(i) for i in range(n_features)]
+
+    scorer_name, score_func = scorer if scorer else (None, None)
+    matrices = FoldCache(X, y, cv, stratified=scorer_name in CLASSIFICATION).matrices if cv else []
+
+    support = np.ones(n_features, dtype=bool)
+    ranking = np.ones(n_features, dtype=int)
+    keep = support
+    previous = [None] * (len(matrices) + 1)
+
+    # Features eliminated after the best round so far, their rank is decided
+    # once a better round is found (otherwise they are part of the selection)
+    pending = []
+
+    scores = []
+    best_score = None
+    best = None
+    waiting = 0
+
+    for r in range(rounds + 1):
+        features = np.flatnonzero(support)
+        jobs = [(X[:, features], y, None, None)]
+        jobs += [(X_train[:, features], y_train, X_test[:, features], y_test) for X_train, y_train, X_test, y_test in matrices]
+
+        results = Parallel(n_jobs=workers)(
+            delayed(fit_fold)(warm_model(estimator, previous[j], keep), *(jobs[j] + (score_func,))) for j in range(len(jobs)))
+        previous = [model for model, score in results]
+
+        if matrices:
+            score = float(np.mean([score for model, score in results[1:]]))
+            scores.append((len(features), score))
+            log.info("%d features: %s %f" % (len(features), scorer_name, score))
+
+            if improves(score, best_score, scorer_name, tol):
+                best_score = score
+                best = (previous[0], support.copy())
+                write_ranks(output, feature_names, ranking, pending)
+                pending = []
+                waiting = 0
+            else:
+                waiting += 1
+
+            if patience is not None and waiting >= patience:
+                log.info("Score has not improved for %d rounds, stopping" % waiting)
+                break
+        else:
+            best = (previous[0], support.copy())
+            write_ranks(output, feature_names, ranking, pending)
+            pending = []
+
+        if r == rounds:
+            break
+
+        eliminated = features[np.argsort(importances(previous[0]), kind='mergesort')[:steps[r]]]
+        support[eliminated] = False
+        ranking[eliminated] = rounds - r + 1
+        keep = support[features]
+        pending.extend(eliminated)
+
+    estimator, selected = best
+    ranking[selected] = 1
+    write_ranks(output, feature_names, ranking, np.flatnonzero(selected))
+
+    return FeatureRanking(estimator=estimator, support=selected, ranking=ranking, scores=scores)
+
+
+def rank_features_from_config(config, estimator, X, y, n_features_to_select=1, scorers=None, **kwargs):
+    '''
+    Runs rank_features with the options of the "rfe" section of the learning configuration.
+
+    @param scorers: list of (name, function) pairs, the one named in the configuration
+    is used for cross-validation (the first one by default).
+    '''
+    opt = config.get("rfe", None) or {}
+
+    scorer = None
+    if scorers:
+        scorer = scorers[0]
+        for name, func in scorers:
+            if name == opt.get("scorer"):
+                scorer = (name, func)
+
+    return rank_features(estimator, X, y, n_features_to_select,
+                         step=opt.get("step", 1),
+                         schedule=opt.get("schedule", None),
+                         cv=opt.get("cv", None),
+                         scorer=scorer,
+                         patience=opt.get("patience", None),
+                         tol=opt.get("tol", 0.0),
+                         n_jobs=opt.get("n_jobs", 1),
+                         **kwargs)
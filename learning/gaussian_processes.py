@@ -1,82 +1,91 @@
-
 """
-Simple Gaussian Processes regression with an RBF kernel
+Sparse Gaussian Processes regression with an ARD RBF kernel
 @ Kashif Shah
-"""
-import pylab as pb
-import numpy as np
-import GPy
-
-
-pb.ion()
-pb.close('all')
-
-X = np.genfromtxt('/home/u88591/Workspace/metric-dev/test/x_train.tsv')
-test_X = np.genfromtxt('/home/u88591/Workspace/metric-dev/test/x_test.tsv')
-Y = np.genfromtxt('/home/u88591/Workspace/metric-dev/test/y_train.tsv').reshape(-1, 1)
-test_Y = np.genfromtxt('/home/u88591/Workspace/metric-dev/test/y_test.tsv').reshape(-1, 1)
-
-# rescale X
-mx = np.mean(X,axis=0)
-sx = np.std(test_X,axis=0)
-
-ok = (sx > 0)
-X = X[:,ok]
-test_X = test_X[:,ok]
-sx, mx = sx[ok], mx[ok]
-
-X = (X - mx) / sx
-test_X = (test_X - mx) / sx
-
-print('Dropped features with constant values:')
-print(np.nonzero(ok == False)[0])
-
-# we could centre Y too?
 
-D = X.shape[1]
+The exact GP is cubic in the number of training instances, so the model is
+approximated with a set of inducing points: a sparse variational GP
+(GPy SparseGPRegression) trained on the whole training set, or, when
+batch_size is set, a stochastic variational GP (GPy SVGP) optimized on
+mini-batches. Features are expected to be scaled (see learn_model.scale_datasets),
+features with constant values are dropped.
 
-if True:
-    X = X[:50,:]
-    Y = Y[:50,:]
+As in the original script, a kernel with a single length scale is optimized
+first and used to initialize the ARD kernel, and the features can be ranked
+by their length scales (shorter length scale, more relevant feature).
 
-# construct kernel
-#rbf = GPy.GPy.kern.rbf_ARD(D)
-rbf = GPy.kern.sde_RBF(D, ARD=True)
-noise = GPy.kern.white(D)
-kernel = rbf + noise
-
-# create simple GP model
-#m = GPy.GPy.models.GP_regression(X,Y, kernel = kernel)
-m = GPy.GPy.models.GPRegression(X,Y, kernel = kernel)
-#m.tie_param('rbf_ARD_0_lengthscale')
-m.constrain_positive('')
-m.optimize('bfgs', max_f_eval = 50, messages = True)
-print(m)
-
-#mu, s2 = m.predict(test_X)
-mu = m.predict(test_X)
-mae = np.mean(np.abs(mu - test_Y))
-rmse = np.mean((mu - test_Y) ** 2) ** 0.5
-
-print('SEiso -- mae', mae, 'rmse', rmse)
-
-# the iso kernel initialises the ARD one to avoid local minima
-m.untie_everything()
-m.optimize('bfgs', max_f_eval = 100, messages = True)
-print(m)
-
-#mu, s2 = m.predict(test_X)
-mu  = m.predict(test_X)
-mae = np.mean(np.abs(mu - test_Y))
-rmse = np.mean((mu - test_Y) ** 2) ** 0.5
-
-print('SEard -- mae', mae, 'rmse', rmse)
-#print mae
-#print rmse
-
-length_scales = m['.*lengthscale.*'] #m.get_param()[1:-1]
-
-sort_ls = np.argsort(length_scales)
+GPy is only imported when the model is fitted. The stochastic optimizers
+used with mini-batches (adam, adadelta) also need the climin package.
+"""
+import logging as log
+import numpy as np
 
-print('Feature ranking by length scale')
-print(sort_ls)
\ No newline at end of file
+from sklearn.base import BaseEstimator, RegressorMixin
+
+
+class SparseGPRegressor(BaseEstimator, RegressorMixin):
+
+    def __init__(self, num_inducing=100, batch_size=None, iso_init=True, optimizer=None,
+                 max_iters=1000, random_state=None, verbose=False):
+        self.num_inducing = num_inducing
+        self.batch_size = batch_size
+        self.iso_init = iso_init
+        self.optimizer = optimizer
+        self.max_iters = max_iters
+        self.random_state = random_state
+        self.verbose = verbose
+
+    def fit(self, X, y):
+        import GPy
+
+        X = np.asarray(X, dtype=np.float64)
+        Y = np.asarray(y, dtype=np.float64).reshape(-1, 1)
+
+        self.mask_ = X.std(axis=0) > 0
+        log.info("Dropped features with constant values: %s" % str(np.flatnonzero(~self.mask_)))
+        X = X[:, self.mask_]
+        D = X.shape[1]
+
+        rng = np.random.RandomState(self.random_state)
+        Z = X[rng.choice(X.shape[0], min(self.num_inducing, X.shape[0]), replace=False)]
+
+        lengthscale = 1.0
+        if self.iso_init:
+            # the iso kernel initialises the ARD one to avoid local minima
+            model = self.build_model(GPy, X, Y, Z, GPy.kern.RBF(D, ARD=False) + GPy.kern.White(D))
+            self.optimize(model)
+            lengthscale = float(model.kern.rbf.lengthscale)
+            Z = np.array(model.Z)
+
+        self.model_ = self.build_model(GPy, X, Y, Z,
+                                       GPy.kern.RBF(D, ARD=True, lengthscale=np.repeat(lengthscale, D)) + GPy.kern.White(D))
+        self.optimize(self.model_)
+
+        self.length_scales_ = np.full(self.mask_.shape[0], np.inf)
+        self.length_scales_[self.mask_] = np.array(self.model_.kern.rbf.lengthscale)
+
+        return self
+
+    def build_model(self, GPy, X, Y, Z, kernel):
+        if self.batch_size:
+            return GPy.core.SVGP(X, Y, Z, kernel, GPy.likelihoods.Gaussian(), batchsize=self.batch_size)
+        return GPy.models.SparseGPRegression(X, Y, kernel=kernel, Z=Z)
+
+    def optimize(self, model):
+        optimizer = self.optimizer or ('adam' if self.batch_size else 'lbfgsb')
+        model.optimize(optimizer, max_iters=self.max_iters, messages=self.verbose)
+        if self.verbose:
+            print(model)
+
+    def predict(self, X, return_std=False):
+        X = np.asarray(X, dtype=np.float64)[:, self.mask_]
+        mu, var = self.model_.predict(X)
+        if return_std:
+            return mu.ravel(), np.sqrt(var.ravel())
+        return mu.ravel()
+
+    def feature_ranking(self):
+        '''
+        Feature indexes sorted by length scale, most relevant first
+        (features with constant values last).
+        '''
+        return np.argsort(self.length_scales_, kind='mergesort')
@@ -26,21 +26,25 @@ import logging as log
 import numpy as np
 import os
 import sys
+import time
 import yaml
 import codecs
 
+from collections import namedtuple
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
-from sklearn.grid_search import GridSearchCV
 from sklearn.linear_model.coordinate_descent import LassoCV
 from sklearn.linear_model.least_angle import LassoLarsCV, LassoLars
 from sklearn.linear_model.randomized_l1 import RandomizedLasso
 from sklearn.linear_model.logistic import LogisticRegression
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics.classification import f1_score, precision_score, recall_score
-from sklearn.metrics import mean_squared_error, mean_absolute_error
+from sklearn.metrics import mean_squared_error, mean_absolute_error, accuracy_score
 from sklearn.svm.classes import SVR, SVC
 from sklearn.ensemble import ExtraTreesClassifier
 from sklearn.preprocessing import scale
+from learning import model_export
+from learning import model_search
+from learning.gaussian_processes import SparseGPRegressor
 from learning.customize_scorer import pearson_corrcoef, binary_precision, classify_report_bin, classify_report_bin_regression, classify_report_regression
 from sklearn.externals import joblib
 
@@ -142,6 +146,8 @@ def set_scorer_functions(scorers):
             scores.append((score, pearson_corrcoef))
         elif score == 'binary_precision':
             scores.append((score, binary_precision))
+        elif score == 'accuracy_score':
+            scores.append((score, accuracy_score))
 
     return scores
 
@@ -161,23 +167,21 @@ def set_optimization_params(opt):
     return params
 
 
-def optimize_model(estimator, X_train, y_train, params, scores, folds, verbose, n_jobs):
-    clf = None
-    for score_name, score_func in scores:
-        log.info("Tuning hyper-parameters for %s" % score_name)
-        
-        log.debug(params)
-        log.debug(scores)
-        
-        clf = GridSearchCV(estimator, params,
-                           cv=folds, verbose=verbose, n_jobs=n_jobs)
-        
-        clf.fit(X_train, y_train)
-        
-        log.info("Best parameters set found on development set:")
-        log.info(clf.best_params_)
-        
-    return clf.best_estimator_
+def optimize_model(estimator, X_train, y_train, params, scores, folds, verbose, n_jobs, **options):
+    """
+    Tunes the hyper-parameters of the estimator. All the scorers are evaluated
+    on the same cross-validation fits, the search options (search, n_iter,
+    factor, refit, random_state) are described in learning.model_search.
+    
+    @return: the best estimator for the refit scorer, fitted on the training set
+    """
+    log.info("Tuning hyper-parameters for %s" % ", ".join(name for name, func in scores))
+    log.debug(params)
+    
+    estimator, best = model_search.search(estimator, X_train, y_train, params, scores,
+                                          folds=folds, verbose=verbose, n_jobs=n_jobs,
+                                          **options)
+    return estimator
 
 
 def set_learning_method(config, X_train, y_train):
@@ -208,7 +212,8 @@ def set_learning_method(config, X_train, y_train):
                                           scorers, 
                                           o.get("cv", 5),
                                           o.get("verbose", True),
-                                          o.get("n_jobs", 1))
+                                          o.get("n_jobs", 1),
+                                          **model_search.search_options(o))
                 
             elif p:
                 estimator = SVR(C=p.get("C", 10),
@@ -229,7 +234,8 @@ def set_learning_method(config, X_train, y_train):
                                             scorers,
                                             o.get('cv', 5),
                                             o.get('verbose', True),
-                                            o.get('n_jobs', 1))
+                                            o.get('n_jobs', 1),
+                                          **model_search.search_options(o))
             elif p:
                 estimator = SVC(C=p.get('C', 1.0),
                                 kernel=p.get('kernel', 'rbf'), 
@@ -262,7 +268,8 @@ def set_learning_method(config, X_train, y_train):
                                           scorers,
                                           o.get("cv", 5),
                                           o.get("verbose", True),
-                                          o.get("n_jobs", 1))
+                                          o.get("n_jobs", 1),
+                                          **model_search.search_options(o))
                 
             if p:
                 estimator = LassoLars(alpha=p.get('alpha', 1.0),
@@ -314,28 +321,60 @@ def set_learning_method(config, X_train, y_train):
 
             else:
                 estimator = LinearRegression()
+
+        elif method_name == "SparseGP":
+            if p:
+                estimator = SparseGPRegressor(num_inducing=p.get('num_inducing', 100),
+                                              batch_size=p.get('batch_size', None),
+                                              iso_init=p.get('iso_init', True),
+                                              optimizer=p.get('optimizer', None),
+                                              max_iters=p.get('max_iters', 1000),
+                                              random_state=p.get('random_state', None),
+                                              verbose=p.get('verbose', False))
+            else:
+                estimator = SparseGPRegressor()
                 
     return estimator, scorers
 
 
-def fit_predict(config, X_train, y_train, X_test=None, y_test=None, ref_thd=None):
+LearningResult = namedtuple("LearningResult", ["estimator", "transformer", "predictions", "scores",
+                                               "fit_time", "predict_time"])
+
+
+def train_model(config, X_train, y_train, X_test=None, y_test=None, scale=None):
     '''
-    Uses the configuration dictionary settings to train a model using the
-    specified training algorithm. If set, also evaluates the trained model 
-    in a test set. Additionally, performs feature selection and model parameters
-    optimization.
+    Trains a model on in-memory matrices using the configuration dictionary
+    settings (feature selection, learning method and optimization). Nothing
+    is read from or written to disk, so the function can be called in
+    experiment loops.
     
-    @param config: the configuration dictionary obtained parsing the 
-    configuration file.
-    @param X_train: the np.array object for the matrix containing the feature
-    values for each instance in the training set.
-    @param y_train: the np.array object for the response values of each instance
-    in the training set.
-    @param X_test: the np.array object for the matrix containing the feature
-    values for each instance in the test set. Default is None.
-    @param y_test: the np.array object for the response values of each instance
-    in the test set. Default is None.
+    @param config: the configuration dictionary, with the same layout as the
+    YAML configuration file (data paths are not needed).
+    @param X_train: the np.array with the feature values of the training set.
+    @param y_train: the np.array with the response values of the training set.
+    @param X_test: the np.array with the feature values of the test set.
+    Default is None.
+    @param y_test: the np.array with the response values of the test set.
+    Default is None.
+    @param scale: whether to scale the datasets. Default is the "scale"
+    option of the configuration.
+    @return: a LearningResult with the fitted estimator, the feature selection
+    transformer (or None), the predictions for X_test (or None), a
+    dictionary with the configured scores on y_test (empty without y_test),
+    the time in seconds of the training (scaling, feature selection and
+    fit) and of the prediction (0 without X_test).
     '''
+    start = time.time()
+
+    if scale is None:
+        scale = config.get("scale", True)
+
+    if scale:
+        if X_test is not None:
+            X_train, X_test = scale_datasets(X_train, X_test)
+        else:
+            X_train = scale_datasets_crossvalidation(X_train)
+
     # sets the selection method
     transformer = set_selection_method(config)
 
@@ -353,30 +392,88 @@ def fit_predict(config, X_train, y_train, X_test=None, y_test=None, ref_thd=None
         
         if X_test is not None:
             X_test = transformer.transform(X_test)
-    
-    
+
     # sets learning algorithm and runs it over the training mtc
     estimator, scorers = set_learning_method(config, X_train, y_train)
     log.info("Running learning algorithm %s" % str(estimator))
     estimator.fit(X_train, y_train)
+    fit_time = time.time() - start
+
+    if hasattr(estimator, "feature_ranking"):
+        log.info("Feature ranking by length scale: %s" % str(estimator.feature_ranking()))
+
+    y_hat = None
+    scores = {}
+    predict_time = 0.0
+
+    if X_test is not None:
+        log.info("Predicting unseen mtc using the trained model...")
+        start = time.time()
+        y_hat = estimator.predict(X_test)
+        predict_time = time.time() - start
+
+        if y_test is not None:
+            log.info("Evaluating prediction on the test set...")
+            scores = evaluate_predictions(scorers, y_test, y_hat)
+
+    return LearningResult(estimator=estimator, transformer=transformer, predictions=y_hat, scores=scores,
+                          fit_time=fit_time, predict_time=predict_time)
+
+
+def evaluate_predictions(scorers, y_test, y_hat):
+    '''
+    Computes the configured scores of the predictions.
+    
+    @param scorers: list of (name, function) pairs from set_scorer_functions().
+    @return: a dictionary from scorer name to value.
+    '''
+    scores = {}
+    for scorer_name, scorer_func in scorers:
+        if scorer_name == 'f1_score':
+            scores[scorer_name] = scorer_func(y_test, y_hat, average=None)
+        else:
+            scores[scorer_name] = scorer_func(y_test, y_hat)
+    return scores
+
+
+def fit_predict(config, X_train, y_train, X_test=None, y_test=None, ref_thd=None):
+    '''
+    Uses the configuration dictionary settings to train a model using the
+    specified training algorithm. If set, also evaluates the trained model 
+    in a test set. Additionally, performs feature selection and model parameters
+    optimization.
+    
+    The datasets are expected to be already scaled. This is the file-based
+    counterpart of train_model(): it saves the model if configured and writes
+    the predictions to the "predicted" path of the configuration (default
+    predicted.csv).
+    
+    @param config: the configuration dictionary obtained parsing the 
+    configuration file.
+    @param X_train: the np.array object for the matrix containing the feature
+    values for each instance in the training set.
+    @param y_train: the np.array object for the response values of each instance
+    in the training set.
+    @param X_test: the np.array object for the matrix containing the feature
+    values for each instance in the test set. Default is None.
+    @param y_test: the np.array object for the response values of each instance
+    in the test set. Default is None.
+    '''
+    result = train_model(config, X_train, y_train, X_test, y_test, scale=False)
 
     if config.get("save", None) is not None:
         learning_cfg = config.get("learning", None)
         method_name = learning_cfg.get("method", None)
-        joblib.dump(estimator, config.get("save", None) + '/' + method_name + '.pkl')
+        joblib.dump(result.estimator, config.get("save", None) + '/' + method_name + '.pkl')
+        # The training features are already scaled here, the model is not exported
+        model_export.remove_model(config.get("save", None) + '/' + method_name + '.pkl')
 
         return
     
     if (X_test is not None) and (y_test is not None):
-        log.info("Predicting unseen mtc using the trained model...")
-        y_hat = estimator.predict(X_test)
+        y_hat = result.predictions
 
-        log.info("Evaluating prediction on the test set...")
-        for scorer_name, scorer_func in scorers:
-            if scorer_name == 'f1_score':
-                v = scorer_func(y_test, y_hat, average=None)
-            else:
-                v = scorer_func(y_test, y_hat)
+        for scorer_name, v in result.scores.items():
             log.info("%s = %s" % (scorer_name, v))
         log.info("Customized scores: ")
         try:
@@ -418,7 +515,7 @@ def fit_predict(config, X_train, y_train, X_test=None, y_test=None, ref_thd=None
             print(e)
 
         predictions = []
-        with open("predicted.csv", 'w') as _fout:
+        with open(config.get("predicted", "predicted.csv"), 'w') as _fout:
             for _x,  _y in zip(y_test, y_hat):
                 print("%f\t%f" % (_x,  _y), file=_fout)
                 predictions.append(_y)
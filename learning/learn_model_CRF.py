@@ -20,6 +20,8 @@ import sys
 import yaml
 import codecs
 
+from concurrent.futures import ProcessPoolExecutor
+
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
 from learning.evaluation_measures import root_mean_squared_error, mean_absolute_error
 from sklearn.ensemble.forest import ExtraTreesClassifier
@@ -141,6 +143,137 @@ def create_temp_input_file(learning, crfsuite, algorithm, parameters, X, y=[]):
 		f.write(line.strip() + '\n')
 	f.close()
 	
+def split_sequences(X, y=None):
+	"""
+	Splits the instances into sequences, as in the CRFSuite input format a
+	sequence ends at an instance without features (an empty line).
+
+	@param X: the matrix containing feature values
+	@param y: the vector containing labels
+	@return: a list of (feature list, label list) pairs, one per sequence.
+	"""
+	sequences = []
+	xseq = []
+	yseq = []
+
+	for i in range(0, len(X)):
+		if len(X[i]) == 0:
+			if xseq:
+				sequences.append((xseq, yseq))
+			xseq = []
+			yseq = []
+			continue
+		xseq.append(item_features(X[i]))
+		if y is not None and len(y) > 0:
+			yseq.append(str(y[i]))
+
+	if xseq:
+		sequences.append((xseq, yseq))
+
+	return sequences
+
+def item_features(features):
+	"""
+	Converts the CRFSuite attributes of an instance ("name" or "name:weight")
+	into the dictionary passed to the Python binding.
+	"""
+	item = {}
+	for feature in features:
+		name, sep, weight = feature.rpartition(':')
+		try:
+			item[name if sep else weight] = float(weight) if sep else 1.0
+		except ValueError:
+			item[feature] = 1.0
+	return item
+
+def train_crf(learning, algorithm, parameters, sequences, model_file=None):
+	"""
+	Learns a quality estimation model in-process through the CRFSuite Python
+	binding (python-crfsuite).
+
+	@param learning: configuration dictionary about the learning strategy to be used.
+	@param algorithm: learning algorithm to be used.
+	@param parameters: algorithm parameters to be used.
+	@param sequences: list of (feature list, label list) pairs from split_sequences().
+	@param model_file: path of the model, the model_file option by default.
+	"""
+	import pycrfsuite
+
+	model_file = model_file or learning.get("model_file", None)
+	if not model_file:
+		msg = "Path to model file is missing."
+		raise Exception(msg)
+
+	trainer = pycrfsuite.Trainer(algorithm=algorithm, verbose=False)
+	trainer.set_params(dict((key, value) for key, value in parameters.items()))
+	for xseq, yseq in sequences:
+		trainer.append(xseq, yseq)
+	trainer.train(model_file)
+
+	return model_file
+
+def tag_crf(model_file, sequences, output_file=None):
+	"""
+	Predicts quality labels for sequences with a model trained by train_crf.
+	If output_file is set, the labels are written in the format of the
+	CRFSuite tag command (one label per line, sequences separated by an empty line).
+
+	@return: a list with the label sequence of each sequence.
+	"""
+	import pycrfsuite
+
+	tagger = pycrfsuite.Tagger()
+	tagger.open(model_file)
+	predicted = [tagger.tag(xseq) for xseq, yseq in sequences]
+	tagger.close()
+
+	if output_file:
+		f = codecs.open(output_file, 'w', 'utf-8')
+		for labels in predicted:
+			f.write('\n'.join(labels) + '\n\n')
+		f.close()
+
+	return predicted
+
+def evaluate_fold(learning, algorithm, parameters, train_sequences, test_sequences, model_file):
+	"""
+	Trains a model on the training folds and returns the token accuracy
+	on the held out fold.
+	"""
+	train_crf(learning, algorithm, parameters, train_sequences, model_file=model_file)
+	predicted = tag_crf(model_file, test_sequences)
+
+	gold = [label for xseq, yseq in test_sequences for label in yseq]
+	tagged = [label for labels in predicted for label in labels]
+
+	return np.mean(np.array(gold) == np.array(tagged)) if gold else 0.0
+
+def cross_validate(learning, algorithm, parameters, sequences, folds, n_jobs=None):
+	"""
+	Cross-validates the CRF on the training sequences, the folds are trained
+	in parallel (one process per fold, at most n_jobs).
+
+	@return: the token accuracy of each fold.
+	"""
+	model_file = learning.get("model_file", "model_file.txt")
+	splits = np.array_split(np.arange(len(sequences)), folds)
+
+	with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+		futures = []
+		for k, test in enumerate(splits):
+			test_set = set(test.tolist())
+			train_sequences = [sequences[i] for i in range(len(sequences)) if i not in test_set]
+			test_sequences = [sequences[i] for i in test]
+			futures.append(executor.submit(evaluate_fold, learning, algorithm, parameters,
+										   train_sequences, test_sequences, model_file + '.fold' + str(k)))
+		accuracies = [future.result() for future in futures]
+
+	for k, accuracy in enumerate(accuracies):
+		log.info("Fold %d accuracy: %f" % (k, accuracy))
+	log.info("Mean accuracy: %f" % np.mean(accuracies))
+
+	return accuracies
+
 def get_configuration_objects(config):
 	"""
 	Loads configuration mtc.
@@ -153,8 +286,9 @@ def get_configuration_objects(config):
 		msg = "Learning parameters are missing."
 		raise Exception(msg)
 		
+	# The CRFSuite application is only needed with the "crfsuite" backend
 	crfsuite = learning.get("crfsuite", None)
-	if not crfsuite:
+	if not crfsuite and learning.get("backend", "crfsuite") == "crfsuite":
 		msg = "Path to CRFSuite is missing."
 		raise Exception(msg)
 		
@@ -190,7 +324,24 @@ def fit_predict(config, X_train, y_train, X_test=None, y_test=None, ref_thd=None
 	'''	
 
 	l, c, a, p = get_configuration_objects(config)
-	
+
+	if l.get("backend", "crfsuite") == "python":
+		train_sequences = split_sequences(X_train, y_train)
+
+		folds = l.get("folds", None)
+		if folds:
+			cross_validate(l, a, p, train_sequences, folds, l.get("n_jobs", None))
+
+		model_file = train_crf(l, a, p, train_sequences)
+
+		if X_test is not None:
+			output_file = l.get("output_file", None)
+			if not output_file:
+				msg = "Path to output file is missing."
+				raise Exception(msg)
+			tag_crf(model_file, split_sequences(X_test), output_file)
+		return
+
 	create_temp_input_file(l, c, a, p, X_train, y=y_train)
 
 	learn_quality_estimation_model(l, c, a, p)
@@ -0,0 +1,257 @@
+'''
+model_export -- Compact model artifacts and a NumPy-only scorer
+
+A trained estimator is exported to a .npz file holding the statistics of the
+training features and the model parameters: coefficients and intercept for
+linear models, node arrays for decision trees and tree ensembles. The scorer
+only needs numpy, so scoring jobs do not import sklearn or scipy.
+
+The artifact records the SHA-1 of the pickled model it was exported from and
+is only used while the pickle is unchanged (see current_model_path), a model
+saved again without a new export falls back to the pickle.
+
+The features are scaled as in learn_model.scale_datasets, i.e. with the mean
+and standard deviation of the training and test instances together. The
+training statistics are stored in the artifact and combined with those of the
+test matrix, so the scaled values are the same as when the training features
+are read and scaled again. With transductive=False the training statistics
+alone are used.
+
+Usage:
+
+    python -m learning.model_export MODEL.npz FEATURES.tsv [--decision]
+'''
+import hashlib
+import os
+import sys
+import numpy as np
+
+from argparse import ArgumentParser
+
+
+TREE_ARRAYS = ['children_left', 'children_right', 'feature', 'threshold', 'value']
+
+# Tree models whose prediction is the average of the leaf values of their trees (boosting and
+# bagging ensembles combine their estimators differently and are not exported)
+TREE_MODELS = ['DecisionTreeClassifier', 'DecisionTreeRegressor', 'ExtraTreeClassifier', 'ExtraTreeRegressor',
+               'RandomForestClassifier', 'RandomForestRegressor', 'ExtraTreesClassifier', 'ExtraTreesRegressor']
+
+
+def model_path(pickle_path):
+    '''
+    Path of the artifact exported next to a joblib model (model.pkl -> model.npz).
+    '''
+    return os.path.splitext(pickle_path)[0] + '.npz'
+
+
+def pickle_digest(pickle_path):
+    sha = hashlib.sha1()
+    with open(pickle_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def current_model_path(pickle_path):
+    '''
+    Path of the artifact exported from the pickled model, or None if there is
+    none or the pickle was saved again after the export.
+    '''
+    path = model_path(pickle_path)
+
+    if not os.path.exists(path):
+        return None
+
+    if not os.path.exists(pickle_path):
+        return path
+
+    with np.load(path) as data:
+        digest = str(data['pickle_sha1']) if 'pickle_sha1' in data.files else None
+
+    if digest != pickle_digest(pickle_path):
+        return None
+
+    return path
+
+
+def remove_model(pickle_path):
+    '''
+    Removes the artifact of a pickled model, e.g. when the model is saved again without exporting it.
+    '''
+    if os.path.exists(model_path(pickle_path)):
+        os.remove(model_path(pickle_path))
+
+
+def export_model(estimator, path, x_train=None, scale=True, pickle_path=None):
+    '''
+    Writes the compact artifact of a fitted estimator.
+
+    @param x_train: the unscaled training features, needed if scale is True.
+    @param pickle_path: the pickled model the artifact is exported from, its digest is stored in the artifact.
+    @raise ValueError: if the estimator is neither linear nor one of TREE_MODELS.
+    '''
+    arrays = {'scale': np.array(bool(scale))}
+
+    if pickle_path is not None:
+        arrays['pickle_sha1'] = np.array(pickle_digest(pickle_path))
+
+    if scale:
+        x_train = np.asarray(x_train, dtype=np.float64)
+        arrays['train_n'] = np.array(x_train.shape[0])
+        arrays['train_mean'] = x_train.mean(axis=0)
+        arrays['train_m2'] = ((x_train - arrays['train_mean']) ** 2).sum(axis=0)
+
+    if hasattr(estimator, 'classes_'):
+        arrays['classes'] = np.asarray(estimator.classes_)
+
+    if hasattr(estimator, 'coef_'):
+        arrays['kind'] = np.array('linear')
+        arrays['coef'] = np.atleast_2d(np.asarray(estimator.coef_, dtype=np.float64))
+        arrays['intercept'] = np.atleast_1d(np.asarray(getattr(estimator, 'intercept_', 0.0), dtype=np.float64))
+        arrays['logistic'] = np.array(type(estimator).__name__ == 'LogisticRegression')
+
+    elif type(estimator).__name__ in TREE_MODELS:
+        trees = [estimator.tree_] if hasattr(estimator, 'tree_') else [e.tree_ for e in estimator.estimators_]
+        arrays['kind'] = np.array('trees')
+        arrays['node_offsets'] = np.cumsum([0] + [tree.node_count for tree in trees])
+        for name in TREE_ARRAYS:
+            arrays[name] = np.concatenate([np.asarray(getattr(tree, name)) for tree in trees])
+
+    else:
+        raise ValueError("cannot export %s, only linear models and %s are supported" %
+                         (type(estimator).__name__, ', '.join(TREE_MODELS)))
+
+    tmp = path + '.tmp.npz'
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+class ExportedModel(object):
+    '''
+    Scorer for an artifact written by export_model, with the predict,
+    decision_function and predict_proba methods of the original estimator.
+    '''
+
+    def __init__(self, path, transductive=True, scale=True):
+        with np.load(path) as data:
+            self.arrays = {name: data[name] for name in data.files}
+        self.kind = str(self.arrays['kind'])
+        self.classes = self.arrays.get('classes', None)
+        self.transductive = transductive
+        # scale=False scores features as they are given (e.g. already scaled)
+        self.scaling = scale and bool(self.arrays['scale'])
+
+    def scale(self, x):
+        if not self.scaling:
+            return x
+
+        n, mean, m2 = float(self.arrays['train_n']), self.arrays['train_mean'], self.arrays['train_m2']
+
+        if self.transductive and x.shape[0] > 0:
+            # Statistics of train + test from those of the two parts
+            n_test = x.shape[0]
+            mean_test = x.mean(axis=0)
+            m2_test = ((x - mean_test) ** 2).sum(axis=0)
+            delta = mean_test - mean
+            mean, m2, n = mean + delta * n_test / (n + n_test), m2 + m2_test + delta ** 2 * n * n_test / (n + n_test), n + n_test
+
+        std = np.sqrt(m2 / n)
+        std[std == 0.0] = 1.0
+
+        return (x - mean) / std
+
+    def decision_function(self, x):
+        x = self.scale(np.asarray(x, dtype=np.float64))
+
+        if self.kind == 'linear':
+            scores = x.dot(self.arrays['coef'].T) + self.arrays['intercept']
+            return scores.ravel() if scores.shape[1] == 1 else scores
+
+        values = self.tree_values(x)
+        if self.classes is None:
+            return values[:, 0]
+        return values
+
+    def predict_proba(self, x):
+        if self.classes is None:
+            raise ValueError("probabilities are only available for classifiers")
+
+        if self.kind == 'trees':
+            return self.decision_function(x)
+
+        if not self.arrays['logistic']:
+            raise ValueError("probabilities are only available for logistic regression and tree based classifiers")
+
+        scores = self.decision_function(x)
+        if scores.ndim == 1:
+            positive = 1.0 / (1.0 + np.exp(-scores))
+            return np.column_stack((1.0 - positive, positive))
+
+        # One-vs-rest probabilities, normalized
+        probabilities = 1.0 / (1.0 + np.exp(-scores))
+        return probabilities / probabilities.sum(axis=1)[:, None]
+
+    def predict(self, x):
+        scores = self.decision_function(x)
+
+        if self.classes is None:
+            return scores
+        if scores.ndim == 1:
+            return self.classes[(scores > 0).astype(int)]
+        return self.classes[np.argmax(scores, axis=1)]
+
+    def tree_values(self, x):
+        # Leaf values averaged over the trees (normalized class counts for classifiers)
+        offsets = self.arrays['node_offsets']
+        result = 0.0
+
+        for t in range(len(offsets) - 1):
+            nodes = slice(offsets[t], offsets[t + 1])
+            left = self.arrays['children_left'][nodes]
+            right = self.arrays['children_right'][nodes]
+            feature = self.arrays['feature'][nodes]
+            threshold = self.arrays['threshold'][nodes]
+            value = self.arrays['value'][nodes][:, 0, :]
+
+            node = np.zeros(x.shape[0], dtype=np.int64)
+            active = left[node] != -1
+            while active.any():
+                current = node[active]
+                go_left = x[np.flatnonzero(active), feature[current]] <= threshold[current]
+                node[active] = np.where(go_left, left[current], right[current])
+                active = left[node] != -1
+
+            leaf_values = value[node]
+            if self.classes is not None:
+                leaf_values = leaf_values / leaf_values.sum(axis=1)[:, None]
+            result = result + leaf_values
+
+        return result / (len(offsets) - 1)
+
+
+def load_model(path, transductive=True, scale=True):
+    return ExportedModel(path, transductive=transductive, scale=scale)
+
+
+def read_features(path, delim='\t'):
+    return np.loadtxt(os.path.expanduser(path), delimiter=delim, ndmin=2)
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Scores a feature file with an exported model")
+    parser.add_argument("model", help="model artifact (.npz) written by export_model")
+    parser.add_argument("features", help="tab separated feature file")
+    parser.add_argument("--decision", action="store_true", default=False,
+                        help="print the decision function instead of the predictions")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    x = read_features(args.features)
+    scores = model.decision_function(x) if args.decision else model.predict(x)
+
+    for value in scores:
+        sys.stdout.write('\t'.join([str(v) for v in np.atleast_1d(value)]) + '\n')
+
+
+if __name__ == '__main__':
+    main()
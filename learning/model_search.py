@@ -0,0 +1,213 @@
+'''
+model_search -- Hyper-parameter search for the learning methods of learn_model
+
+Every candidate parameter setting is evaluated once per fold and all the
+configured scorers are computed on the same predictions, the best setting
+for the refit scorer is then refitted on the whole training set. Besides the
+exhaustive grid, candidates can be sampled at random or pruned with
+successive halving. The fold splits and the fold matrices are built once per
+search and shared by all the candidates, and the (candidate, fold) fits run
+in parallel on as many workers as cores and free memory allow.
+
+The search space uses the "optimize" syntax of the configuration file:
+numeric lists [begin, end, number of samples] are expanded to a linear space,
+lists of strings are used as they are. The options below are read from the
+same section:
+
+    search: grid, random or halving (default grid)
+    n_iter: number of candidates sampled by the random search (default 10)
+    factor: proportion of candidates kept at each halving round is 1/factor (default 3)
+    refit: name of the scorer used to select the best candidate (default the first one)
+    random_state: seed for the random search
+    cv: number of folds (default 5), stratified if the refit scorer is a
+        classification scorer (accuracy, f1, precision, recall)
+    n_jobs: number of workers, -1 or None for all cores (default 1)
+'''
+import itertools
+import logging as log
+import numpy as np
+import os
+
+from sklearn.base import clone
+from sklearn.cross_validation import StratifiedKFold
+from sklearn.externals.joblib import Parallel, delayed
+
+
+# Scorers for which lower values are better
+LOSSES = ['mae', 'mse']
+
+# Classification scorers, searches refitted on them use stratified folds
+CLASSIFICATION = ['f1_score', 'precision_score', 'recall_score', 'binary_precision', 'accuracy_score']
+
+
+def search_options(opt):
+    '''
+    Reads the search options from the "optimize" section of the configuration.
+    '''
+    return {'search': opt.get('search', 'grid'),
+            'n_iter': opt.get('n_iter', 10),
+            'factor': opt.get('factor', 3),
+            'refit': opt.get('refit', None),
+            'random_state': opt.get('random_state', None)}
+
+
+def candidates(params):
+    '''
+    Expands the parameter grid (a dictionary from parameter name to the list of
+    values) into the list of all parameter settings.
+    '''
+    names = sorted(params.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*[list(params[n]) for n in names])]
+
+
+def fold_indexes(n_samples, folds, y=None):
+    '''
+    Consecutive folds, as sklearn KFold without shuffling, or stratified folds
+    (sklearn StratifiedKFold) if the labels y are given.
+
+    @return: a list of (train indexes, test indexes) pairs.
+    '''
+    if y is not None:
+        return [(train, test) for train, test in StratifiedKFold(y, folds)]
+
+    indexes = np.arange(n_samples)
+    result = []
+    for test in np.array_split(indexes, folds):
+        result.append((np.setdiff1d(indexes, test, assume_unique=True), test))
+    return result
+
+
+def worker_count(X, n_jobs, copies=4):
+    '''
+    Number of parallel workers: n_jobs if set, otherwise the number of cores,
+    reduced so that every worker can hold a few copies of the training matrix
+    in the available memory.
+    '''
+    if n_jobs is not None and n_jobs > 0:
+        return n_jobs
+
+    workers = os.cpu_count() or 1
+
+    try:
+        available = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return workers
+
+    per_worker = max(X.nbytes * copies, 1)
+    return int(max(1, min(workers, available // per_worker)))
+
+
+def score_value(value):
+    # pearson_corrcoef returns the coefficient and the p-value as a string
+    if isinstance(value, str):
+        return float(value.split()[0])
+    return float(np.mean(value))
+
+
+def fit_score(estimator, params, X_train, y_train, X_test, y_test, scores):
+    '''
+    Fits one candidate on one fold and computes all the scorers on its predictions.
+    '''
+    model = clone(estimator).set_params(**params)
+    model.fit(X_train, y_train)
+    y_hat = model.predict(X_test)
+    return [score_value(score_func(y_test, y_hat)) for score_name, score_func in scores]
+
+
+class FoldCache(object):
+    '''
+    Fold splits and fold matrices of one search, built once and shared by all
+    the candidates.
+    '''
+
+    def __init__(self, X, y, folds, stratified=False, random_state=None):
+        self.splits = fold_indexes(X.shape[0], folds, y if stratified else None)
+        self.matrices = [(X[train], y[train], X[test], y[test]) for train, test in self.splits]
+
+        # Random order of the training instances of every fold, the data is sorted by dataset and language pair
+        rng = np.random.RandomState(random_state if random_state is not None else 0)
+        self.orders = [rng.permutation(len(train)) for train, test in self.splits]
+
+    def subsample(self, n_train):
+        # n_train random training instances of every fold (successive halving), the samples of
+        # successive rounds are nested
+        return [(X_train[order[:n_train]], y_train[order[:n_train]], X_test, y_test)
+                for (X_train, y_train, X_test, y_test), order in zip(self.matrices, self.orders)]
+
+
+def evaluate(estimator, settings, matrices, scores, workers, verbose):
+    '''
+    Evaluates the candidates on the folds.
+
+    @return: an array (candidates x scorers) with the scores averaged over the folds.
+    '''
+    jobs = [(c, f) for c in range(len(settings)) for f in range(len(matrices))]
+    results = Parallel(n_jobs=workers, verbose=verbose)(
+        delayed(fit_score)(estimator, settings[c], *(matrices[f] + (scores,))) for c, f in jobs)
+
+    values = np.zeros((len(settings), len(matrices), len(scores)))
+    for (c, f), result in zip(jobs, results):
+        values[c, f] = result
+
+    return values.mean(axis=1)
+
+
+def best_candidate(values, scores, scorer_index):
+    if scores[scorer_index][0] in LOSSES:
+        return int(np.argmin(values[:, scorer_index]))
+    return int(np.argmax(values[:, scorer_index]))
+
+
+def search(estimator, X_train, y_train, params, scores, folds=5, verbose=0, n_jobs=1,
+           search='grid', n_iter=10, factor=3, refit=None, random_state=None):
+    '''
+    Searches the hyper-parameters of the estimator.
+
+    @param params: dictionary from parameter name to the list of values.
+    @param scores: list of (name, function) pairs from set_scorer_functions().
+    @param search: grid, random or halving.
+    @param refit: name of the scorer that selects the best candidate.
+    @return: the best estimator refitted on the whole training set and a
+    dictionary from scorer name to the (best parameters, best score) pair.
+    '''
+    settings = candidates(params)
+    workers = worker_count(X_train, n_jobs)
+
+    scorer_names = [name for name, func in scores]
+    scorer_index = scorer_names.index(refit) if refit in scorer_names else 0
+
+    cache = FoldCache(X_train, y_train, folds, stratified=scorer_names[scorer_index] in CLASSIFICATION,
+                      random_state=random_state)
+
+    if search == 'random' and n_iter < len(settings):
+        rng = np.random.RandomState(random_state)
+        settings = [settings[i] for i in sorted(rng.choice(len(settings), n_iter, replace=False))]
+
+    if search == 'halving':
+        n_train = min(len(train) for train, test in cache.splits)
+        rounds = int(np.ceil(np.log(len(settings)) / np.log(factor))) if len(settings) > 1 else 0
+        resources = max(int(n_train / factor ** rounds), 1)
+
+        while len(settings) > 1 and resources < n_train:
+            log.info("Halving round: %d candidates on %d instances" % (len(settings), resources))
+            values = evaluate(estimator, settings, cache.subsample(resources), scores, workers, verbose)
+            order = np.argsort(values[:, scorer_index])
+            if scorer_names[scorer_index] not in LOSSES:
+                order = order[::-1]
+            settings = [settings[i] for i in order[:max(1, int(np.ceil(len(settings) / float(factor))))]]
+            resources = min(resources * factor, n_train)
+
+    log.info("Evaluating %d candidates on %d folds with %d workers" % (len(settings), folds, workers))
+    values = evaluate(estimator, settings, cache.matrices, scores, workers, verbose)
+
+    best = {}
+    for i, name in enumerate(scorer_names):
+        k = best_candidate(values, scores, i)
+        best[name] = (settings[k], values[k, i])
+        log.info("Best parameters set found on development set for %s:" % name)
+        log.info(settings[k])
+
+    best_estimator = clone(estimator).set_params(**best[scorer_names[scorer_index]][0])
+    best_estimator.fit(X_train, y_train)
+
+    return best_estimator, best
@@ -6,9 +6,21 @@ from sklearn import preprocessing
 from utils.file_utils import read_labels_file, read_features_file, read_reference_file
 from sklearn.externals import joblib
 from learning import learn_model
+from learning import model_export
 
 
 def predict(cfg, model_path, probabilities=True):
+
+    # Uses the exported artifact if it is up to date (the training features are not needed)
+    artifact = model_export.current_model_path(model_path)
+    if artifact is not None:
+        x_test = read_features_file(cfg.get('x_test'), '\t')
+        estimator = model_export.load_model(artifact)
+        if probabilities:
+            return [x[0] for x in estimator.predict_proba(x_test)]
+        else:
+            return estimator.predict(x_test)
+
     x_train = read_features_file(cfg.get('x_train'), '\t')
     x_test = read_features_file(cfg.get('x_test'), '\t')
     scale = cfg.get("scale", True)
@@ -29,6 +41,7 @@ def train_model(cfg, model_path):
     y_train = read_reference_file(cfg.get('y_train'), '\t')
     x_test = read_features_file(cfg.get('x_test'), '\t')
     scale = cfg.get("scale", True)
+    x_unscaled = x_train
 
     if scale:
         x_train, x_test = scale_datasets(x_train, x_test)
@@ -36,11 +49,31 @@ def train_model(cfg, model_path):
     estimator, scorers = learn_model.set_learning_method(cfg, x_train, y_train)
     estimator.fit(x_train, y_train)
     joblib.dump(estimator, model_path)
+    export_model(estimator, model_path, x_unscaled, scale)
+
+
+def export_model(estimator, model_path, x_train, scale):
+
+    # Writes the compact artifact next to the pickled model, if the model type is supported
+    # (otherwise an artifact of a previous model is removed)
+
+    try:
+        model_export.export_model(estimator, model_export.model_path(model_path), x_train, scale,
+                                  pickle_path=model_path)
+    except ValueError as e:
+        model_export.remove_model(model_path)
+        log.info("Model not exported: %s" % str(e))
 
 
 def get_confidence_scores(model_path, features_path):
     x_test = read_features_file(features_path, '\t')
-    estimator = joblib.load(model_path)
+
+    artifact = model_export.current_model_path(model_path)
+    if artifact is not None:
+        estimator = model_export.load_model(artifact, scale=False)
+    else:
+        estimator = joblib.load(model_path)
+
     return estimator.decision_function(x_test)
 
 
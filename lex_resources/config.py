@@ -1,22 +1,28 @@
-from nltk.corpus import stopwords
-
+from lex_resources.lazy_resource import LazyResource, LazyList
+from lex_resources.ppdb_store import PPDBStore
 from lex_resources.synonym_dictionary import SynonymDictionary
 from lex_resources.contraction_dictionary import ContractionDictionary
 from lex_resources.extended_stopwords_list import ExtendedStopwordsList
 from utils.stemmer import Stemmer
 
 
-ppdb_dict = {}
+def _nltk_stopwords(language):
+    from nltk.corpus import stopwords
+    return stopwords.words(language)
+
+
+ppdb = PPDBStore()
 word_vector = {}
 pos_vector = {}
 
+# Resources are read on first use (see lex_resources.lazy_resource)
 stemmer = Stemmer('english')
-synonymDictionary = SynonymDictionary('english')
-contractionDictionary = ContractionDictionary('english')
-extended_stopwords = ExtendedStopwordsList('english')
+synonymDictionary = LazyResource(lambda: SynonymDictionary('english'))
+contractionDictionary = LazyResource(lambda: ContractionDictionary('english'))
+extended_stopwords = LazyResource(lambda: ExtendedStopwordsList('english'))
 
 # punctuations = ['%', '(', '-lrb-', '.', ',', '-', '?', '!', ';', '_', ':', '{', '}', '[', '/', ']', '...', '\'\'', '\'', ')', '-rrb-']
 punctuations = ['%', '(', '-lrb-', '.', ',', '-', '?', '!', ';', '_', ':', '{', '}', '[', '/', ']', '...', '\'', ')', '-rrb-']
-cobalt_stopwords = stopwords.words('english')
+cobalt_stopwords = LazyList(lambda: _nltk_stopwords('english'))
 sign_to_word = {'%' : 'percent',
-                 'percent' : '%'}
+                 'percent' : '%'}
\ No newline at end of file
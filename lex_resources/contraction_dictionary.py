@@ -1,15 +1,27 @@
 import os.path
 
+from lex_resources.lazy_resource import load_compiled
+
 
 class ContractionDictionary(object):
 
     contraction_table = {}
 
     def __init__(self, language):
-        with open(os.path.expanduser('lex_resources/contractions/' + language + '.contractions')) as f:
+        self.contraction_table = load_compiled(os.path.expanduser('lex_resources/contractions/' + language + '.contractions'),
+                                               ContractionDictionary.read_contractions)
+        self.contractions = set(self.contraction_table.values())
+
+    @staticmethod
+    def read_contractions(path):
+        table = {}
+
+        with open(path) as f:
             for line in f:
                 words = line.split(',')
-                self.contraction_table[words[0].strip()] = words[1].strip()
+                table[words[0].strip()] = words[1].strip()
+
+        return table
 
     def check_contraction(self, word1, word2):
         if word1 not in self.contraction_table and word2 not in self.contraction_table:
@@ -22,4 +34,4 @@ class ContractionDictionary(object):
         return False
 
     def is_contraction(self, word):
-        return word in self.contraction_table.values()
\ No newline at end of file
+        return word in self.contractions
\ No newline at end of file
@@ -0,0 +1,91 @@
+import os
+import pickle
+import tempfile
+
+
+class LazyResource(object):
+
+    """ Handle of a lexical resource that is created by factory() on first use, so that importing
+    lex_resources.config does not read the resource files """
+
+    def __init__(self, factory):
+        self.__dict__['_factory'] = factory
+        self.__dict__['_resource'] = None
+
+    def get(self):
+        if self._resource is None:
+            self.__dict__['_resource'] = self._factory()
+        return self._resource
+
+    def loaded(self):
+        return self._resource is not None
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+class LazyList(LazyResource):
+
+    # Word lists are used with in and concatenated with other lists (cobalt_stopwords + punctuations)
+
+    def __contains__(self, item):
+        return item in self.get()
+
+    def __iter__(self):
+        return iter(self.get())
+
+    def __len__(self):
+        return len(self.get())
+
+    def __getitem__(self, index):
+        return self.get()[index]
+
+    def __add__(self, other):
+        return self.get() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self.get()
+
+
+def replace_shared(tmp, path):
+
+    """ Moves a temporary file into place with the permissions of a file created by open() (0644 minus
+    the umask), mkstemp creates it readable by its owner only and the compiled files are shared by the
+    users of the checkout """
+
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp, 0o644 & ~umask)
+    os.replace(tmp, path)
+
+
+def load_compiled(path, read, version='1'):
+
+    """ Contents of a resource file as returned by read(path). They are pickled next to the file
+    (path.pickle) and read from there as long as the file and the version of read() do not change """
+
+    compiled_path = path + '.pickle'
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime, version)
+
+    if os.path.exists(compiled_path):
+        try:
+            with open(compiled_path, 'rb') as f:
+                compiled_signature, contents = pickle.load(f)
+            if compiled_signature == signature:
+                return contents
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+    contents = read(path)
+
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(compiled_path)))
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((signature, contents), f, protocol=pickle.HIGHEST_PROTOCOL)
+        replace_shared(tmp, compiled_path)
+    except OSError:
+        # Read-only resource directory, the file is read again on the next run
+        pass
+
+    return contents
@@ -0,0 +1,208 @@
+""" Compact store of the PPDB paraphrase pairs.
+    Words are interned as their position in a sorted array of UTF-8 strings and each pair is stored once, as the
+    key min(id1, id2) << 32 | max(id1, id2), so that a lookup is symmetric. The keys are kept in a sorted int64
+    array searched by bisection, with an optional Bloom filter over the keys that rejects most of the absent pairs
+    before the search.
+
+    The compiled store is written next to the PPDB file (ppdb.vocab.npy, ppdb.pairs.npy, ppdb.bloom.npy and
+    ppdb.signature.pickle, written last) and compiled again when the PPDB file or the format changes, or when
+    the compiled files cannot be read. The word and pair arrays are memory-mapped, so the processes of a parallel
+    run share the pages of the same files instead of building their own tables """
+
+import os
+import pickle
+import tempfile
+import numpy as np
+
+from lex_resources.lazy_resource import replace_shared
+
+
+# Bloom filter: bits per pair (rounded up to a power of two in total) and multipliers of the hash functions
+BLOOM_BITS_PER_PAIR = 10
+BLOOM_MULTIPLIERS = [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9]
+MASK = (1 << 64) - 1
+
+# Version of the compiled files, to be increased when their layout changes
+FORMAT_VERSION = '2'
+
+
+class PPDBStore(object):
+
+    def __init__(self):
+        self.paths = []
+        self.tables = []
+
+    def load(self, path, bloom=True):
+
+        # Adds the pairs of a PPDB file, files already loaded are not read again
+
+        path = os.path.abspath(os.path.expanduser(path))
+
+        if path in self.paths:
+            return
+
+        self.tables.append(PPDBTable.load(path, bloom=bloom))
+        self.paths.append(path)
+
+    def __contains__(self, pair):
+        return any(pair in table for table in self.tables)
+
+    def __len__(self):
+        return sum(len(table) for table in self.tables)
+
+    def present(self, word1, word2):
+
+        """ Whether the two words, lowercased, are a paraphrase pair in either order """
+
+        return (word1.lower(), word2.lower()) in self
+
+
+class PPDBTable(object):
+
+    def __init__(self, vocabulary, pairs, bloom=None):
+        # Sorted array of the UTF-8 encoded words, a word id is its index
+        self.vocabulary = vocabulary
+        self.pairs = pairs
+        # The filter is small (BLOOM_BITS_PER_PAIR bits per pair) and probed bit by bit, it is kept as bytes
+        self.bloom = bloom.tobytes() if bloom is not None else None
+        self.bloom_shift = 64 - (len(bloom) * 8 - 1).bit_length() if bloom is not None else None
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def word_id(self, word):
+
+        word = word.encode('utf-8')
+        i = int(self.vocabulary.searchsorted(word))
+
+        if i < len(self.vocabulary) and self.vocabulary[i] == word:
+            return i
+
+        return None
+
+    def __contains__(self, pair):
+
+        id1 = self.word_id(pair[0])
+        if id1 is None:
+            return False
+
+        id2 = self.word_id(pair[1])
+        if id2 is None:
+            return False
+
+        key = pair_key(id1, id2)
+
+        if self.bloom is not None:
+            for multiplier in BLOOM_MULTIPLIERS:
+                bit = ((key * multiplier) & MASK) >> self.bloom_shift
+                if not self.bloom[bit >> 3] & (1 << (bit & 7)):
+                    return False
+
+        i = self.pairs.searchsorted(key)
+        return i < len(self.pairs) and self.pairs[i] == key
+
+    @staticmethod
+    def read_pairs(path):
+
+        # Word pairs of a PPDB file, one pair per line (first two columns)
+
+        with open(path, 'r') as f:
+            for line in f:
+                if line == '\n':
+                    continue
+                tokens = line.split()
+                if len(tokens) < 2:
+                    continue
+                yield tokens[0], tokens[1].strip()
+
+    @staticmethod
+    def compile(path):
+
+        words1 = []
+        words2 = []
+
+        for word1, word2 in PPDBTable.read_pairs(path):
+            words1.append(word1.encode('utf-8'))
+            words2.append(word2.encode('utf-8'))
+
+        words1 = np.array(words1, dtype=bytes)
+        words2 = np.array(words2, dtype=bytes)
+        vocabulary = np.unique(np.concatenate((words1, words2)))
+
+        ids1 = vocabulary.searchsorted(words1).astype(np.int64)
+        ids2 = vocabulary.searchsorted(words2).astype(np.int64)
+        pairs = np.unique((np.minimum(ids1, ids2) << 32) | np.maximum(ids1, ids2))
+
+        return vocabulary, pairs, bloom_filter(pairs)
+
+    @staticmethod
+    def compiled_paths(path):
+        return path + '.vocab.npy', path + '.pairs.npy', path + '.bloom.npy', path + '.signature.pickle'
+
+    @staticmethod
+    def load(path, bloom=True):
+
+        vocabulary_path, pairs_path, bloom_path, signature_path = PPDBTable.compiled_paths(path)
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime, FORMAT_VERSION)
+
+        if os.path.exists(signature_path):
+            try:
+                with open(signature_path, 'rb') as f:
+                    compiled_signature = pickle.load(f)
+
+                if compiled_signature == signature:
+                    return PPDBTable(np.load(vocabulary_path, mmap_mode='r'), np.load(pairs_path, mmap_mode='r'),
+                                     np.load(bloom_path) if bloom else None)
+            except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+                # Unreadable or partial files, the store is compiled again
+                pass
+
+        vocabulary, pairs, bloom_bits = PPDBTable.compile(path)
+        PPDBTable.save(signature, vocabulary, pairs, bloom_bits, path)
+
+        return PPDBTable(vocabulary, pairs, bloom_bits if bloom else None)
+
+    @staticmethod
+    def save(signature, vocabulary, pairs, bloom_bits, path):
+
+        # The signature is written last so that it never refers to older arrays
+
+        directory = os.path.dirname(path)
+        compiled_paths = PPDBTable.compiled_paths(path)
+
+        try:
+            for array, compiled_path in zip([vocabulary, pairs, bloom_bits], compiled_paths[:3]):
+                fd, tmp = tempfile.mkstemp(dir=directory, suffix='.npy')
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, array)
+                replace_shared(tmp, compiled_path)
+
+            fd, tmp = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(signature, f, protocol=pickle.HIGHEST_PROTOCOL)
+            replace_shared(tmp, compiled_paths[3])
+        except OSError:
+            # Read-only resource directory, the store is compiled again on the next run
+            pass
+
+
+def pair_key(id1, id2):
+    return (id1 << 32) | id2 if id1 <= id2 else (id2 << 32) | id1
+
+
+def bloom_filter(keys):
+
+    # Bit array (as bytes) of BLOOM_BITS_PER_PAIR bits per key, rounded up to a power of two
+
+    size = max(64, 1 << (max(1, len(keys) * BLOOM_BITS_PER_PAIR) - 1).bit_length())
+    shift = np.uint64(64 - (size - 1).bit_length())
+    bits = np.zeros(size // 8, dtype=np.uint8)
+    keys = keys.astype(np.uint64)
+
+    for multiplier in BLOOM_MULTIPLIERS:
+        positions = (keys * np.uint64(multiplier)) >> shift
+        np.bitwise_or.at(bits, (positions >> np.uint64(3)).astype(np.int64),
+                         (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+
+    return bits
@@ -2,37 +2,36 @@ import codecs
 
 from itertools import islice
 
+from lex_resources.lazy_resource import load_compiled
+
 
 class SynonymDictionary(object):
 
-    wordSynsetTable = {}
+    # Version of the compiled synset index, to be increased when read_synsets changes
+    version = '2'
 
     def __init__(self, language):
-        with codecs.open('lex_resources/synonyms/' + language + '.synsets', 'r', 'utf8') as f:
+        # Lemma -> frozenset of synset ids
+        self.wordSynsetTable = load_compiled('lex_resources/synonyms/' + language + '.synsets',
+                                             SynonymDictionary.read_synsets, version=SynonymDictionary.version)
+
+    @staticmethod
+    def read_synsets(path):
+        table = {}
+
+        with codecs.open(path, 'r', 'utf8') as f:
             while True:
                 synsetBatch = list(islice(f, 2))
                 if not synsetBatch:
                     break
 
-                synsetList = []
-                for synset in synsetBatch[1].split():
-                    synsetList.append(int(synset))
+                table[synsetBatch[0].strip()] = frozenset(int(synset) for synset in synsetBatch[1].split())
 
-                self.wordSynsetTable[synsetBatch[0].strip()] = synsetList
+        return table
 
     # Checks if two lemmas are in one synset
     def checkSynonymByLemma(self, lemma1, lemma2):
         if lemma1 not in self.wordSynsetTable or lemma2 not in self.wordSynsetTable:
             return False
 
-        synsetList1 = self.wordSynsetTable[lemma1]
-        synsetList2 = self.wordSynsetTable[lemma2]
-
-        synonym = False
-
-        for synset in synsetList1:
-            if synset in synsetList2:
-                synonym = True
-                break
-
-        return synonym
\ No newline at end of file
+        return not self.wordSynsetTable[lemma1].isdisjoint(self.wordSynsetTable[lemma2])
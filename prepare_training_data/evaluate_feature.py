@@ -15,7 +15,7 @@ def evaluate_feature_scoring(config, feature_names, data_set, lang_pair, system_
 
     wmt = PrepareWmt()
     process = Process(config)
-    sents_tgt, sents_ref = process.run_processors()
+    sents_tgt, sents_ref = process.run_processors(feature_names)
 
     for feature in feature_names:
         extractor = FE(config)
@@ -36,7 +36,7 @@ def evaluate_feature_ranking(config, features_to_extract):
     process_wmt.print_data_set(config, data_structure)
 
     process = Process(config)
-    sents_tgt, sents_ref = process.run_processors()
+    sents_tgt, sents_ref = process.run_processors(features_to_extract)
 
     for feature in features_to_extract:
         extractor = FE(config)
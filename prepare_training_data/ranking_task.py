@@ -7,18 +7,20 @@ from json import loads
 
 import numpy as np
 import yaml
-from sklearn.cross_validation import StratifiedKFold
 from sklearn.externals import joblib
-from sklearn.feature_selection import RFECV, RFE
 from sklearn.metrics import accuracy_score
 
 from features.feature_extractor import FeatureExtractor
+from learning import feature_ranking
 from learning import learn_model
+from learning import model_export
+from learning import sklearn_utils
 from learning.learn_model import scale_datasets
 from processors.process import Process
 from utils.file_utils import read_reference_file, read_features_file
 from utils.file_utils import write_reference_file, write_feature_file
 from utils.human_ranking import HumanRanking
+from utils.learn_to_rank import pairwise_instances
 from utils.prepare_wmt import PrepareWmt
 from utils.wmt_kendall_variants import variants_definitions
 
@@ -41,11 +43,11 @@ class RankingTask(object):
             data_structure_parse = process_wmt_parse.get_data_structure(self.config)
             process_wmt_parse.print_data_set(self.config, data_structure_parse)
 
+        features_to_extract = FeatureExtractor.read_feature_names(self.config)
         process = Process(self.config)
-        sents_tgt, sents_ref = process.run_processors()
+        sents_tgt, sents_ref = process.run_processors(features_to_extract)
 
         extractor = FeatureExtractor(self.config)
-        features_to_extract = FeatureExtractor.read_feature_names(self.config)
         extractor.extract_features(features_to_extract, sents_tgt, sents_ref)
         feature_values = extractor.vals
 
@@ -88,11 +90,11 @@ class RankingTask(object):
         human_rankings = HumanRanking()
         human_rankings.add_human_data(f_judgements, self.config, max_comparisons=maximum_comparisons)
 
+        features_to_extract = FeatureExtractor.read_feature_names(self.config)
         process = Process(self.config)
-        sents_tgt, sents_ref = process.run_processors()
+        sents_tgt, sents_ref = process.run_processors(features_to_extract)
 
         extractor = FeatureExtractor(self.config)
-        features_to_extract = FeatureExtractor.read_feature_names(self.config)
 
         extractor.extract_features(features_to_extract, sents_tgt, sents_ref)
 
@@ -166,17 +168,21 @@ class RankingTask(object):
         confidence_scores = estimator.decision_function(x_test)
         return confidence_scores
 
-    def training_set_for_rank_direct(self, data_structure, human_rankings, feature_values, ignore_ties=True):
+    def training_set_for_rank_direct(self, data_structure, human_rankings, feature_values, ignore_ties=True, write=True):
 
         combination_methods = FeatureExtractor.get_combinations_from_config_file(self.config)
         data_set_name = self.config.get('WMT', 'dataset')
         feature_set_name = os.path.basename(self.config.get('Features', 'feature_set')).replace(".txt", "")
 
+        positions = self.sentence_positions(data_structure)
+        feature_values = np.asarray(feature_values, dtype=np.float32)
+        training_sets = {}
+
         for dataset, lang_pair in sorted(human_rankings.keys()):
 
-            f_features = open(os.path.expanduser(self.config.get('WMT', 'output_dir')) + '/' + 'x_' + data_set_name + '.' + feature_set_name + '.' + lang_pair + '.tsv', 'w')
-            f_objective = open(os.path.expanduser(self.config.get('WMT', 'output_dir')) + '/' + 'y_' + data_set_name + '.' + feature_set_name + '.' + lang_pair + '.tsv', 'w')
-            f_meta_data = open(os.path.expanduser(self.config.get('WMT', 'output_dir')) + '/' + 'meta_' + data_set_name + '.' + feature_set_name + '.' + lang_pair + '.tsv', 'w')
+            labels = []
+            idx_sys1 = []
+            idx_sys2 = []
 
             for human_comparison in human_rankings[dataset, lang_pair]:
 
@@ -184,54 +190,82 @@ class RankingTask(object):
                 if label is None:
                     continue
 
-                f_objective.write(label + '\n')
+                labels.append(int(label))
+                idx_sys1.append(positions[dataset, lang_pair, human_comparison.sys1, human_comparison.phrase])
+                idx_sys2.append(positions[dataset, lang_pair, human_comparison.sys2, human_comparison.phrase])
 
-                seg_id = human_comparison.phrase
-                sys1 = human_comparison.sys1
-                sys2 = human_comparison.sys2
-                idx_sys1, idx_sys2 = self.get_sentence_idx(dataset, lang_pair, data_structure, seg_id, sys1, sys2)
-                f_meta_data.write(str(idx_sys1) + '\t' + str(idx_sys2) + '\n')
+            idx_sys1 = np.array(idx_sys1, dtype=np.int64)
+            idx_sys2 = np.array(idx_sys2, dtype=np.int64)
 
-                combined_features = []
-                for i in range(len(feature_values[0])):
-                    combined_feature = self.combine_feature_values(combination_methods[i], feature_values[idx_sys1][i],
-                                                                   feature_values[idx_sys2][i])
-                    combined_features.append(combined_feature)
+            x = self.combine_feature_matrices(combination_methods, feature_values[idx_sys1], feature_values[idx_sys2])
+            y = np.array(labels, dtype=np.int32)
+            training_sets[dataset, lang_pair] = (x, y)
 
-                f_features.write('\t'.join([val for val in combined_features]) + '\n')
+            if not write:
+                continue
 
-            f_features.close()
-            f_objective.close()
-            f_meta_data.close()
+            output_dir = os.path.expanduser(self.config.get('WMT', 'output_dir'))
+            write_feature_file(output_dir + '/' + 'x_' + data_set_name + '.' + feature_set_name + '.' + lang_pair + '.tsv', x)
+            write_reference_file(output_dir + '/' + 'y_' + data_set_name + '.' + feature_set_name + '.' + lang_pair + '.tsv', y)
+            write_feature_file(output_dir + '/' + 'meta_' + data_set_name + '.' + feature_set_name + '.' + lang_pair + '.tsv',
+                               np.column_stack((idx_sys1, idx_sys2)))
 
-    def training_set_for_learn_to_rank(self, data_structure, human_rankings, feature_values):
+        return training_sets
 
-        data_set_name = self.config.get('WMT', 'dataset')
-        f_features = open(os.path.expanduser(self.config.get('WMT', 'output_dir')) + '/' + 'x_' + data_set_name + '.' + 'learn_to_rank' + '.tsv', 'w')
-        f_objective = open(os.path.expanduser(self.config.get('WMT', 'output_dir')) + '/' + 'y_' + data_set_name + '.' + 'learn_to_rank' + '.tsv', 'w')
+    def training_set_for_learn_to_rank(self, data_structure, human_rankings, feature_values, write=True, lazy=False):
 
-        for dataset, lang_pair in sorted(human_rankings.keys()):
+        # Pairwise differences winner - loser (label 1) and loser - winner (label 0) as float32,
+        # returned for training in memory and written to the learn_to_rank files if write is set
 
-            for human_comparison in human_rankings[dataset, lang_pair]:
+        winners, losers = human_rankings.winner_loser_indexes(self.sentence_positions(data_structure))
+        x, y = pairwise_instances(feature_values, winners, losers, lazy=lazy)
 
-                if human_comparison.sign == '=':
-                    continue
+        if write:
+            data_set_name = self.config.get('WMT', 'dataset')
+            output_dir = os.path.expanduser(self.config.get('WMT', 'output_dir'))
+            write_feature_file(output_dir + '/' + 'x_' + data_set_name + '.' + 'learn_to_rank' + '.tsv', np.asarray(x))
+            write_reference_file(output_dir + '/' + 'y_' + data_set_name + '.' + 'learn_to_rank' + '.tsv', y)
 
-                seg_id = human_comparison.phrase
-                winner, loser = self.find_winner_loser(human_comparison)
-                idx_winner, idx_loser = self.get_sentence_idx(dataset, lang_pair, data_structure, seg_id, winner, loser)
+        return x, y
 
-                positive_instance, negative_instance = self.get_instance(feature_values[idx_winner],
-                                                                         feature_values[idx_loser])
+    @staticmethod
+    def sentence_positions(data_structure):
 
-                f_features.write('\t'.join([str(x) for x in positive_instance]) + '\n')
-                f_features.write('\t'.join([str(x) for x in negative_instance]) + '\n')
+        # Index of each [dataset, lang_pair, system, phrase] entry, first occurrence as list.index
 
-                f_objective.write('1' + '\n')
-                f_objective.write('0' + '\n')
+        positions = {}
+        for i, item in enumerate(data_structure):
+            positions.setdefault(tuple(item), i)
+        return positions
 
-        f_features.close()
-        f_objective.close()
+    @staticmethod
+    def combine_feature_matrices(methods, feature_values1, feature_values2):
+
+        # Column-wise version of combine_feature_values for two instance matrices
+
+        columns = []
+
+        for i, method in enumerate(methods):
+            v1 = feature_values1[:, i]
+            v2 = feature_values2[:, i]
+
+            if method == 'average':
+                columns.append((v1 + v2) / 2)
+            elif method == 'difference':
+                columns.append(v1 - v2)
+            elif method == 'absolute_difference':
+                columns.append(np.fabs(v1 - v2))
+            elif method == 'maximum':
+                columns.append(np.maximum(v1, v2))
+            elif method == 'minimum':
+                columns.append(np.minimum(v1, v2))
+            elif method == 'first':
+                columns.append(v1)
+            elif method == 'both':
+                columns.append(v1)
+                columns.append(v2)
+
+        return np.column_stack(columns) if columns else np.zeros((len(feature_values1), 0), dtype=feature_values1.dtype)
 
     @staticmethod
     def training_set_for_learn_to_rank_from_feature_file(config_learning, config):
@@ -476,6 +510,13 @@ class RankingTask(object):
 
         learning_config = config_learning.get("learning", None)
         method_name = learning_config.get("method", None)
+        model_path = os.path.expanduser(config_data.get("Learner", "models")) + "/" + method_name + ".pkl"
+
+        # The exported artifact holds the scaling statistics of the training set
+        artifact = model_export.current_model_path(model_path)
+        if artifact is not None:
+            x_test = read_features_file(config_learning.get('x_test'), '\t')
+            return model_export.load_model(artifact).predict(x_test)
 
         x_train = read_features_file(config_learning.get('x_train'), '\t')
         y_train = read_reference_file(config_learning.get('y_train'), '\t')
@@ -487,7 +528,7 @@ class RankingTask(object):
         if scale:
             x_train, x_test = scale_datasets(x_train, x_test)
 
-        estimator = joblib.load(os.path.expanduser(config_data.get("Learner", "models")) + "/" + method_name + ".pkl")
+        estimator = joblib.load(model_path)
         predictions = estimator.predict(x_test)
 
         return predictions
@@ -520,16 +561,21 @@ class RankingTask(object):
         output.close()
 
     @staticmethod
-    def train_save(config_learning, config_data):
+    def train_save(config_learning, config_data, x_train=None, y_train=None):
+
+        # x_train and y_train can be passed in memory (e.g. from training_set_for_learn_to_rank)
 
         learning_config = config_learning.get("learning", None)
         method_name = learning_config.get("method", None)
 
-        x_train = read_features_file(config_learning.get('x_train'), '\t')
-        y_train = read_reference_file(config_learning.get('y_train'), '\t')
+        if x_train is None:
+            x_train = read_features_file(config_learning.get('x_train'), '\t')
+            y_train = read_reference_file(config_learning.get('y_train'), '\t')
+
         x_test = read_features_file(config_learning.get('x_test'), '\t')
 
         scale = config_learning.get("scale", True)
+        x_unscaled = np.asarray(x_train)
 
         if scale:
             x_train, x_test = scale_datasets(x_train, x_test)
@@ -537,16 +583,32 @@ class RankingTask(object):
         estimator, scorers = learn_model.set_learning_method(config_learning, x_train, y_train)
 
         estimator.fit(x_train, y_train)
-        joblib.dump(estimator, os.path.expanduser(config_data.get('Learner', 'models')) + '/' + method_name + '.pkl')
+        model_path = os.path.expanduser(config_data.get('Learner', 'models')) + '/' + method_name + '.pkl'
+        joblib.dump(estimator, model_path)
+        sklearn_utils.export_model(estimator, model_path, x_unscaled, scale)
 
     @staticmethod
-    def recursive_feature_elimination(config_learning, config_data, number_features):
-
-        output = open(os.path.expanduser(config_data.get("Learner", "models")) + "/" + "feature_ranks.txt", "w")
+    def feature_list(config_data):
 
         feature_names = FeatureExtractor.get_features_from_config_file_unsorted(config_data)
         combination_methods = FeatureExtractor.get_combinations_from_config_file_unsorted(config_data)
 
+        feature_list = []
+
+        for i, feature_name in enumerate(feature_names):
+             if combination_methods[i] == 'both':
+                 feature_list.append(feature_name)
+                 feature_list.append(feature_name)
+             else:
+                 feature_list.append(feature_name)
+
+        return feature_list
+
+    @staticmethod
+    def recursive_feature_elimination(config_learning, config_data, number_features):
+
+        output = open(os.path.expanduser(config_data.get("Learner", "models")) + "/" + "feature_ranks.txt", "w")
+
         x_train = read_features_file(config_learning.get('x_train'), '\t')
         y_train = read_reference_file(config_learning.get('y_train'), '\t')
         x_test = read_features_file(config_learning.get('x_test'), '\t')
@@ -557,22 +619,12 @@ class RankingTask(object):
         if scale:
             x_train, x_test = scale_datasets(x_train, x_test)
 
-        rfe = RFE(estimator, number_features, step=1)
-        rfe.fit(x_train, y_train)
+        ranking = feature_ranking.rank_features_from_config(config_learning, estimator, x_train, y_train, number_features,
+                                                            scorers=learn_model.set_scorer_functions(['accuracy_score']),
+                                                            feature_names=RankingTask.feature_list(config_data),
+                                                            output=output)
 
-        feature_list = []
-
-        for i, feature_name in enumerate(feature_names):
-             if combination_methods[i] == 'both':
-                 feature_list.append(feature_name)
-                 feature_list.append(feature_name)
-             else:
-                 feature_list.append(feature_name)
-
-        for i, name in enumerate(feature_list):
-            output.write(name + "\t" + str(rfe.ranking_[i]) + "\n")
-
-        predictions = rfe.predict(x_test)
+        predictions = ranking.estimator.predict(x_test[:, ranking.support])
 
         output.close()
 
@@ -583,9 +635,6 @@ class RankingTask(object):
 
         output = open(os.path.expanduser(config_data.get("Learner", "models")) + "/" + "feature_ranks.txt", "w")
 
-        feature_names = FeatureExtractor.get_features_from_config_file_unsorted(config_data)
-        combination_methods = FeatureExtractor.get_combinations_from_config_file_unsorted(config_data)
-
         x_train = read_features_file(config_learning.get('x_train'), '\t')
         y_train = read_reference_file(config_learning.get('y_train'), '\t')
         x_test = read_features_file(config_learning.get('x_test'), '\t')
@@ -596,24 +645,18 @@ class RankingTask(object):
         if scale:
             x_train, x_test = scale_datasets(x_train, x_test)
 
-        rfecv = RFECV(estimator=estimator, step=1, cv=StratifiedKFold(y_train, 2), scoring='accuracy')
-        rfecv.fit(x_train, y_train)
+        rfe_config = dict(config_learning.get("rfe", None) or {})
+        rfe_config.setdefault("cv", 2)
+        config_learning = dict(config_learning, rfe=rfe_config)
 
-        feature_list = []
-
-        for i, feature_name in enumerate(feature_names):
-             if combination_methods[i] == 'both':
-                 feature_list.append(feature_name)
-                 feature_list.append(feature_name)
-             else:
-                 feature_list.append(feature_name)
-
-        for i, name in enumerate(feature_list):
-            output.write(name + "\t" + str(rfecv.ranking_[i]) + "\n")
+        ranking = feature_ranking.rank_features_from_config(config_learning, estimator, x_train, y_train,
+                                                            scorers=learn_model.set_scorer_functions(['accuracy_score']),
+                                                            feature_names=RankingTask.feature_list(config_data),
+                                                            output=output)
 
         output.close()
 
-        predictions = rfecv.predict(x_test)
+        predictions = ranking.estimator.predict(x_test[:, ranking.support])
 
         return predictions
 
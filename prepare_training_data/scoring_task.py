@@ -1,18 +1,20 @@
 import codecs
 import os
 import re
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from configparser import ConfigParser
 from json import loads
 
 import yaml
-from sklearn.feature_selection import RFE
 
 from features.feature_extractor import FeatureExtractor
+from learning import feature_ranking
 from learning import learn_model
 from learning.customize_scorer import pearson_corrcoef
 from learning.learn_model import scale_datasets
 from processors.process import Process
-from utils.file_utils import read_reference_file, write_lines_to_file, read_features_file, write_feature_file, write_reference_file
+from utils.file_utils import read_reference_file, write_lines_to_file, read_features_file
 
 
 class ScoringTask():
@@ -82,11 +84,11 @@ class ScoringTask():
     def get_data(self):
 
         human_scores = read_reference_file(os.path.expanduser(self.config.get('Data', 'human_scores')), '\t')
+        features_to_extract = FeatureExtractor.read_feature_names(self.config)
         process = Process(self.config)
-        sents_tgt, sents_ref = process.run_processors()
+        sents_tgt, sents_ref = process.run_processors(features_to_extract)
 
         extractor = FeatureExtractor(self.config)
-        features_to_extract = FeatureExtractor.read_feature_names(self.config)
         extractor.extract_features(features_to_extract, sents_tgt, sents_ref)
 
         return extractor.vals, human_scores
@@ -125,58 +127,60 @@ class ScoringTask():
             results.append(lp)
         return results
 
-    def round_robin(self, config_path_learning, config_path, feature_set, lps):
+    def lang_pair_paths(self, feature_set, lp):
+        output_dir = os.path.expanduser(self.config.get('Data', 'output_dir'))
+        name = self.config.get("Settings", "dataset") + "." + feature_set + "." + lp + "." + "tsv"
+        return output_dir + "/" + "x_" + name, output_dir + "/" + "y_" + name
 
-        config = ConfigParser()
-        config.readfp(open(config_path))
+    def read_lang_pairs(self, feature_set, lps):
 
-        with open(config_path_learning, "r") as cfg_file:
-            config_learning = yaml.load(cfg_file.read())
+        # Feature and label matrices of every language pair, read once
 
-        f_results = open("results.txt", "w")
+        data = {}
+        for lp in sorted(lps):
+            x_path, y_path = self.lang_pair_paths(feature_set, lp)
+            data[lp] = (read_features_file(x_path, "\t"), read_reference_file(y_path, "\t"))
 
-        for test_lp in sorted(lps):
+        return data
 
-            x_train = os.path.expanduser(self.config.get('Data', 'output_dir')) + "/" + "x_" + self.config.get("Settings", "dataset") + "." + "train" + "." + "tsv"
-            y_train = os.path.expanduser(self.config.get('Data', 'output_dir')) + "/" + "y_" + self.config.get("Settings", "dataset") + "." + "train" + "." + "tsv"
-            x_test = os.path.expanduser(self.config.get('Data', 'output_dir')) + "/" + "x_" + self.config.get("Settings", "dataset") + "." + "test" + "." + "tsv"
-            y_test = os.path.expanduser(self.config.get('Data', 'output_dir')) + "/" + "y_" + self.config.get("Settings", "dataset") + "." + "test" + "." + "tsv"
+    def round_robin(self, config_path_learning, feature_set, lps, n_jobs=None):
 
-            train_lps = ScoringTask.get_train_lps(lps, test_lp)
+        # Leave-one-language-pair-out evaluation: the matrices of all the language pairs are loaded once,
+        # training sets are combined in memory and the folds run concurrently on a process pool
 
-            train_feature_values = []
-            train_reference_values = []
+        with open(config_path_learning, "r") as cfg_file:
+            config_learning = yaml.load(cfg_file.read())
+
+        data = self.read_lang_pairs(feature_set, lps)
 
-            test_feature_values = read_features_file(os.path.expanduser(self.config.get('Data', 'output_dir')) + "/" + \
-                                                    "x_" + self.config.get("Settings", "dataset") + "." + feature_set + "." + test_lp + "." + "tsv", "\t")
-            test_reference_values = read_reference_file(os.path.expanduser(self.config.get('Data', 'output_dir')) + "/" + \
-                                                    "y_" + self.config.get("Settings", "dataset") + "." + feature_set + "." + test_lp + "." + "tsv", "\t")
+        results = {}
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futures = {}
+            for test_lp in sorted(lps):
+                train_lps = sorted(ScoringTask.get_train_lps(lps, test_lp))
+                x_train = np.concatenate([data[lp][0] for lp in train_lps])
+                y_train = np.concatenate([data[lp][1] for lp in train_lps])
+                x_test, y_test = data[test_lp]
+                futures[pool.submit(ScoringTask.evaluate_fold, config_learning, x_train, y_train, x_test, y_test)] = test_lp
 
-            for train_lp in sorted(train_lps):
-                feature_values = read_features_file(os.path.expanduser(self.config.get('Data', 'output_dir')) + "/" + \
-                                                    "x_" + self.config.get("Settings", "dataset") + "." + feature_set + "." + train_lp + "." + "tsv", "\t")
-                reference_values = read_reference_file(os.path.expanduser(self.config.get('Data', 'output_dir')) + "/" + \
-                                                    "y_" + self.config.get("Settings", "dataset") + "." + feature_set + "." + train_lp + "." + "tsv", "\t")
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
 
-                train_feature_values += list(feature_values)
-                train_reference_values += list(reference_values)
+        with open("results.txt", "w") as f_results:
+            f_results.write("\t".join(["lang_pair", "correlation", "fit_time", "predict_time", "feature_set"]) + "\n")
+            for test_lp in sorted(results.keys()):
+                correlation, fit_time, predict_time = results[test_lp]
+                print(test_lp + " " + str(correlation) + " with " + feature_set)
+                f_results.write("\t".join([test_lp, str(correlation), "%.3f" % fit_time, "%.3f" % predict_time, feature_set]) + "\n")
 
-            write_feature_file(x_train, train_feature_values)
-            write_reference_file(y_train, train_reference_values)
-            write_feature_file(x_test, test_feature_values)
-            write_reference_file(y_test, test_reference_values)
+        return results
 
-            gold_standard = test_reference_values
-            predictions = ScoringTask.train_predict(config_path_learning)
-            # predictions = ScoringTask.recursive_feature_elimination(config_learning, config, 50)
+    @staticmethod
+    def evaluate_fold(config_learning, x_train, y_train, x_test, y_test):
 
-            correlation = ScoringTask.evaluate_predicted(predictions, gold_standard)
+        result = learn_model.train_model(config_learning, x_train, y_train, x_test)
 
-            f_results.write(test_lp + " " + str(correlation) + " with " + feature_set + "\n")
-            os.remove(x_train)
-            os.remove(x_test)
-            os.remove(y_train)
-            os.remove(y_test)
+        return pearson_corrcoef(y_test, result.predictions), result.fit_time, result.predict_time
 
     @staticmethod
     def train_predict(config_path):
@@ -219,14 +223,15 @@ class ScoringTask():
         if scale:
             x_train, x_test = scale_datasets(x_train, x_test)
 
-        rfe = RFE(estimator, number_features, step=1)
-        rfe.fit(x_train, y_train)
+        ranking = feature_ranking.rank_features_from_config(config_learning, estimator, x_train, y_train, number_features,
+                                                            scorers=learn_model.set_scorer_functions(['pearson_corrcoef']),
+                                                            feature_names=feature_names,
+                                                            output=output)
 
         for i, name in enumerate(feature_names):
-            output.write(name + "\t" + str(rfe.ranking_[i]) + "\n")
-            print(name + "\t" + str(rfe.ranking_[i]))
+            print(name + "\t" + str(ranking.ranking[i]))
 
-        predictions = rfe.predict(x_test)
+        predictions = ranking.estimator.predict(x_test[:, ranking.support])
 
         output.close()
 
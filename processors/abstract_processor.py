@@ -1,7 +1,13 @@
+import os
+import numpy as np
 
 
 class AbstractProcessor(object):
 
+    # Version of the processor output, to be increased when the output of run() changes
+    # (cached outputs of previous versions are not reused, see utils.artifact_cache)
+    version = '1'
+
     def __init__(self):
         self.name = str
         self.result_tgt = []
@@ -31,6 +37,70 @@ class AbstractProcessor(object):
     def get_result_ref(self):
         return self.result_ref
 
+    def cache_inputs(self, config):
+
+        """ Files whose contents determine the output of run() or read by get(), their producers are
+        kept when the processors are pruned (see Process.required_processors) """
+
+        return []
+
+    def cache_outputs(self, config):
+
+        """ Files written by run(), the processor is cached only if it declares them.
+        A processor writing files read by others must declare them, or it may be pruned """
+
+        return []
+
+    def cache_resources(self, config):
+
+        """ Large files used by run(), identified by path, size and modification time """
+
+        return []
+
+    def cache_settings(self, config):
+
+        """ Configuration values that determine the output of run() """
+
+        return []
+
+    @staticmethod
+    def reference_index(config):
+
+        """ Returns the id of the unique reference for each target sentence (written by RankingData),
+        or None if references are not shared """
+
+        path = os.path.expanduser(config.get('Data', 'working_dir')) + '/' + 'ref.index'
+
+        if not os.path.exists(path):
+            return None
+
+        return np.loadtxt(path, dtype=np.int64, ndmin=1)
+
+    @staticmethod
+    def unique_references(items, index):
+
+        """ Keeps the first occurrence of each reference, in the order of reference ids """
+
+        if index is None:
+            return items
+
+        unique = [None] * (int(index.max()) + 1 if len(index) > 0 else 0)
+        for i, ref_id in enumerate(index):
+            if unique[ref_id] is None:
+                unique[ref_id] = items[i]
+
+        return unique
+
+    @staticmethod
+    def share_references(results, index):
+
+        """ Maps results computed once per unique reference back to every target sentence """
+
+        if index is None:
+            return results
+
+        return [results[ref_id] for ref_id in index]
+
     def test_processor(self, processor, output_dir, dataset, data):
 
         """ Receives a processor object, runs the commands on the whole wmt dataset,
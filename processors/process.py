@@ -1,7 +1,9 @@
 import inspect
+import os
 
 from json import loads
 from processors import processors
+from utils.artifact_cache import ArtifactCache
 from utils.sentence import Sentence
 
 
@@ -11,7 +13,10 @@ class Process(object):
         self.config = config
         self.outputs = {}
 
-    def run_processors(self):
+    def run_processors(self, feature_names=None):
+
+        """ Runs the processors of the configuration, or if feature_names is given only those
+        whose results are read by the features (see required_processors) """
 
         results_target = []
         results_reference = []
@@ -31,6 +36,13 @@ class Process(object):
             name_class = (proc, existing_processors[proc])
             selected_processors.append(name_class)
 
+        if feature_names is not None and not (self.config.has_option('Processors', 'prune') and
+                                              not self.config.getboolean('Processors', 'prune')):
+            selected_processors = self.required_processors(selected_processors, feature_names)
+
+        cache = ArtifactCache.from_config(self.config)
+        cache_keys = []
+
         for name, my_class in selected_processors:
 
             instance = my_class()
@@ -40,7 +52,15 @@ class Process(object):
                     from_file = True
 
             print('Running ' + instance.get_name())
-            instance.run(self.config, from_file=from_file)
+            outputs = instance.cache_outputs(self.config)
+
+            if cache is not None and not from_file and len(outputs) > 0:
+                cache_keys.append(cache.run(instance.get_name(), instance.version, instance.cache_inputs(self.config),
+                                            outputs, lambda: instance.run(self.config, from_file=from_file),
+                                            resources=instance.cache_resources(self.config),
+                                            settings=instance.cache_settings(self.config)))
+            else:
+                instance.run(self.config, from_file=from_file)
 
             print('Getting ' + instance.get_name())
             instance.get(self.config, from_file=from_file)
@@ -53,6 +73,11 @@ class Process(object):
                 results_target.append(instance.get_result_tgt())
                 results_reference.append(instance.get_result_ref())
 
+        if cache is not None:
+            cache.report()
+            if self.config.has_option('Cache', 'max_age_days'):
+                cache.collect_garbage(self.config.getfloat('Cache', 'max_age_days'), keep=cache_keys)
+
         for i in range(len(results_target[0])):
 
             my_sentence_tgt = Sentence()
@@ -71,5 +96,49 @@ class Process(object):
         return [sentences_target, sentences_reference]
 
 
+    def required_processors(self, selected_processors, feature_names):
+
+        """ Minimal subset of the configured processors, in the configured order, for the given features:
+        the last processor producing each Sentence key read by the features, and the processors
+        writing the files that these read (cache_outputs / cache_inputs). Processors without results
+        nor declared output files are always kept, as are all processors if a feature does not declare
+        its requirements (AbstractFeature.requires) """
+
+        from features.feature_extractor import registry
+
+        required = set()
+        for info in registry.infos(feature_names):
+            if info.requirements is None:
+                return selected_processors
+            required.update(info.requirements)
+
+        needed_files = set()
+        result = []
+
+        for name, my_class in reversed(selected_processors):
+            instance = my_class()
+            key = Sentence.data_key(instance.get_name()) if instance.get_output() is not None else None
+            outputs = [os.path.abspath(os.path.expanduser(path)) for path in instance.cache_outputs(self.config)]
+
+            if key is None and len(outputs) == 0:
+                keep = True
+            else:
+                keep = key in required or any(path in needed_files for path in outputs)
+
+            if not keep:
+                print('Skipping ' + name + ', its results are not used by the selected features')
+                continue
+
+            result.append((name, my_class))
+            # Results of earlier processors with the same key would be overwritten
+            required.discard(key)
+            needed_files.update(os.path.abspath(os.path.expanduser(path)) for path in instance.cache_inputs(self.config))
+
+        for key in sorted(required):
+            print('Warning! No processor produces ' + key + ', required by the selected features')
+
+        return list(reversed(result))
+
+
 def get_len(my_file):
     return sum(1 for line in open(my_file))
\ No newline at end of file
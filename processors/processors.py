@@ -10,10 +10,6 @@ import re
 from collections import defaultdict
 from configparser import ConfigParser
 from processors.abstract_processor import AbstractProcessor
-from alignment.aligner import Aligner
-from alignment.aligner_stanford import AlignerStanford
-from alignment.context_info_compiler import ContextInfoCompiler
-from alignment.aligner import punctuations
 from utils.cobalt_align_reader_stanford import CobaltAlignReaderStanford
 from utils.cobalt_align_reader import CobaltAlignReader
 from utils.meteor_align_reader import MeteorAlignReader
@@ -23,11 +19,10 @@ from utils.core_nlp_utils import read_parsed_sentences, prepareSentence2, parse_
 from utils.features_reader import FeaturesReader
 from utils import txt_xml as xml
 from utils.stanford_format import StanfordParseLoader
-from gensim.models.word2vec import Word2Vec
-from numpy import array
-from numpy import zeros
 from processors.language_model import LanguageModel
 from utils.load_resources import load_ppdb, load_word_vectors
+from utils import embeddings
+from utils.artifact_cache import ArtifactCache
 from alignment.aligner_config import AlignerConfig
 from lex_resources.config import *
 from json import loads
@@ -52,6 +47,18 @@ class PosLangModel(AbstractProcessor):
         lm.set_path_to_tools('/Users/MarinaFomicheva/workspace/srilm-1.7.1/bin/macosx/')
         lm.produce_ppl(f_in, f_out, f_lm, 3)
 
+    def cache_inputs(self, config):
+        return PosTagger().cache_inputs(config)
+
+    def cache_outputs(self, config):
+        return PosTagger().cache_outputs(config) + [os.path.expanduser(config.get('Data', 'tgt')) + '.pos.join' + '.ppl']
+
+    def cache_resources(self, config):
+        return PosTagger().cache_resources(config) + [os.path.expanduser(config.get('LangModels', 'pos'))]
+
+    def cache_settings(self, config):
+        return PosTagger().cache_settings(config)
+
     def get(self, config, from_file=False):
 
         f_token = open(os.path.expanduser(config.get('Data', 'tgt')) + '.token', 'r')
@@ -128,6 +135,14 @@ class POSTaggerParse(AbstractProcessor):
         output_tgt.close()
         output_ref.close()
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt') + '.' + 'parse'),
+                os.path.expanduser(config.get('Data', 'ref') + '.' + 'parse')]
+
+    def cache_outputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'pos',
+                os.path.expanduser(config.get('Data', 'ref')) + '.' + 'pos']
+
     def get(self, config, from_file=False):
         pass
 
@@ -176,6 +191,24 @@ class PosTagger(AbstractProcessor):
 
         self.join_pos(config)
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')), os.path.expanduser(config.get('Data', 'ref'))]
+
+    def cache_outputs(self, config):
+
+        # The tags are written to <tgt>.pos, which join_pos() removes after joining them
+
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.token',
+                os.path.expanduser(config.get('Data', 'ref')) + '.token',
+                os.path.expanduser(config.get('Data', 'src')) + '.token',
+                os.path.expanduser(config.get('Data', 'tgt')) + '.pos' + '.' + 'join']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Tokenizer', 'path')), os.path.expanduser(config.get('PosTagger', 'path'))]
+
+    def cache_settings(self, config):
+        return [config.get('Settings', 'tgt_lang')]
+
     @staticmethod
     def tokenize_for_pos(config, sample):
 
@@ -244,62 +277,53 @@ class WordVectors(AbstractProcessor):
     def run(self, config, from_file=False):
         print("Loading word vectors")
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token',
+                os.path.expanduser(config.get('Data', 'ref')) + '.' + 'token']
+
     def get(self, config, from_file=False):
 
         lines_ref = codecs.open(os.path.expanduser(config.get('Data', 'ref')) + '.' + 'token', 'r', 'utf-8').readlines()
         lines_tgt = codecs.open(os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token', 'r', 'utf-8').readlines()
 
-        fvectors = os.path.expanduser(config.get('Vectors', 'path'))
-
-        print("Loading word vectors from " + fvectors)
-        wv = Word2Vec.load_word2vec_format(fvectors, binary=False)
-
-        print("Finished loading word vectors from " + fvectors)
+        wv = embeddings.load_model(config.get('Vectors', 'path'))
 
         print("Building sentence vectors for target...")
         AbstractProcessor.set_result_tgt(self, self.words2vec(lines_tgt, wv))
         print("Finished building sentence vectors for target")
         print("Building sentence vectors for reference...")
-        AbstractProcessor.set_result_ref(self, self.words2vec(lines_ref, wv))
+        ref_index = AbstractProcessor.reference_index(config)
+        unique_ref = AbstractProcessor.unique_references(lines_ref, ref_index)
+        AbstractProcessor.set_result_ref(self, AbstractProcessor.share_references(self.words2vec(unique_ref, wv), ref_index))
         print("Finished building sentence vectors for reference")
 
-        wv = None
         print("Finished getting word vectors")
 
-
     @staticmethod
     def words2vec(sents, model):
 
         # Here vectors are added for all the words to preserve sentence length
-        result = []
-
-        for line in sents:
-            tokens = [t.lower() for t in line.strip().split(' ')]
-            vecs = []
-
-            for token in tokens:
-                if token in model.index2word:
-                    vecs.append(model[token])
-                else:
-                    vecs.append(zeros(model.vector_size))
-
-            result.append(array(vecs))
+        # Each sentence is a view on one contiguous float32 array
 
-        return result
+        ids, offsets = embeddings.token_ids(sents, model.vocab)
+        return embeddings.split(embeddings.word_vectors(ids, model.matrix), offsets)
 
     @staticmethod
     def word2vec_format(input_path, vocab_size, vector_size, delimiter):
 
-        lines = open(input_path, 'r').readlines()
         output_path = input_path + '.' + 'word2vec'
-        if os.path.exists(output_path):
-            print("Already exists!")
-            return
 
-        output_f = open(output_path, 'w')
-        output_f.write(str(vocab_size) + ' ' + str(vector_size) + '\n')
-        for line in lines:
-            output_f.write(line.replace('\t', ' '))
+        def convert():
+            lines = open(input_path, 'r').readlines()
+            output_f = open(output_path, 'w')
+            output_f.write(str(vocab_size) + ' ' + str(vector_size) + '\n')
+            for line in lines:
+                output_f.write(line.replace('\t', ' '))
+            output_f.close()
+
+        cache = ArtifactCache(os.path.dirname(os.path.abspath(input_path)) + '/' + '.cache')
+        cache.run('word2vec_format', '1', [input_path], [output_path], convert,
+                  settings=[vocab_size, vector_size, delimiter])
 
 
 class SentVector(AbstractProcessor):
@@ -312,6 +336,10 @@ class SentVector(AbstractProcessor):
     def run(self, config, from_file=False):
         print("Loading word vectors")
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token',
+                os.path.expanduser(config.get('Data', 'ref')) + '.' + 'token']
+
     def get(self, config, from_file=False):
 
         print("Getting sentence vectors")
@@ -319,37 +347,23 @@ class SentVector(AbstractProcessor):
         lines_ref = codecs.open(os.path.expanduser(config.get('Data', 'ref')) + '.' + 'token', 'r', 'utf-8').readlines()
         lines_tgt = codecs.open(os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token', 'r', 'utf-8').readlines()
 
-        fvectors = os.path.expanduser(config.get('Vectors', 'path'))
-        wv = Word2Vec.load_word2vec_format(fvectors, binary=False)
+        wv = embeddings.load_model(config.get('Vectors', 'path'))
+
+        ref_index = AbstractProcessor.reference_index(config)
+        unique_ref = AbstractProcessor.unique_references(lines_ref, ref_index)
 
         AbstractProcessor.set_result_tgt(self, self.sents2vec(lines_tgt, wv))
-        AbstractProcessor.set_result_ref(self, self.sents2vec(lines_ref, wv))
+        AbstractProcessor.set_result_ref(self, AbstractProcessor.share_references(self.sents2vec(unique_ref, wv), ref_index))
 
-        wv = None
         print("Finished getting sentence vectors")
 
-
     @staticmethod
     def sents2vec(sents, model):
 
-        result = []
-        for line in sents:
+        # Mean of the word vectors (punctuation excluded), one row of a float32 matrix per sentence
 
-            tokens = [t.lower() for t in line.strip().split(' ')]
-            vecs = []
-
-            for token in tokens:
-                if token in punctuations:
-                    continue
-                if token in model.index2word:
-                    vecs.append(model[token])
-
-            if len(vecs) == 0:
-                result.append(zeros(model.vector_size))
-            else:
-                result.append(array(vecs).mean(axis=0))
-
-        return result
+        ids, offsets = embeddings.token_ids(sents, model.vocab, skip=set(punctuations))
+        return list(embeddings.sentence_means(ids, offsets, model.matrix))
 
 
 class Parse(AbstractProcessor):
@@ -397,7 +411,8 @@ class ParseStanford(AbstractProcessor):
         working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
 
         result_tgt = StanfordParseLoader.parsed_sentences(working_dir + '/' + 'tgt.parse')
-        result_ref = StanfordParseLoader.parsed_sentences(working_dir + '/' + 'ref.parse')
+        result_ref = StanfordParseLoader.parsed_sentences(working_dir + '/' + 'ref.parse',
+                                                          index=AbstractProcessor.reference_index(config))
 
         AbstractProcessor.set_result_tgt(self, result_tgt)
         AbstractProcessor.set_result_ref(self, result_ref)
@@ -453,12 +468,9 @@ class Bleu(AbstractProcessor):
         if not os.path.exists(src_path):
             shutil.copyfile(tgt_path, src_path)
 
-        if os.path.exists(os.path.expanduser(config.get('Metrics', 'dir')) + '/' + tgt_path.split('/')[-1] + '.bleu.scores'):
-            print("Bleu scores already exist!")
-            return
-
-        if not os.path.exists(ref_path + '.xml'):
-            xml.run(src_path, ref_path, tgt_path)
+        # The XML files are written again on every run, run() is only called when the cached scores
+        # of the current tgt and ref cannot be used
+        xml.run(src_path, ref_path, tgt_path)
 
         bleu_path = os.path.expanduser(config.get('Metrics', 'bleu'))
         my_file = os.path.expanduser(config.get('Metrics', 'dir')) + '/' + tgt_path.split('/')[-1] + '.bleu.scores'
@@ -468,6 +480,16 @@ class Bleu(AbstractProcessor):
                          '-s', src_path + '.xml'], stdout=o)
         o.close()
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')), os.path.expanduser(config.get('Data', 'ref'))]
+
+    def cache_outputs(self, config):
+        tgt_path = os.path.expanduser(config.get('Data', 'tgt'))
+        return [os.path.expanduser(config.get('Metrics', 'dir')) + '/' + tgt_path.split('/')[-1] + '.bleu.scores']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Metrics', 'bleu'))]
+
     def get(self, config, from_file=False):
 
         result = []
@@ -527,6 +549,19 @@ class MeteorScorer(AbstractProcessor):
         subprocess.call(['java', '-Xmx2G', '-jar', meteor, tgt_path, ref_path, '-l', lang, '-norm'], stdout=o)
         o.close()
 
+    def cache_inputs(self, config):
+        wd = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [wd + '/' + 'tgt.txt', wd + '/' + 'ref.txt']
+
+    def cache_outputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'working_dir')) + '/' + 'meteor.scores']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Paths', 'meteor'))]
+
+    def cache_settings(self, config):
+        return [config.get('Settings', 'target_language')]
+
     def get(self, config, from_file=False):
 
         wd = os.path.expanduser(config.get('Data', 'working_dir'))
@@ -572,10 +607,6 @@ class MeteorAligner(AbstractProcessor):
         tgt_path = working_dir + '/' + 'tgt.txt'
         ref_path = working_dir + '/' + 'ref.txt'
 
-        if os.path.exists(working_dir + '/' + 'meteor-align.out'):
-            print("Meteor alignments already exist!")
-            return
-
         meteor = os.path.expanduser(config.get('Paths', 'meteor'))
         lang = loads(config.get('Settings', 'language_pairs'))[0].split('-')[1]
 
@@ -588,6 +619,19 @@ class MeteorAligner(AbstractProcessor):
             subprocess.call(['java', '-Xmx2G', '-jar', meteor, tgt_path, ref_path, '-l', lang,
                          '-norm', '-writeAlignments', '-f', working_dir + '/' + 'meteor'])
 
+    def cache_inputs(self, config):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [working_dir + '/' + 'tgt.txt', working_dir + '/' + 'ref.txt',
+                working_dir + '/' + 'tgt.txt.token', working_dir + '/' + 'ref.txt.token']
+
+    def cache_outputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'working_dir')) + '/' + 'meteor-align.out']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Paths', 'meteor'))]
+
+    def cache_settings(self, config):
+        return [config.get('Settings', 'language_pairs')]
 
     def get(self, config, from_file=False):
 
@@ -599,6 +643,31 @@ class MeteorAligner(AbstractProcessor):
         AbstractProcessor.set_result_ref(self, result)
 
 
+# Configuration files and lexical resources read by the Cobalt aligners and the context info compiler,
+# declared by their processors so that cached alignments are not reused after a change
+
+COBALT_CONFIGS = ['config/aligner/english.cfg', 'config/equivalent_dependencies.cfg']
+
+COBALT_LEXICAL_RESOURCES = ['lex_resources/synonyms/english.synsets', 'lex_resources/contractions/english.contractions',
+                            'lex_resources/extended_stopwords/english.words']
+
+
+def cobalt_resources():
+
+    # Lexical resources of the aligner, PPDB and the word vectors only if they are selected in the aligner config
+
+    align_cfg = AlignerConfig('english')
+    resources = list(COBALT_LEXICAL_RESOURCES)
+
+    if 'paraphrases' in align_cfg.selected_lexical_resources:
+        resources.append(align_cfg.path_to_ppdb)
+
+    if 'distributional' in align_cfg.selected_lexical_resources:
+        resources.append(align_cfg.path_to_vectors)
+
+    return [os.path.expanduser(path) for path in resources]
+
+
 class CobaltAlignerStanford(AbstractProcessor):
 
     def __init__(self):
@@ -611,13 +680,10 @@ class CobaltAlignerStanford(AbstractProcessor):
         tgt_path = working_dir + '/' + 'tgt.parse'
         ref_path = working_dir + '/' + 'ref.parse'
 
-        if os.path.exists(working_dir + '/' + tgt_path.split('/')[-1] + '.' + ref_path.split('/')[-1] + '.cobalt-align-stanford.out'):
-            print("Alignments already exist.\n Aligner will not run.")
-            return
-
         targets = StanfordParseLoader.parsed_sentences(tgt_path)
         references = StanfordParseLoader.parsed_sentences(ref_path)
 
+        from alignment.aligner_stanford import AlignerStanford
         aligner = AlignerStanford('english')
         alignments = []
 
@@ -627,16 +693,48 @@ class CobaltAlignerStanford(AbstractProcessor):
         output = codecs.open(os.path.expanduser(working_dir + '/' + tgt_path.split('/')[-1] + '.' + ref_path.split('/')[-1] + '.cobalt-align-stanford.out'), 'w', 'utf-8')
 
         for i, alignment in enumerate(alignments):
-            print('Sentence #' + str(i + 1), file=output)
-
-            for a in sorted(alignment[0], key=lambda x: x[0]):
-                output.write('[' + str(targets[i][a[0] - 1].index) + ', ' + str(references[i][a[1] - 1].index) + ']' + ' : ' +
-                             '[' + targets[i][a[0] - 1].form + ', ' + references[i][a[1] - 1].form + ']' + ' : ' +
-                             alignment[1][(a[0], a[1])] + '\n')
+            CobaltAlignerStanford.write_alignment(output, i, targets[i], references[i], alignment)
 
-            output.write('\n')
         output.close()
 
+    @staticmethod
+    def write_alignment(output, i, target, reference, alignment):
+        print('Sentence #' + str(i + 1), file=output)
+
+        for a in sorted(alignment[0], key=lambda x: x[0]):
+            output.write('[' + str(target[a[0] - 1].index) + ', ' + str(reference[a[1] - 1].index) + ']' + ' : ' +
+                         '[' + target[a[0] - 1].form + ', ' + reference[a[1] - 1].form + ']' + ' : ' +
+                         alignment[1][(a[0], a[1])] + '\n')
+
+        output.write('\n')
+
+    @staticmethod
+    def read_alignment(target, reference, alignment):
+
+        # The alignment of a sentence as CobaltAlignReaderStanford reads it from the output file
+
+        indexes = set()
+        words = []
+        similarity_types = []
+
+        for a in sorted(alignment[0], key=lambda x: x[0]):
+            indexes.add((target[a[0] - 1].index, reference[a[1] - 1].index))
+            words.append([target[a[0] - 1].form, reference[a[1] - 1].form])
+            similarity_types.append(alignment[1][(a[0], a[1])])
+
+        return [indexes, words, similarity_types, [{} for _ in words]]
+
+    def cache_inputs(self, config):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [working_dir + '/' + 'tgt.parse', working_dir + '/' + 'ref.parse'] + COBALT_CONFIGS
+
+    def cache_resources(self, config):
+        return cobalt_resources()
+
+    def cache_outputs(self, config):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [working_dir + '/' + 'tgt.parse.ref.parse.cobalt-align-stanford.out']
+
     def get(self, config, from_file=False):
         working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
         tgt_path = working_dir + '/' + 'tgt.parse'
@@ -659,16 +757,13 @@ class CobaltAlignerContextInfoCompiler(AbstractProcessor):
         tgt_path = working_dir + '/' + 'tgt.parse'
         ref_path = working_dir + '/' + 'ref.parse'
 
-        if os.path.exists(working_dir + '/' + tgt_path.split('/')[-1] + '.' + ref_path.split('/')[-1] + '.cobalt-align-stanford-context-diff.out'):
-            print("Context difference already compiled.\n Context difference compiler will not run.")
-            return
-
         reader = CobaltAlignReaderStanford()
 
         alignment_result = reader.read(working_dir + '/' + tgt_path.split('/')[-1] + '.' + ref_path.split('/')[-1] + '.cobalt-align-stanford.out')
         targets = StanfordParseLoader.parsed_sentences(tgt_path)
         references = StanfordParseLoader.parsed_sentences(ref_path)
 
+        from alignment.context_info_compiler import ContextInfoCompiler
         compiler = ContextInfoCompiler('english')
         info = []
 
@@ -678,20 +773,37 @@ class CobaltAlignerContextInfoCompiler(AbstractProcessor):
         output = codecs.open(os.path.expanduser(working_dir + '/' + tgt_path.split('/')[-1] + '.' + ref_path.split('/')[-1] + '.cobalt-align-stanford-context-diff.out'), 'w', 'utf-8')
 
         for i, context_info in enumerate(info):
-            print('Sentence #' + str(i + 1), file=output)
-
-            for j, a in enumerate(alignment_result[i][0]):
-                output.write('[' + str(targets[i][a[0] - 1].index) + ', ' + str(references[i][a[1] - 1].index) + ']' + ' : ')
-                output.write('[' + targets[i][a[0] - 1].form + ', ' + references[i][a[1] - 1].form + ']' + ' : ')
-                output.write(alignment_result[i][2][j] + ' : ')
-                output.write('srcDiff=' + ','.join(context_info[j]['srcDiff']) + ';')
-                output.write('srcCon=' + ','.join(context_info[j]['srcCon']) + ';')
-                output.write('tgtDiff=' + ','.join(context_info[j]['tgtDiff']) + ';')
-                output.write('tgtCon=' + ','.join(context_info[j]['tgtCon']) + '\n')
-
-            output.write('\n')
+            CobaltAlignerContextInfoCompiler.write_context_info(output, i, targets[i], references[i], alignment_result[i], context_info)
+
         output.close()
 
+    @staticmethod
+    def write_context_info(output, i, target, reference, alignment, context_info):
+        print('Sentence #' + str(i + 1), file=output)
+
+        for j, a in enumerate(alignment[0]):
+            output.write('[' + str(target[a[0] - 1].index) + ', ' + str(reference[a[1] - 1].index) + ']' + ' : ')
+            output.write('[' + target[a[0] - 1].form + ', ' + reference[a[1] - 1].form + ']' + ' : ')
+            output.write(alignment[2][j] + ' : ')
+            output.write('srcDiff=' + ','.join(context_info[j]['srcDiff']) + ';')
+            output.write('srcCon=' + ','.join(context_info[j]['srcCon']) + ';')
+            output.write('tgtDiff=' + ','.join(context_info[j]['tgtDiff']) + ';')
+            output.write('tgtCon=' + ','.join(context_info[j]['tgtCon']) + '\n')
+
+        output.write('\n')
+
+    def cache_inputs(self, config):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [working_dir + '/' + 'tgt.parse', working_dir + '/' + 'ref.parse',
+                working_dir + '/' + 'tgt.parse.ref.parse.cobalt-align-stanford.out'] + COBALT_CONFIGS
+
+    def cache_resources(self, config):
+        return cobalt_resources()
+
+    def cache_outputs(self, config):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [working_dir + '/' + 'tgt.parse.ref.parse.cobalt-align-stanford-context-diff.out']
+
     def get(self, config, from_file=False):
         working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
         tgt_path = working_dir + '/' + 'tgt.parse'
@@ -702,6 +814,63 @@ class CobaltAlignerContextInfoCompiler(AbstractProcessor):
         AbstractProcessor.set_result_ref(self, result)
 
 
+class CobaltAlignerStanfordContextInfo(AbstractProcessor):
+
+    """ CobaltAlignerStanford and CobaltAlignerContextInfoCompiler in one pass: the context information
+    of each sentence is compiled right after aligning it, with the parsed sentences and the lexical
+    resources loaded once, and both output files are written as the sentences are processed """
+
+    def __init__(self):
+        AbstractProcessor.__init__(self)
+        AbstractProcessor.set_name(self, 'cobalt_aligner_stanford_context_info')
+        AbstractProcessor.set_output(self, True)
+
+    def run(self, config, from_file=False):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        tgt_path = working_dir + '/' + 'tgt.parse'
+        ref_path = working_dir + '/' + 'ref.parse'
+
+        targets = StanfordParseLoader.parsed_sentences(tgt_path)
+        references = StanfordParseLoader.parsed_sentences(ref_path)
+
+        from alignment.context_info_compiler import ContextInfoCompiler
+
+        # The compiler is an AlignerStanford, so the same object aligns and compiles the context information
+        compiler = ContextInfoCompiler('english')
+
+        output_alignments = codecs.open(self.cache_outputs(config)[0], 'w', 'utf-8')
+        output_context = codecs.open(self.cache_outputs(config)[1], 'w', 'utf-8')
+
+        for i, sentence in enumerate(targets):
+            alignment = compiler.align(sentence, references[i])
+            CobaltAlignerStanford.write_alignment(output_alignments, i, sentence, references[i], alignment)
+
+            alignment_result = CobaltAlignerStanford.read_alignment(sentence, references[i], alignment)
+            context_info = compiler.compile_context_info(sentence, references[i], alignment_result[0])
+            CobaltAlignerContextInfoCompiler.write_context_info(output_context, i, sentence, references[i], alignment_result, context_info)
+
+        output_alignments.close()
+        output_context.close()
+
+    def cache_inputs(self, config):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [working_dir + '/' + 'tgt.parse', working_dir + '/' + 'ref.parse'] + COBALT_CONFIGS
+
+    def cache_resources(self, config):
+        return cobalt_resources()
+
+    def cache_outputs(self, config):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [working_dir + '/' + 'tgt.parse.ref.parse.cobalt-align-stanford.out',
+                working_dir + '/' + 'tgt.parse.ref.parse.cobalt-align-stanford-context-diff.out']
+
+    def get(self, config, from_file=False):
+        reader = CobaltAlignReaderStanford()
+        result = reader.read(self.cache_outputs(config)[1])
+        AbstractProcessor.set_result_tgt(self, result)
+        AbstractProcessor.set_result_ref(self, result)
+
+
 class CobaltAligner(AbstractProcessor):
 
     def __init__(self):
@@ -723,15 +892,22 @@ class CobaltAligner(AbstractProcessor):
         if 'distributional' in align_cfg.selected_lexical_resources:
             load_word_vectors(align_cfg.path_to_vectors)
 
-
-        if os.path.exists(working_dir + '/' + tgt_path.split('/')[-1] + '.' + ref_path.split('/')[-1] + '.cobalt-align.out'):
-            print("Alignments already exist.\n Aligner will not run.")
-            return
-
+        from alignment.aligner import Aligner
         aligner = Aligner('english')
         aligner.align_documents(tgt_path, ref_path)
         aligner.write_alignments(working_dir + '/' + tgt_path.split('/')[-1] + '.' + ref_path.split('/')[-1] + '.cobalt-align.out')
 
+    def cache_inputs(self, config):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [working_dir + '/' + 'tgt.parse', working_dir + '/' + 'ref.parse'] + COBALT_CONFIGS
+
+    def cache_resources(self, config):
+        return cobalt_resources()
+
+    def cache_outputs(self, config):
+        working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+        return [working_dir + '/' + 'tgt.parse.ref.parse.cobalt-align.out']
+
     def get(self, config, from_file=False):
         working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
         tgt_path = working_dir + '/' + 'tgt.parse'
@@ -767,6 +943,11 @@ class LowerCaser(AbstractProcessor):
 
             file_output.close()
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'src')) + '.token',
+                os.path.expanduser(config.get('Data', 'tgt')) + '.token',
+                os.path.expanduser(config.get('Data', 'ref')) + '.token']
+
     def get(self, config, from_file=False):
         pass
 
@@ -845,10 +1026,6 @@ class Tokenizer(AbstractProcessor):
         out_ref = os.path.expanduser(config.get('Data', 'ref') + '.' + 'token')
         out_src = os.path.expanduser(config.get('Data', 'src') + '.' + 'token')
 
-        if os.path.exists(out_tgt):
-            print("The file " + out_tgt + " is already tokenized.\n Tokenizer will not run.")
-            return
-
         o_ref = codecs.open(out_ref, 'w', 'utf-8')
         o_tgt = codecs.open(out_tgt, 'w', 'utf-8')
         o_src = codecs.open(out_src, 'w', 'utf-8')
@@ -907,10 +1084,6 @@ class Tokenizer(AbstractProcessor):
         path_output_tgt = os.path.expanduser(config.get('Data', 'tgt')) + '.token'
         path_output_ref = os.path.expanduser(config.get('Data', 'ref')) + '.token'
 
-        if os.path.exists(path_output_tgt) and os.path.exists(path_output_ref):
-            print("The file " + path_output_tgt + "already exists\nTokenizer will not run.")
-            return
-
         f_output_tgt = open(os.path.expanduser(config.get('Data', 'tgt')) + '.token', 'w')
         f_output_ref = open(os.path.expanduser(config.get('Data', 'ref')) + '.token', 'w')
 
@@ -945,6 +1118,39 @@ class Tokenizer(AbstractProcessor):
 
         print("Tokenization finished!")
 
+    def cache_inputs(self, config):
+
+        method = config.get('Tokenizer', 'method')
+        tgt_path = os.path.expanduser(config.get('Data', 'tgt'))
+        ref_path = os.path.expanduser(config.get('Data', 'ref'))
+
+        if method == 'parse' or (method == 'aligner' and config.get('Alignment', 'aligner') == 'cobalt'):
+            return [tgt_path + '.parse', ref_path + '.parse']
+        if method == 'aligner':
+            return [os.path.expanduser(config.get('Alignment', 'dir')) + '/' + tgt_path.split('/')[-1] + '.meteor-align.out']
+        return [tgt_path, ref_path]
+
+    def cache_outputs(self, config):
+
+        method = config.get('Tokenizer', 'method')
+        outputs = [os.path.expanduser(config.get('Data', 'tgt')) + '.token', os.path.expanduser(config.get('Data', 'ref')) + '.token']
+
+        if method in ['aligner', 'parse', 'quest']:
+            return outputs + [os.path.expanduser(config.get('Data', 'src')) + '.token']
+        if method == 'tokenized':
+            return outputs
+        return []
+
+    def cache_resources(self, config):
+        if config.get('Tokenizer', 'method') == 'quest':
+            return [os.path.expanduser(config.get('Tokenizer', 'path'))]
+        return []
+
+    def cache_settings(self, config):
+        if config.get('Tokenizer', 'method') == 'quest':
+            return ['quest', config.get('Settings', 'tgt_lang')]
+        return [config.get('Tokenizer', 'method')]
+
     @staticmethod
     def rewrite(fname):
         myinput = open(fname, 'r')
@@ -961,12 +1167,18 @@ class Tokenizer(AbstractProcessor):
 
         lines_ref = codecs.open(os.path.expanduser(config.get('Data', 'ref') + '.' + 'token'), 'r', 'utf-8').readlines()
         lines_tgt = codecs.open(os.path.expanduser(config.get('Data', 'tgt') + '.' + 'token'), 'r', 'utf-8').readlines()
-        for i, line in enumerate(lines_tgt):
+
+        ref_index = AbstractProcessor.reference_index(config)
+        lines_ref = lines_ref[:len(lines_tgt)]
+
+        for line in lines_tgt:
             sents_tokens_tgt.append(line.strip().split(' '))
-            sents_tokens_ref.append(lines_ref[i].strip().split(' '))
+
+        for line in AbstractProcessor.unique_references(lines_ref, ref_index):
+            sents_tokens_ref.append(line.strip().split(' '))
 
         AbstractProcessor.set_result_tgt(self, sents_tokens_tgt)
-        AbstractProcessor.set_result_ref(self, sents_tokens_ref)
+        AbstractProcessor.set_result_ref(self, AbstractProcessor.share_references(sents_tokens_ref, ref_index))
 
 
 class QuestWord(AbstractProcessor):
@@ -1008,6 +1220,21 @@ class QuestWord(AbstractProcessor):
         ])
         shutil.rmtree(os.getcwd() + '/' + 'input')
 
+    def cache_inputs(self, config):
+        tgt_lang = config.get('Settings', 'tgt_lang')
+        return [os.path.expanduser(config.get('Data', 'src')) + '.' + 'token',
+                os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token',
+                os.path.expanduser(config.get('Quest', 'config')) + '/' + 'config.' + 'wl.' + tgt_lang + '.properties']
+
+    def cache_outputs(self, config):
+        return [os.path.expanduser(config.get('Quest', 'output')) + '/' + 'quest.wl' + '.out']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Quest', 'path')) + '/' + 'dist/QuEstWordLevel.jar']
+
+    def cache_settings(self, config):
+        return [config.get('Settings', 'src_lang'), config.get('Settings', 'tgt_lang')]
+
     def get(self, config, map_backoff=False, from_file=False):
 
         # Word-level quest features
@@ -1023,39 +1250,39 @@ class QuestWord(AbstractProcessor):
         features = reader.read_features(features_file)
 
         lengths = self.sent_length(input_token)
-        words = open(output_quest, 'r').readlines()
-        result = []
+        values = self.read_word_features(output_quest, features)
 
-        cnt_words = 0
-        cnt_sentences = 0
-        sent_words = []
+        if map_backoff is True:
+            for feature in ['WCE1015', 'WCE1041']:
+                if feature in values:
+                    values[feature] = self.map_backoff_array(values[feature])
 
-        for word in words:
+        # Sentence boundaries are computed once as cumulative offsets,
+        # each sentence gets views on the per-feature arrays
+        offsets = np.cumsum(lengths)[:-1]
+        sentences = {f: np.split(vals, offsets) for f, vals in values.items()}
 
-            word_feats = {}
-            for i, val in enumerate(word.strip().split('\t')):
-
-                val = int(val.split('=')[1])
-                transform = val
+        result = []
+        for i in range(len(lengths)):
+            result.append({f: sentences[f][i] for f in features})
 
-                if map_backoff is True:
-                    if features[i] == 'WCE1015' or features[i] == 'WCE1041':
-                        transform = self.map_backoff(val)
+        AbstractProcessor.set_result_tgt(self, result)
+        AbstractProcessor.set_result_ref(self, result)
 
-                word_feats[features[i]] = transform
+    @staticmethod
+    def read_word_features(file_, features):
 
-            if cnt_words >= np.sum(lengths[:cnt_sentences + 1]):
-                result.append(sent_words)
-                sent_words = []
-                cnt_sentences += 1
+        # Streams quest output (one word per line, feature=value columns)
+        # into one integer array per feature
 
-            cnt_words +=1
-            sent_words.append(word_feats)
+        columns = [[] for _ in features]
 
-        result.append(sent_words)
+        with open(file_, 'r') as f:
+            for line in f:
+                for i, val in enumerate(line.strip().split('\t')):
+                    columns[i].append(int(val.split('=')[1]))
 
-        AbstractProcessor.set_result_tgt(self, result)
-        AbstractProcessor.set_result_ref(self, result)
+        return {f: np.array(columns[i], dtype=np.int32) for i, f in enumerate(features)}
 
     @staticmethod
     def map_backoff(val):
@@ -1069,13 +1296,18 @@ class QuestWord(AbstractProcessor):
         else:
             return 1
 
+    @staticmethod
+    def map_backoff_array(vals):
+
+        return np.select([vals == 7, (vals > 4) & (vals < 7), (vals > 1) & (vals <= 4)], [4, 3, 2], default=1).astype(vals.dtype)
+
     @staticmethod
     def sent_length(file_):
 
         lengths = []
-        sents = open(file_, 'r').readlines()
-        for sent in sents:
-            lengths.append(len(sent.split(' ')))
+        with open(file_, 'r') as f:
+            for sent in f:
+                lengths.append(len(sent.split(' ')))
 
         return lengths
 
@@ -1147,6 +1379,21 @@ class QuestSentence(AbstractProcessor):
 
         shutil.rmtree(os.getcwd() + '/' + 'input')
 
+    def cache_inputs(self, config):
+        tgt_lang = config.get('Settings', 'tgt_lang')
+        return [os.path.expanduser(config.get('Data', 'src')), os.path.expanduser(config.get('Data', 'tgt')),
+                os.path.expanduser(config.get('Quest', 'config')) + '/' + 'config.' + 'sl.' + tgt_lang + '.properties']
+
+    def cache_outputs(self, config):
+        return [os.path.expanduser(config.get('Quest', 'output')) + '/' + 'quest.sl' + '.out']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Quest', 'path')) + '/' + 'dist/QuEstSentenceLevel.jar']
+
+    def cache_settings(self, config):
+        return [config.get('Settings', 'src_lang'), config.get('Settings', 'tgt_lang'),
+                'LowerCaser' in loads(config.get("Resources", "processors"))]
+
     def get(self, config, from_file=False):
 
         # Make sure feature file is the same as stated in quest config file
@@ -1186,15 +1433,23 @@ class LanguageModelWordFeatures(AbstractProcessor):
         ngram_size = config.get('Language Model', 'ngram_size')
         srilm = os.path.expanduser(config.get('Language Model', 'srilm'))
 
-        if os.path.exists(output_path):
-            print('File with lm perplexities already exist')
-            return
-
         my_output = open(output_path, 'w')
 
         SRILM = [srilm + '/' + 'ngram', '-lm', lm, '-order', ngram_size, '-debug', str(2), '-ppl', tgt_path]
         subprocess.check_call(SRILM, stdout=my_output)
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token']
+
+    def cache_outputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token' + '.' + 'ppl2']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Language Model', 'path'))]
+
+    def cache_settings(self, config):
+        return [config.get('Language Model', 'ngram_size')]
+
     def get(self, config, from_file=False):
 
         ppl_file = open(os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token' + '.' + 'ppl2', 'r')
@@ -1245,15 +1500,23 @@ class LanguageModelSentenceFeatures(AbstractProcessor):
         ngram_size = config.get('Language Model', 'ngram_size')
         srilm = os.path.expanduser(config.get('Language Model', 'srilm'))
 
-        if os.path.exists(output_path):
-            print('File with lm perplexities already exist')
-            return
-
         my_output = open(output_path, 'w')
 
         SRILM = [srilm + '/' + 'ngram', '-lm', lm, '-order', ngram_size, '-debug', str(1), '-ppl', tgt_path]
         subprocess.check_call(SRILM, stdout=my_output)
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token']
+
+    def cache_outputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token' + '.' + 'ppl']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Language Model', 'path'))]
+
+    def cache_settings(self, config):
+        return [config.get('Language Model', 'ngram_size')]
+
     def get(self, config, from_file=False):
 
         ppl_file = open(os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'token' + '.' + 'ppl', 'r')
@@ -1292,15 +1555,23 @@ class POSLanguageModelWordFeatures(AbstractProcessor):
         ngram_size = config.get('Language Model', 'pos_ngram_size')
         srilm = os.path.expanduser(config.get('Language Model', 'srilm'))
 
-        if os.path.exists(output_path):
-            print('File with lm perplexities already exist')
-            return
-
         my_output = open(output_path, 'w')
 
         SRILM = [srilm + '/' + 'ngram', '-lm', lm, '-order', ngram_size, '-debug', str(2), '-ppl', tgt_path]
         subprocess.check_call(SRILM, stdout=my_output)
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'pos']
+
+    def cache_outputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'pos' + '.' + 'ppl2']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Language Model', 'pos_path'))]
+
+    def cache_settings(self, config):
+        return [config.get('Language Model', 'pos_ngram_size')]
+
     def get(self, config, from_file=False):
 
         ppl_file = open(os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'pos' + '.' + 'ppl2', 'r')
@@ -1350,15 +1621,23 @@ class POSLanguageModelSentenceFeatures(AbstractProcessor):
         ngram_size = config.get('Language Model', 'pos_ngram_size')
         srilm = os.path.expanduser(config.get('Language Model', 'srilm'))
 
-        if os.path.exists(output_path):
-            print('File with lm perplexities already exist')
-            return
-
         my_output = open(output_path, 'w')
 
         SRILM = [srilm + '/' + 'ngram', '-lm', lm, '-order', ngram_size, '-debug', str(1), '-ppl', tgt_path]
         subprocess.check_call(SRILM, stdout=my_output)
 
+    def cache_inputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'pos']
+
+    def cache_outputs(self, config):
+        return [os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'pos' + '.' + 'ppl']
+
+    def cache_resources(self, config):
+        return [os.path.expanduser(config.get('Language Model', 'pos_path'))]
+
+    def cache_settings(self, config):
+        return [config.get('Language Model', 'pos_ngram_size')]
+
     def get(self, config, from_file=False):
 
         ppl_file = open(os.path.expanduser(config.get('Data', 'tgt')) + '.' + 'pos' + '.' + 'ppl', 'r')
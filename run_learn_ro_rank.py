@@ -38,8 +38,8 @@ human_rankings.add_human_data(f_judgements, config)
 
 feature_values = read_features_file(os.path.expanduser(config.get('WMT', 'output_dir')) + '/' + 'x_' + dataset_for_all + '.' + feature_set_name + '.' + 'all' + '.tsv', "\t")
 
-ranking_task.training_set_for_learn_to_rank(data_structure2, human_rankings, feature_values)
-ranking_task.train_save(config_learning, config)
+x_train, y_train = ranking_task.training_set_for_learn_to_rank(data_structure2, human_rankings, feature_values)
+ranking_task.train_save(config_learning, config, x_train=x_train, y_train=y_train)
 
 # Run the trained model on a the test feature file and produce the output in WMT format
 
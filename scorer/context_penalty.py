@@ -0,0 +1,203 @@
+""" Context penalties of the aligned words computed with arrays.
+    Dependency labels are interned once into integer codes with a weight class (arguments, modifiers,
+    function) and a noise flag per code, the context information of the aligned words of a sentence
+    (alignments[2]) is encoded into per-word label counts by weight class, and the test, ref and mean
+    penalties of Scorer.get_penalties are computed for all the words at once """
+
+import numpy as np
+
+from utils import word_sim
+
+
+CONTEXT_KEYS = ['srcDiff', 'srcCon', 'tgtDiff', 'tgtCon']
+
+WEIGHT_CLASSES = ['arguments', 'modifiers', 'function']
+
+
+class ContextArrays(object):
+
+    def __init__(self, raw, clean, by_class, weights):
+        # Per aligned word and context key: number of labels, of non noisy labels, of labels of each
+        # weight class (n x 3) and sum of label weights
+        self.raw = raw
+        self.clean = clean
+        self.by_class = by_class
+        self.weighted = dict((key, by_class[key].dot(weights)) for key in by_class)
+        self.masks = {}
+
+    def __len__(self):
+        return len(self.raw['srcDiff'])
+
+
+class ContextPenaltyEngine(object):
+
+    def __init__(self, scorer):
+        self.scorer = scorer
+        self.codes = {}
+        self.classes = []
+        self.noisy = []
+        self.class_array = np.zeros(0, dtype=np.int64)
+        self.noisy_array = np.zeros(0, dtype=bool)
+
+    def code(self, label):
+
+        code = self.codes.get(label)
+
+        if code is None:
+            code = len(self.classes)
+            self.codes[label] = code
+            self.classes.append(dependency_class(self.scorer, label))
+            self.noisy.append(label.split('_')[0] in self.scorer.noisy_types)
+
+        return code
+
+    def class_weights(self):
+        return np.array([getattr(self.scorer, name) for name in WEIGHT_CLASSES], dtype=np.float64)
+
+    def encode(self, context_info):
+
+        # Arrays of the context information of the aligned words of one sentence
+
+        n = len(context_info)
+        raw = {}
+        clean = {}
+        by_class = {}
+
+        for key in CONTEXT_KEYS:
+            lengths = np.array([len(c[key]) for c in context_info], dtype=np.int64)
+            codes = np.array([self.code(label) for c in context_info for label in c[key]], dtype=np.int64)
+
+            if len(self.classes) != len(self.class_array):
+                self.class_array = np.array(self.classes, dtype=np.int64)
+                self.noisy_array = np.array(self.noisy, dtype=bool)
+
+            words = np.repeat(np.arange(n), lengths)
+            raw[key] = lengths
+            clean[key] = np.bincount(words, weights=~self.noisy_array[codes], minlength=n)
+            by_class[key] = np.bincount(words * len(WEIGHT_CLASSES) + self.class_array[codes],
+                                        minlength=n * len(WEIGHT_CLASSES)).reshape(n, len(WEIGHT_CLASSES))
+
+        return ContextArrays(raw, clean, by_class, self.class_weights())
+
+    def penalties(self, arrays):
+
+        # Normalized test, ref and mean penalties of each aligned word (Scorer.get_penalties)
+
+        return penalties(arrays.weighted['srcDiff'], arrays.weighted['srcCon'],
+                         arrays.weighted['tgtDiff'], arrays.weighted['tgtCon'], self.scorer.beta)
+
+
+def dependency_class(scorer, label):
+
+    # Index in WEIGHT_CLASSES of the weight of a dependency label (Scorer.get_dependency_weight)
+
+    if label.split('_')[0] in scorer.argument_types:
+        return 0
+    elif label.split('_')[0] in scorer.modifier_types:
+        return 1
+    else:
+        return 2
+
+
+def penalties(source_diff, source_length, target_diff, target_length, beta):
+
+    pen_test = ratio(source_diff, source_length)
+    pen_ref = ratio(target_diff, target_length)
+
+    beta2 = beta ** 2
+    both = (pen_test != 0) & (pen_ref != 0)
+    mean = np.maximum(pen_test, pen_ref)
+    mean[both] = (1 + beta2) * (pen_test[both] * pen_ref[both] / (pen_test[both] * beta2 + pen_ref[both]))
+    mean[(source_length <= 0) | (target_length <= 0)] = 0.0
+
+    test = np.where(source_length > 0, pen_test * np.log(source_length + 1.0), 0.0)
+    ref = np.where(target_length > 0, pen_ref * np.log(target_length + 1.0), 0.0)
+    mean = mean * np.log(np.maximum(target_length, 0.0) + 1.0)
+
+    return normalize(test), normalize(ref), normalize(mean)
+
+
+def ratio(numerator, denominator):
+    result = np.zeros(len(numerator))
+    positive = denominator > 0
+    result[positive] = numerator[positive] / denominator[positive]
+    return result
+
+
+def normalize(penalties):
+    return 2 * (1.0 / (1.0 + np.exp(-penalties))) - 1
+
+
+def cumulative_penalties(difference, context, mask=None):
+
+    # Penalties of the context penalty features: the counts of non noisy labels are accumulated over
+    # the (selected) aligned words, the penalty of a word is computed from the running counts,
+    # and only the words with a penalty > 0 are returned
+
+    if mask is not None:
+        difference = difference[mask]
+        context = context[mask]
+
+    difference = np.cumsum(difference)
+    context = np.cumsum(context)
+
+    penalties = ratio(difference, context) * np.log(context + 1.0)
+
+    return penalties[penalties > 0]
+
+
+def word_masks(arrays, cand, ref):
+
+    # Aligned words with an exact match (and compatible pos) and with a non exact match (and different pos)
+
+    if 'exact' not in arrays.masks:
+        exact = []
+        non_exact = []
+
+        for index in cand['alignments'][0]:
+            word_candidate = cand['parse'][index[0] - 1]
+            word_reference = ref['parse'][index[1] - 1]
+            relatedness = word_sim.word_relatedness_feature(word_candidate, word_reference)
+            pos = word_sim.comparePos(word_candidate.pos, word_reference.pos)
+
+            exact.append(relatedness == 'Exact' and not pos == 'None')
+            non_exact.append(not relatedness == 'Exact' and not pos == 'Exact')
+
+        arrays.masks['exact'] = np.array(exact, dtype=bool)
+        arrays.masks['non_exact'] = np.array(non_exact, dtype=bool)
+
+    return arrays.masks['exact'], arrays.masks['non_exact']
+
+
+# Engines by scorer configuration
+__engines__ = dict()
+
+
+def get_engine(scorer=None):
+
+    # Engine of the given scorer, or of the default scorer configuration if None
+
+    if scorer is None:
+        if None not in __engines__:
+            from scorer.scorer import Scorer
+            __engines__[None] = ContextPenaltyEngine(Scorer())
+        return __engines__[None]
+
+    key = (tuple(scorer.argument_types), tuple(scorer.modifier_types), tuple(scorer.noisy_types))
+
+    if key not in __engines__:
+        __engines__[key] = ContextPenaltyEngine(scorer)
+
+    engine = __engines__[key]
+    engine.scorer = scorer
+    return engine
+
+
+def sentence_arrays(sentence):
+
+    # Context arrays of a candidate sentence, encoded once and shared by all the penalty features
+
+    if 'context_penalties' not in sentence:
+        sentence['context_penalties'] = get_engine().encode(sentence['alignments'][2])
+
+    return sentence['context_penalties']
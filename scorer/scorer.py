@@ -4,6 +4,21 @@ from configparser import ConfigParser
 from json import *
 from utils.core_nlp_utils import *
 from utils import word_sim
+from scorer import context_penalty
+
+
+# Parsed scorer configurations, the same file is read once per process
+__configs__ = dict()
+
+
+def read_config(path='config/scorer/scorer.cfg'):
+
+    if path not in __configs__:
+        config = ConfigParser()
+        config.readfp(open(path))
+        __configs__[path] = config
+
+    return __configs__[path]
 
 
 class WordInformation(object):
@@ -42,8 +57,7 @@ class Scorer(object):
     function_types = []
 
     def __init__(self):
-        config = ConfigParser()
-        config.readfp(open('config/scorer/scorer.cfg'))
+        config = read_config()
 
         self.alpha = config.getfloat('Scorer', 'alpha')
         self.beta = config.getfloat('Scorer', 'beta')
@@ -126,12 +140,15 @@ class Scorer(object):
 
         word_scores = []
 
+        engine = context_penalty.get_engine(self)
+        penalties_test, penalties_ref, penalties_mean = engine.penalties(engine.encode(alignments[2]))
+
         for i, a in enumerate(alignments[0]):
             word_info = WordInformation()
             word_info.similarity = word_sim.word_relatedness_scoring(sentence1[a[0] - 1], sentence2[a[1] - 1], self)
-            word_info.penalty_test = self.get_penalties(alignments[2][i], 'test')
-            word_info.penalty_ref = self.get_penalties(alignments[2][i], 'ref')
-            word_info.penalty_mean = self.get_penalties(alignments[2][i], 'mean')
+            word_info.penalty_test = float(penalties_test[i])
+            word_info.penalty_ref = float(penalties_ref[i])
+            word_info.penalty_mean = float(penalties_mean[i])
 
             word_scores.append(word_info)
 
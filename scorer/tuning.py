@@ -0,0 +1,328 @@
+""" Fast re-scoring of a corpus with the Cobalt scorer, for tuning the weights of config/scorer/scorer.cfg.
+    The statistics of the aligned words that do not depend on the weights (match type, function word flags,
+    context label counts by weight class) and the weighted lengths of the sentences are computed once and
+    stored as arrays, then the sentence scores of Scorer.sentence_score_cobalt are computed for a whole corpus
+    and a new set of parameters with a few array operations. Parameters are selected by grid or random search
+    on the Kendall's tau of the scores with the human pairwise judgments.
+
+    The search space is read from the [Scorer Tuning] section of the configuration, one JSON list of values per
+    tuned parameter (e.g. delta : [0.5, 0.6, 0.7, 0.8]), with the options search (grid or random), n_iter,
+    random_state, variant (wmt12, wmt13, wmt14 or xties, see utils.wmt_kendall_variants, only xties scores the
+    comparisons that humans judged as ties) and output (path of the scorer configuration written with the best
+    parameters).
+
+    The statistics are stored with the artifact cache key of what they are computed from (see statistics_key)
+    and computed again when the key changes, they are not reused if the cache is disabled ([Cache] enabled) """
+
+import itertools
+import os
+import numpy as np
+
+from configparser import ConfigParser
+from json import loads
+
+from scorer import context_penalty
+from scorer.scorer import Scorer, read_config
+from utils import word_sim
+from utils.artifact_cache import ArtifactCache
+from utils.wmt_kendall_variants import variants_definitions
+
+
+MATCH_TYPES = ['exact', 'stem', 'synonym', 'paraphrase', 'related']
+
+# Scorer parameters and their section in scorer.cfg
+PARAMETERS = [('alpha', 'Scorer'), ('beta', 'Scorer'), ('delta', 'Scorer'),
+              ('exact', 'Scorer'), ('stem', 'Scorer'), ('synonym', 'Scorer'), ('paraphrase', 'Scorer'),
+              ('related', 'Scorer'), ('minimal_aligned_relatedness', 'Scorer'),
+              ('arguments', 'Dependency Weights'), ('modifiers', 'Dependency Weights'),
+              ('function', 'Dependency Weights')]
+
+ARRAYS = ['sentence', 'match', 'function1', 'function2', 'context',
+          'length1', 'length2', 'function_length1', 'function_length2']
+
+# Version of the statistics, to be increased when from_sentences changes
+STATISTICS_VERSION = 1
+
+DEPENDENCY_TYPES = ['arguments', 'modifiers', 'function', 'noise']
+
+
+class CobaltStatistics(object):
+
+    def __init__(self, arrays, key=None):
+        # Per aligned word: sentence index, match type (index in MATCH_TYPES), function word flags
+        # of the two words, context label counts (words x CONTEXT_KEYS x WEIGHT_CLASSES).
+        # Per sentence: lengths and number of function words of the two sentences
+        self.arrays = arrays
+        self.key = key
+
+    def __len__(self):
+        return len(self.arrays['length1'])
+
+    @staticmethod
+    def from_sentences(sentences_tgt, sentences_ref, scorer=None):
+
+        engine = context_penalty.get_engine(scorer)
+        values = dict((name, []) for name in ARRAYS)
+
+        for i, (cand, ref) in enumerate(zip(sentences_tgt, sentences_ref)):
+            sentence1 = cand['parse']
+            sentence2 = ref['parse']
+            alignments = cand['alignments']
+
+            arrays = engine.encode(alignments[2])
+            values['context'].append(np.stack([arrays.by_class[key] for key in context_penalty.CONTEXT_KEYS], axis=1))
+
+            for a in alignments[0]:
+                word1 = sentence1[a[0] - 1]
+                word2 = sentence2[a[1] - 1]
+                values['sentence'].append(i)
+                values['match'].append(MATCH_TYPES.index(word_sim.word_relatedness_type(word1, word2)))
+                values['function1'].append(word_sim.function_word(word1.form))
+                values['function2'].append(word_sim.function_word(word2.form))
+
+            values['length1'].append(len(sentence1))
+            values['length2'].append(len(sentence2))
+            values['function_length1'].append(len([x for x in sentence1 if word_sim.function_word(x.form)]))
+            values['function_length2'].append(len([x for x in sentence2 if word_sim.function_word(x.form)]))
+
+        context_shape = (0, len(context_penalty.CONTEXT_KEYS), len(context_penalty.WEIGHT_CLASSES))
+
+        return CobaltStatistics({
+            'sentence': np.array(values['sentence'], dtype=np.int64),
+            'match': np.array(values['match'], dtype=np.int8),
+            'function1': np.array(values['function1'], dtype=bool),
+            'function2': np.array(values['function2'], dtype=bool),
+            'context': np.concatenate(values['context']).astype(np.int32) if len(values['context']) > 0
+            else np.zeros(context_shape, dtype=np.int32),
+            'length1': np.array(values['length1'], dtype=np.int64),
+            'length2': np.array(values['length2'], dtype=np.int64),
+            'function_length1': np.array(values['function_length1'], dtype=np.int64),
+            'function_length2': np.array(values['function_length2'], dtype=np.int64),
+        })
+
+    def save(self, path):
+        tmp = path + '.tmp.npz'
+        arrays = dict(self.arrays)
+        if self.key is not None:
+            arrays['key'] = np.array(self.key)
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path):
+        with np.load(path) as data:
+            key = str(data['key']) if 'key' in data.files else None
+            return CobaltStatistics(dict((name, data[name]) for name in ARRAYS), key)
+
+    def score(self, params):
+
+        # Cobalt scores of all the sentences for a dictionary of scorer parameters (see PARAMETERS)
+
+        a = self.arrays
+        alpha, delta = params['alpha'], params['delta']
+
+        similarity = np.array([params[name] for name in MATCH_TYPES], dtype=np.float64)[a['match']]
+
+        weights = np.array([params[name] for name in context_penalty.WEIGHT_CLASSES], dtype=np.float64)
+        weighted = a['context'].dot(weights)
+        penalty_mean = context_penalty.penalties(weighted[:, 0], weighted[:, 1], weighted[:, 2], weighted[:, 3],
+                                                 params['beta'])[2]
+
+        relatedness = np.maximum(similarity - penalty_mean, params['minimal_aligned_relatedness'])
+
+        matches1 = np.bincount(a['sentence'], weights=np.where(a['function1'], 1 - delta, delta) * relatedness,
+                               minlength=len(self))
+        matches2 = np.bincount(a['sentence'], weights=np.where(a['function2'], 1 - delta, delta) * relatedness,
+                               minlength=len(self))
+
+        length1 = delta * (a['length1'] - a['function_length1']) + (1.0 - delta) * a['function_length1']
+        length2 = delta * (a['length2'] - a['function_length2']) + (1.0 - delta) * a['function_length2']
+
+        precision = np.where(length1 == 0, matches1, matches1 / np.where(length1 == 0, 1.0, length1))
+        recall = np.where(length2 == 0, matches2, matches2 / np.where(length2 == 0, 1.0, length2))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            denominator = (1.0 - alpha) / precision + alpha / recall
+            fmean = 1.0 / denominator
+
+        fmean[(precision == 0) | (recall == 0) | (denominator == 0)] = 0.0
+
+        return fmean
+
+
+def scorer_parameters(scorer=None):
+    scorer = scorer if scorer is not None else Scorer()
+    return dict((name, float(getattr(scorer, name))) for name, section in PARAMETERS)
+
+
+def kendall_tau(scores, winners, losers, variant='wmt14', ties=None):
+
+    # Kendall's tau of the scores with the human comparisons, given as the sentence indexes
+    # of the winners and the losers (HumanRanking.winner_loser_indexes) and, for the variants
+    # that score them, of the two sentences of the human ties (HumanRanking.tie_indexes)
+
+    if variant not in variants_definitions:
+        raise ValueError("There is no definition for %s variant" % variant)
+
+    numerator = 0.0
+    denominator = 0
+
+    pairs = [('<', winners, losers)]
+    if ties is not None:
+        pairs.append(('=', ties[0], ties[1]))
+
+    for human_sign, first, second in pairs:
+        definition = variants_definitions[variant][human_sign]
+        metric = np.where(scores[first] > scores[second], 0, np.where(scores[first] == scores[second], 1, 2))
+        values = [definition[sign] for sign in ['<', '=', '>']]
+
+        counted = np.array([value != 'X' for value in values])[metric]
+        signs = np.array([value if value != 'X' else 0 for value in values], dtype=np.float64)[metric]
+
+        numerator += signs[counted].sum()
+        denominator += np.count_nonzero(counted)
+
+    if denominator == 0:
+        return 0.0
+
+    return float(numerator / denominator)
+
+
+def candidates(grid, search='grid', n_iter=10, random_state=None):
+
+    names = sorted(grid.keys())
+
+    if search == 'grid':
+        return [dict(zip(names, values)) for values in itertools.product(*[grid[name] for name in names])]
+
+    if search == 'random':
+        rng = np.random.RandomState(random_state)
+        return [dict((name, grid[name][rng.randint(len(grid[name]))]) for name in names) for _ in range(n_iter)]
+
+    raise ValueError("unknown search " + search + ", expected grid or random")
+
+
+def search_parameters(statistics, winners, losers, grid, search='grid', n_iter=10, random_state=None,
+                      variant='wmt14', base=None, ties=None):
+
+    # Returns the best parameters (base parameters updated with the best candidate), their tau
+    # and the list of (candidate, tau) of all the candidates
+
+    base = base if base is not None else scorer_parameters()
+    results = []
+    best_params = dict(base)
+    best_tau = kendall_tau(statistics.score(base), winners, losers, variant, ties)
+
+    for candidate in candidates(grid, search, n_iter, random_state):
+        params = dict(base)
+        params.update(candidate)
+        tau = kendall_tau(statistics.score(params), winners, losers, variant, ties)
+        results.append((candidate, tau))
+
+        if tau > best_tau:
+            best_params, best_tau = params, tau
+
+    return best_params, best_tau, results
+
+
+def write_config(params, path, source='config/scorer/scorer.cfg'):
+
+    # Writes a copy of the scorer configuration with the given parameters
+
+    config = ConfigParser()
+    config.read_dict(read_config(source))
+
+    for name, section in PARAMETERS:
+        if name in params:
+            config.set(section, name, str(params[name]))
+
+    with open(os.path.expanduser(path), 'w') as f:
+        config.write(f)
+
+
+def statistics_key(config, artifacts):
+
+    # Artifact cache key of the statistics of the dataset: the contents of the files read and written by the
+    # selected processors (data, parses and alignments), their resources and settings, the lexical resources
+    # used by word_sim and the dependency types of the scorer configuration. The weights are not part of the key
+
+    from processors import processors
+
+    working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+    scorer_config = read_config()
+
+    inputs = [working_dir + '/' + 'tgt.txt', working_dir + '/' + 'ref.txt'] + processors.COBALT_CONFIGS
+    resources = processors.cobalt_resources()
+    settings = [scorer_config.get('Dependency Types', name) for name in DEPENDENCY_TYPES]
+
+    for name in loads(config.get('Processors', 'processors')):
+        instance = getattr(processors, name)()
+        inputs += instance.cache_inputs(config) + instance.cache_outputs(config)
+        resources += instance.cache_resources(config)
+        settings += [name, instance.version] + list(instance.cache_settings(config))
+
+    if config.has_option('Processors', 'from_file'):
+        settings.append(config.get('Processors', 'from_file'))
+
+    return artifacts.key('CobaltStatistics', STATISTICS_VERSION, inputs, resources, settings)
+
+
+def tune_from_config(config):
+
+    # Scores the dataset of the configuration and searches the scorer parameters against its human judgments.
+    # The statistics are cached in the working directory, so that other searches do not run the processors again
+
+    from processors.process import Process
+    from utils.human_ranking import HumanRanking
+    from utils.ranking_data import RankingData
+
+    working_dir = os.path.expanduser(config.get('Data', 'working_dir'))
+    statistics_path = working_dir + '/' + 'cobalt_statistics.npz'
+    artifacts = ArtifactCache.from_config(config)
+
+    data = RankingData(config)
+    data.read_dataset()
+
+    statistics = None
+
+    if artifacts is not None and os.path.exists(statistics_path):
+        statistics = CobaltStatistics.load(statistics_path)
+        if statistics.key != statistics_key(config, artifacts):
+            print("Statistics in " + statistics_path + " are out of date, they will be computed again")
+            statistics = None
+
+    if statistics is None:
+        sentences_tgt, sentences_ref = Process(config).run_processors()
+        statistics = CobaltStatistics.from_sentences(sentences_tgt, sentences_ref)
+        if artifacts is not None:
+            # The key is computed after the processors, which write the parses and alignments it depends on
+            statistics.key = statistics_key(config, artifacts)
+            statistics.save(statistics_path)
+
+    if artifacts is not None:
+        artifacts.save_digests()
+
+    human_rankings = HumanRanking()
+    human_rankings.add_human_data(config)
+    human_rankings.get_sentence_ids(data)
+    winners, losers = human_rankings.winner_loser_indexes()
+    ties = human_rankings.tie_indexes()
+
+    section = 'Scorer Tuning'
+    options = ['search', 'n_iter', 'random_state', 'variant', 'output']
+    grid = dict((name, loads(config.get(section, name))) for name in config.options(section) if name not in options)
+
+    best_params, best_tau, results = search_parameters(
+        statistics, winners, losers, grid,
+        search=config.get(section, 'search', fallback='grid'),
+        n_iter=config.getint(section, 'n_iter', fallback=10),
+        random_state=config.getint(section, 'random_state', fallback=None),
+        variant=config.get(section, 'variant', fallback='wmt14'), ties=ties)
+
+    print("Evaluated " + str(len(results)) + " parameter settings")
+    print("Best Kendall's tau " + str(best_tau) + " with " + str(best_params))
+
+    if config.has_option(section, 'output'):
+        write_config(best_params, config.get(section, 'output'))
+
+    return best_params, best_tau
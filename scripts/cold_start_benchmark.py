@@ -0,0 +1,62 @@
+""" Cold-start time of the modules and lexical resources of the metric, each measured in a new interpreter.
+    Run from the root of the repository (the lexical resources are read from relative paths):
+
+        python scripts/cold_start_benchmark.py [repetitions]
+
+    Modules or resources whose dependencies are not installed are reported as failed """
+
+import subprocess
+import sys
+
+
+MODULES = ['lex_resources.config', 'utils.word_sim', 'alignment.aligner', 'scorer.scorer',
+           'processors.processors', 'features.feature_extractor']
+
+# First use of the lazily loaded resources of lex_resources.config
+RESOURCES = [('synonyms', "config.synonymDictionary.checkSynonymByLemma('car', 'automobile')"),
+             ('contractions', "config.contractionDictionary.is_contraction('n\\'t')"),
+             ('extended stopwords', "len(config.extended_stopwords.stopwords_list)"),
+             ('stopwords', "'the' in config.cobalt_stopwords"),
+             ('stemmer', "config.stemmer.stem('running')")]
+
+IMPORT_TIME = "import time; start = time.time(); import {0}; print(time.time() - start)"
+RESOURCE_TIME = "import time; from lex_resources import config; start = time.time(); {0}; print(time.time() - start)"
+
+
+def measure(code, repetitions):
+
+    times = []
+
+    for _ in range(repetitions):
+        process = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                 universal_newlines=True)
+        if process.returncode != 0:
+            return None
+        times.append(float(process.stdout.strip().splitlines()[-1]))
+
+    return sorted(times)
+
+
+def report(name, times):
+
+    if times is None:
+        print('{0:<30} failed'.format(name))
+    else:
+        print('{0:<30} min {1:8.3f}s  median {2:8.3f}s'.format(name, times[0], times[len(times) // 2]))
+
+
+def main():
+
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print('Import time')
+    for module in MODULES:
+        report(module, measure(IMPORT_TIME.format(module), repetitions))
+
+    print('First use of the lexical resources')
+    for name, code in RESOURCES:
+        report(name, measure(RESOURCE_TIME.format(code), repetitions))
+
+
+if __name__ == '__main__':
+    main()
@@ -22,13 +22,19 @@ if not os.path.exists(output_path):
 ranking_data = RankingData(config)
 ranking_data.read_dataset(parsed=True)
 plain, parsed = ranking_data.generate_sample(100)
-ranking_data.write_plain(plain)
-ranking_data.write_parsed(parsed)
+unique_plain, unique_parsed, inverse = ranking_data.deduplicate(plain, parsed)
+ranking_data.write_plain(unique_plain)
+ranking_data.write_parsed(unique_parsed)
 ranking_data.write_meta_data(plain, 'output/meta.txt')
+ranking_data.write_inverse_index(inverse, 'output/meta.inverse.txt')
+ranking_data.write_reference_index(ranking_data.reference_index(unique_plain),
+                                  os.path.expanduser(config.get('Data', 'working_dir')) + '/' + 'ref.index')
 meta_data = ranking_data.read_meta_data('output/meta.txt')
 
 # Process dataset
 process = Process(config)
 sentences_target, sentences_reference = process.run_processors()
-cobalt_scores = FeatureExtractor.extract_features_static(['cobalt'], sentences_target, sentences_reference)
+cobalt_scores = FeatureExtractor.extract_features_static(['cobalt'], sentences_target, sentences_reference,
+                                                         ref_index=ranking_data.reference_index(unique_plain))
+cobalt_scores = ranking_data.expand(cobalt_scores, inverse)
 ranking_data.write_scores_meta(cobalt_scores, meta_data, metric='cobalt', output_path=output_path + '/' + 'cobalt.cs-en.external.scores')
@@ -0,0 +1,153 @@
+import unittest
+import numpy as np
+
+from configparser import ConfigParser
+from processors import processors
+from processors.abstract_processor import AbstractProcessor
+from processors.process import Process
+from features.feature_extractor import FeatureExtractor, registry
+from features.impl.abstract_feature import AbstractFeature
+
+
+TOKENS_TGT = [['the', 'cat', 'sat', 'on', 'the', 'mat'], ['a', 'dog', 'barked', 'loudly']]
+TOKENS_REF = [['the', 'cat', 'was', 'sitting', 'on', 'the', 'mat'], ['the', 'dog', 'barked']]
+
+MEDIAN_COSINE = ['median_cosine_difference', 'median_cosine_candidate', 'median_cosine_reference']
+
+
+def vectors(tokens):
+    return np.array([[len(token), sum(ord(c) for c in token) % 7 + 1, 1.0] for token in tokens])
+
+
+class FakeProcessor(AbstractProcessor):
+
+    # Records the processors that were run
+
+    ran = []
+
+    def __init__(self, name):
+        AbstractProcessor.__init__(self)
+        AbstractProcessor.set_name(self, name)
+        AbstractProcessor.set_output(self, True)
+
+    def run(self, config, from_file=False):
+        FakeProcessor.ran.append(self.get_name())
+
+
+class FakeTokenizer(FakeProcessor):
+
+    def __init__(self):
+        FakeProcessor.__init__(self, 'tokenizer')
+
+    def get(self, config, from_file=False):
+        AbstractProcessor.set_result_tgt(self, TOKENS_TGT)
+        AbstractProcessor.set_result_ref(self, TOKENS_REF)
+
+
+class FakeWordVectors(FakeProcessor):
+
+    def __init__(self):
+        FakeProcessor.__init__(self, 'word_vectors')
+
+    def get(self, config, from_file=False):
+        AbstractProcessor.set_result_tgt(self, [vectors(x) for x in TOKENS_TGT])
+        AbstractProcessor.set_result_ref(self, [vectors(x) for x in TOKENS_REF])
+
+
+class FakeParse(FakeProcessor):
+
+    def __init__(self):
+        FakeProcessor.__init__(self, 'parse')
+
+    def get(self, config, from_file=False):
+        AbstractProcessor.set_result_tgt(self, [[] for x in TOKENS_TGT])
+        AbstractProcessor.set_result_ref(self, [[] for x in TOKENS_REF])
+
+
+class FakePOSTaggerParse(FakeProcessor):
+
+    # Writes the tags to a file, has no results
+
+    def __init__(self):
+        FakeProcessor.__init__(self, 'pos_tagger_parse')
+        AbstractProcessor.set_output(self, None)
+
+    def cache_outputs(self, config):
+        return [config.get('Data', 'tgt') + '.pos']
+
+
+class FakePOSLanguageModel(FakeProcessor):
+
+    def __init__(self):
+        FakeProcessor.__init__(self, 'pos_language_model_sentence_features')
+
+    def cache_inputs(self, config):
+        return [config.get('Data', 'tgt') + '.pos']
+
+
+class UndeclaredFeature(AbstractFeature):
+
+    def __init__(self):
+        AbstractFeature.__init__(self)
+        AbstractFeature.set_name(self, 'undeclared_feature')
+
+    def run(self, cand, ref):
+        AbstractFeature.set_value(self, len(cand['tokens']))
+
+
+class RequiredProcessorsTest(unittest.TestCase):
+
+    FAKES = [FakeTokenizer, FakeWordVectors, FakeParse]
+
+    def setUp(self):
+        for my_class in self.FAKES:
+            setattr(processors, my_class.__name__, my_class)
+        FakeProcessor.ran = []
+
+        self.config = ConfigParser()
+        self.config.read_dict({'Processors': {'processors': '["FakeTokenizer", "FakeWordVectors", "FakeParse"]'},
+                               'Cache': {'enabled': 'false'}})
+
+    def tearDown(self):
+        for my_class in self.FAKES:
+            delattr(processors, my_class.__name__)
+
+    def test_median_cosine_with_pruning(self):
+
+        sentences_tgt, sentences_ref = Process(self.config).run_processors(MEDIAN_COSINE)
+
+        self.assertEqual(FakeProcessor.ran, ['tokenizer', 'word_vectors'])
+
+        self.assertNotIn('parse', sentences_tgt[0])
+
+        values = FeatureExtractor.extract_features_static(MEDIAN_COSINE, sentences_tgt, sentences_ref)
+
+        for i in range(len(TOKENS_TGT)):
+            for k, instance in enumerate(registry.instances(MEDIAN_COSINE)):
+                expected = instance.__class__()
+                expected.run({'tokens': TOKENS_TGT[i], 'word_vectors': vectors(TOKENS_TGT[i])},
+                             {'tokens': TOKENS_REF[i], 'word_vectors': vectors(TOKENS_REF[i])})
+                self.assertAlmostEqual(values[i][k], expected.get_value())
+
+    def test_undeclared_requirements_keep_all_processors(self):
+
+        registry.refresh()
+        Process(self.config).run_processors(['undeclared_feature'])
+
+        self.assertEqual(FakeProcessor.ran, ['tokenizer', 'word_vectors', 'parse'])
+
+    def test_producers_of_input_files_are_kept(self):
+
+        self.config.read_dict({'Data': {'tgt': '/data/tgt', 'ref': '/data/ref'}})
+        selected = [(my_class.__name__, my_class) for my_class in [FakeTokenizer, FakePOSTaggerParse, FakeParse,
+                                                                   FakePOSLanguageModel]]
+
+        required = Process(self.config).required_processors(selected, ['pos_lang_mod_prob_srilm'])
+        self.assertEqual([name for name, my_class in required], ['FakePOSTaggerParse', 'FakePOSLanguageModel'])
+
+        required = Process(self.config).required_processors(selected, ['count_words_candidate'])
+        self.assertEqual([name for name, my_class in required], ['FakeTokenizer'])
+
+
+if __name__ == '__main__':
+    unittest.main()
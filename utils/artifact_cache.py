@@ -0,0 +1,262 @@
+""" Content-addressed cache for the files written by the processors.
+
+    An entry is keyed by the hash of the processor name and version, the contents of its input
+    files, the identity of the resources it uses (large files such as language models, identified
+    by path, size and modification time) and the configuration values it depends on. When a
+    processor runs with the same key again its output files are restored from the cache instead
+    of being recomputed, and any change in the inputs or the configuration gives a new key.
+
+    Entries are written to a temporary directory that is renamed into place, and restored files
+    are replaced atomically, so an interrupted run never leaves partial outputs. File hashes are
+    memoized by (size, modification time). Entries not used for a number of days can be removed
+    with collect_garbage, e.g.
+
+        python -m utils.artifact_cache ~/work/.cache --max-age-days 30 """
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from argparse import ArgumentParser
+
+
+def file_digest(path, chunk_size=1 << 20):
+
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class ArtifactCache(object):
+
+    def __init__(self, directory):
+        self.directory = os.path.expanduser(directory)
+        self.hits = []
+        self.misses = []
+        self.digests = {}
+        self.digests_path = self.directory + '/' + 'digests.json'
+
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+        if os.path.exists(self.digests_path):
+            with open(self.digests_path) as f:
+                self.digests = json.load(f)
+
+    @staticmethod
+    def from_config(config):
+
+        # Cache directory from the [Cache] section (dir, enabled), None if the cache is disabled
+
+        if config.has_option('Cache', 'enabled') and not config.getboolean('Cache', 'enabled'):
+            return None
+
+        if config.has_option('Cache', 'dir'):
+            return ArtifactCache(config.get('Cache', 'dir'))
+
+        return ArtifactCache(os.path.expanduser(config.get('Data', 'working_dir')) + '/' + '.cache')
+
+    def digest(self, path):
+
+        # Hash of the file contents, recomputed only if the size or modification time changed
+
+        path = os.path.abspath(os.path.expanduser(path))
+
+        if not os.path.exists(path):
+            return 'missing'
+
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime]
+        known = self.digests.get(path)
+
+        if known is not None and known[:2] == signature:
+            return known[2]
+
+        digest = file_digest(path)
+        self.digests[path] = signature + [digest]
+        return digest
+
+    def key(self, name, version, inputs, resources=(), settings=()):
+
+        sha = hashlib.sha1()
+        sha.update(json.dumps([name, str(version)]).encode('utf-8'))
+
+        for path in inputs:
+            sha.update(json.dumps([os.path.basename(path), self.digest(path)]).encode('utf-8'))
+
+        for path in resources:
+            path = os.path.abspath(os.path.expanduser(path))
+            stat = [os.stat(path).st_size, os.stat(path).st_mtime] if os.path.exists(path) else 'missing'
+            sha.update(json.dumps([path, stat]).encode('utf-8'))
+
+        sha.update(json.dumps([str(value) for value in settings]).encode('utf-8'))
+
+        return sha.hexdigest()
+
+    def entry(self, key):
+        return self.directory + '/' + key[:2] + '/' + key
+
+    def restore(self, key, outputs):
+
+        # Copies the cached outputs into place, returns False if there is no complete entry
+
+        entry = self.entry(key)
+        meta_path = entry + '/' + 'meta.json'
+
+        if not os.path.exists(meta_path):
+            self.misses.append(key)
+            return False
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        if len(meta['digests']) != len(outputs):
+            self.misses.append(key)
+            return False
+
+        for i, path in enumerate(outputs):
+            path = os.path.expanduser(path)
+            if os.path.exists(path) and self.digest(path) == meta['digests'][i]:
+                continue
+            self.atomic_copy(entry + '/' + str(i), path)
+            self.digests.pop(os.path.abspath(path), None)
+
+        meta['last_used'] = time.time()
+        self.write_meta(entry, meta)
+
+        self.hits.append(key)
+        return True
+
+    def store(self, key, name, outputs):
+
+        entry = self.entry(key)
+        if os.path.exists(entry + '/' + 'meta.json'):
+            return
+
+        parent = os.path.dirname(entry)
+        if not os.path.exists(parent):
+            os.makedirs(parent)
+
+        tmp = tempfile.mkdtemp(dir=parent)
+        digests = []
+
+        for i, path in enumerate(outputs):
+            path = os.path.expanduser(path)
+            if not os.path.exists(path):
+                shutil.rmtree(tmp)
+                print("Output " + path + " of " + name + " does not exist, it will not be cached")
+                return
+            shutil.copyfile(path, tmp + '/' + str(i))
+            digests.append(self.digest(path))
+
+        now = time.time()
+        self.write_meta(tmp, {'processor': name, 'outputs': [os.path.basename(p) for p in outputs],
+                              'digests': digests, 'created': now, 'last_used': now})
+
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Stored concurrently by another run
+            shutil.rmtree(tmp)
+
+    def run(self, name, version, inputs, outputs, compute, resources=(), settings=()):
+
+        # Restores the outputs if they are cached, otherwise calls compute() and caches them
+
+        key = self.key(name, version, inputs, resources, settings)
+
+        if self.restore(key, outputs):
+            print("Cache hit for " + name + ", outputs restored from " + self.entry(key))
+        else:
+            print("Cache miss for " + name)
+            compute()
+            self.store(key, name, outputs)
+
+        self.save_digests()
+        return key
+
+    @staticmethod
+    def atomic_copy(source, destination):
+
+        directory = os.path.dirname(os.path.abspath(destination))
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        os.close(fd)
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, destination)
+
+    @staticmethod
+    def write_meta(entry, meta):
+
+        fd, tmp = tempfile.mkstemp(dir=entry)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, entry + '/' + 'meta.json')
+
+    def save_digests(self):
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.digests, f)
+        os.replace(tmp, self.digests_path)
+
+    def report(self):
+        print("Artifact cache: " + str(len(self.hits)) + " hits, " + str(len(self.misses)) + " misses")
+
+    def collect_garbage(self, max_age_days=None, keep=()):
+
+        # Removes the entries not used in the last max_age_days (all of them if None), except keep.
+        # Returns the number of removed entries
+
+        removed = 0
+        now = time.time()
+        keep = set(keep)
+
+        for prefix in os.listdir(self.directory):
+            parent = self.directory + '/' + prefix
+            if not os.path.isdir(parent):
+                continue
+
+            for key in os.listdir(parent):
+                entry = parent + '/' + key
+                if key in keep:
+                    continue
+
+                # Entry being written by a running process
+                if key.startswith('tmp') and now - os.path.getmtime(entry) < 86400:
+                    continue
+
+                meta_path = entry + '/' + 'meta.json'
+                if os.path.exists(meta_path):
+                    with open(meta_path) as f:
+                        last_used = json.load(f).get('last_used', 0)
+                    if max_age_days is not None and now - last_used < max_age_days * 86400:
+                        continue
+
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+
+        self.digests = dict((path, value) for path, value in self.digests.items() if os.path.exists(path))
+        self.save_digests()
+
+        return removed
+
+
+def main(argv=None):
+    parser = ArgumentParser(description="Removes unused entries from an artifact cache")
+    parser.add_argument("directory", help="cache directory")
+    parser.add_argument("--max-age-days", type=float, default=None,
+                        help="remove the entries not used in this number of days (all entries if not set)")
+    args = parser.parse_args(argv)
+
+    cache = ArtifactCache(args.directory)
+    print("Removed " + str(cache.collect_garbage(args.max_age_days)) + " entries")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+""" Array-backed word and sentence embeddings built from a word2vec model.
+    Tokens of all sentences are mapped to vocabulary ids in one pass, vectors are gathered
+    with fancy indexing into one contiguous float32 array and sentences are addressed by offsets """
+
+import os
+import numpy as np
+
+from collections import namedtuple
+
+
+EmbeddingModel = namedtuple("EmbeddingModel", ["vocab", "matrix"])
+
+# Loaded models, shared by WordVectors and SentVector
+__models__ = dict()
+
+
+def load_model(path):
+
+    path = os.path.expanduser(path)
+
+    if path in __models__:
+        return __models__[path]
+
+    from gensim.models.word2vec import Word2Vec
+
+    print("Loading word vectors from " + path)
+    wv = Word2Vec.load_word2vec_format(path, binary=False)
+    vocab = {word: i for i, word in enumerate(wv.index2word)}
+    model = EmbeddingModel(vocab=vocab, matrix=np.ascontiguousarray(wv.syn0, dtype=np.float32))
+    print("Finished loading word vectors from " + path)
+
+    __models__[path] = model
+    return model
+
+
+def token_ids(sents, vocab, skip=None):
+
+    # Returns vocabulary ids of all the tokens (-1 for unknown or skipped tokens)
+    # and sentence offsets, sentence i spans ids[offsets[i]:offsets[i + 1]]
+
+    ids = []
+    offsets = [0]
+
+    for line in sents:
+        for token in line.strip().split(' '):
+            token = token.lower()
+            if skip is not None and token in skip:
+                ids.append(-1)
+            else:
+                ids.append(vocab.get(token, -1))
+        offsets.append(len(ids))
+
+    return np.array(ids, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+
+def word_vectors(ids, matrix):
+
+    # Unknown words get zero vectors to preserve sentence length
+
+    vectors = np.zeros((len(ids), matrix.shape[1]), dtype=np.float32)
+    known = ids >= 0
+    vectors[known] = matrix[ids[known]]
+
+    return vectors
+
+
+def sentence_means(ids, offsets, matrix):
+
+    # Mean of the known word vectors of each sentence, zero vector if there are none
+
+    means = np.zeros((len(offsets) - 1, matrix.shape[1]), dtype=np.float32)
+
+    if len(ids) == 0:
+        return means
+
+    known = (ids >= 0).astype(np.float32)
+    starts = offsets[:-1]
+    non_empty = starts < offsets[1:]
+
+    sums = np.add.reduceat(word_vectors(ids, matrix), starts[non_empty], axis=0)
+    counts = np.add.reduceat(known, starts[non_empty])
+
+    has_vectors = counts > 0
+    sums[has_vectors] /= counts[has_vectors][:, None]
+    means[non_empty] = sums
+
+    return means
+
+
+def unit_rows(vectors):
+
+    # Rows scaled to unit length, zero rows are left as they are (as gensim.matutils.unitvec)
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+
+    return vectors / norms
+
+
+def split(array, offsets):
+
+    # Per-sentence views on a contiguous array
+
+    return [array[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
@@ -1,13 +1,17 @@
 import re
 import numpy as np
-import itertools
 import os
 
 from collections import defaultdict
 from collections import namedtuple
-from collections import Counter
-from csv import DictReader
-from json import loads
+from csv import reader
+from json import dumps, loads
+
+
+# Comparison signs are stored as codes, '<' means "is better than"
+SIGNS = ['<', '=', '>']
+
+COLUMNS = ['dataset', 'lang_pair', 'phrase', 'sys1', 'sys2', 'sign', 'idx_phrase_sys1', 'idx_phrase_sys2']
 
 
 class HumanComparison(object):
@@ -22,87 +26,340 @@ class HumanComparison(object):
         self.idx_phrase_sys2 = -1
 
 
+class Codes(object):
+
+    # Interns strings (systems, language pairs, datasets) into integer codes
+
+    def __init__(self, names=()):
+        self.names = list(names)
+        self.codes = {name: i for i, name in enumerate(self.names)}
+
+    def code(self, name):
+        if name not in self.codes:
+            self.codes[name] = len(self.names)
+            self.names.append(name)
+        return self.codes[name]
+
+
+def extended(array, length):
+
+    # The array with zeros added up to length. Values are copied to a buffer of twice the length
+    # and the array is returned as a view on it, so that growing it by one row at a time copies
+    # every value a constant number of times on average
+
+    buffer = array.base
+
+    if isinstance(buffer, np.ndarray) and buffer.ndim == 1 and buffer.dtype == array.dtype and \
+            len(buffer) >= length and buffer.ctypes.data == array.ctypes.data:
+        buffer[len(array):length] = 0
+        return buffer[:length]
+
+    buffer = np.zeros(max(16, 2 * length), dtype=array.dtype)
+    buffer[:len(array)] = array
+    return buffer[:length]
+
+
+class StoredComparison(HumanComparison):
+
+    # Comparison stored in a row of a HumanRanking, reading and setting its attributes reads and writes the columns
+
+    def __init__(self, ranking, row):
+        self.ranking = ranking
+        self.row = row
+
+    def _get(self, name):
+        return int(self.ranking.columns[name][self.row])
+
+    def _set(self, name, value):
+        self.ranking.columns[name][self.row] = value
+
+    phrase = property(lambda self: self._get('phrase'), lambda self, value: self._set('phrase', value))
+    sys1 = property(lambda self: self.ranking.systems.names[self._get('sys1')],
+                    lambda self, value: self._set('sys1', self.ranking.systems.code(value)))
+    sys2 = property(lambda self: self.ranking.systems.names[self._get('sys2')],
+                    lambda self, value: self._set('sys2', self.ranking.systems.code(value)))
+    sign = property(lambda self: SIGNS[self._get('sign')], lambda self, value: self._set('sign', SIGNS.index(value)))
+    idx_phrase_sys1 = property(lambda self: self._get('idx_phrase_sys1'),
+                               lambda self, value: self._set('idx_phrase_sys1', value))
+    idx_phrase_sys2 = property(lambda self: self._get('idx_phrase_sys2'),
+                               lambda self, value: self._set('idx_phrase_sys2', value))
+
+
+class ComparisonList(object):
+
+    # List view on the rows of a (dataset, lang_pair) group of a HumanRanking. Items are StoredComparison
+    # objects, so changes to their attributes are kept, and appended comparisons are added to the columns
+
+    def __init__(self, ranking, key):
+        self.ranking = ranking
+        self.key = key
+
+    def rows(self):
+        return self.ranking.rows(*self.key)
+
+    def __len__(self):
+        return len(self.rows())
+
+    def __iter__(self):
+        for row in self.rows():
+            yield StoredComparison(self.ranking, int(row))
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [StoredComparison(self.ranking, int(row)) for row in self.rows()[k]]
+        return StoredComparison(self.ranking, int(self.rows()[k]))
+
+    def __setitem__(self, k, comparison):
+        self.ranking.set_row(int(self.rows()[k]), comparison)
+
+    def append(self, comparison):
+        self.ranking.add_rows(self.key, [comparison])
+
+    def extend(self, comparisons):
+        self.ranking.add_rows(self.key, comparisons)
+
+    def __iadd__(self, comparisons):
+        self.extend(comparisons)
+        return self
+
+
 class HumanRanking(defaultdict):
 
+    # Pairwise comparisons are stored as parallel arrays (see COLUMNS), with systems, language pairs
+    # and datasets coded as integers and the rows grouped by (dataset, lang_pair).
+    # self[dataset, lang_pair] gives a list view of HumanComparison objects (see ComparisonList)
+
     def __init__(self):
         defaultdict.__init__(self, list)
+        self.datasets = Codes()
+        self.lang_pairs = Codes()
+        self.systems = Codes()
+        self.columns = {name: np.zeros(0, dtype=np.int32) for name in COLUMNS}
+        self.groups = {}
+
+    def __missing__(self, key):
+        self[key] = ComparisonList(self, key)
+        return self[key]
 
     def add_human_data(self, config, max_comparisons=-1):
 
-        counter = 1
-        ranks = open(os.path.expanduser(config.get('Paths', 'judgments')), 'r')
+        path = os.path.expanduser(config.get('Paths', 'judgments'))
         lang_pairs = loads(config.get('Settings', 'lang_pairs'))
 
-        for line in DictReader(ranks):
+        # The cache holds the comparisons of a single judgments file
+        single_file = len(self.columns['sign']) == 0
 
-            if counter > max_comparisons > 0:
-                return
+        if not (single_file and self.load_cache(path, lang_pairs, max_comparisons)):
+            self.read_judgments(path, lang_pairs, max_comparisons)
+            if single_file:
+                self.save_cache(path, lang_pairs, max_comparisons)
 
-            lang_pair = HumanRanking.lang_pair(line)
-            if lang_pair not in lang_pairs:
-                continue
+        self.group_rows()
+
+    def read_judgments(self, path, lang_pairs, max_comparisons=-1):
+
+        values = {name: [] for name in COLUMNS[:6]}
+        extractors = {}
+        counter = 1
+
+        with open(path, 'r') as ranks:
+
+            lines = reader(ranks)
+            header = {name: i for i, name in enumerate(next(lines))}
+            first_id = header['system1Id']
+            src_index = header['srcIndex']
+            system_columns = [(header['system' + str(number) + 'Id'], header['system' + str(number) + 'rank'])
+                              for number in range(1, 6) if 'system' + str(number) + 'Id' in header]
+
+            for line in lines:
+
+                if counter > max_comparisons > 0:
+                    break
+
+                system_id = line[first_id]
+                lang_pair = HumanRanking.lang_pair_from_id(system_id)
+                if lang_pair not in lang_pairs:
+                    continue
+
+                dataset = HumanRanking.dataset_from_id(system_id)
+                if (dataset, lang_pair) not in extractors:
+                    extractors[dataset, lang_pair] = HumanRanking.system_extractor(system_id, dataset, lang_pair)
+                extract_system = extractors[dataset, lang_pair]
+
+                systems_ranks = [(extract_system(line[id_column]), int(line[rank_column]))
+                                 for id_column, rank_column in system_columns]
+                systems_ranks = sorted([x for x in systems_ranks if x[1] != -1], key=lambda x: x[0].lower())
+
+                # Extract all comparisons (Making sure that two systems are extracted only once)
+                dataset_code = self.datasets.code(dataset)
+                lang_pair_code = self.lang_pairs.code(lang_pair)
+                segment = int(line[src_index])
+
+                for idx1, (sys1, rank1) in enumerate(systems_ranks):
+                    for sys2, rank2 in systems_ranks[idx1 + 1:]:
+                        values['dataset'].append(dataset_code)
+                        values['lang_pair'].append(lang_pair_code)
+                        values['phrase'].append(segment)
+                        values['sys1'].append(self.systems.code(sys1))
+                        values['sys2'].append(self.systems.code(sys2))
+                        values['sign'].append(0 if rank1 < rank2 else 2 if rank1 > rank2 else 1)
+                        counter += 1
+
+        new_columns = {name: np.array(values[name], dtype=np.int32) for name in values}
+        new_columns['idx_phrase_sys1'] = np.full(len(new_columns['sign']), -1, dtype=np.int32)
+        new_columns['idx_phrase_sys2'] = np.full(len(new_columns['sign']), -1, dtype=np.int32)
+
+        for name in COLUMNS:
+            self.columns[name] = np.concatenate((self.columns[name], new_columns[name]))
+
+    @staticmethod
+    def cache_path(path):
+        return path + '.cache.npz'
+
+    def load_cache(self, path, lang_pairs, max_comparisons):
+
+        # Binary sidecar with the parsed judgments, used if it is newer than the judgments file
+        # and was built with the same language pairs and maximum number of comparisons
+
+        cache = HumanRanking.cache_path(path)
 
-            dataset = HumanRanking.dataset(line)
-            segment = HumanRanking.sent_number(line)
-            systems_ranks = HumanRanking.system_ranks(line, dataset, lang_pair)
-            systems_ranks.sort(key=lambda x: x.id.lower())
-
-            # Extract all comparisons (Making sure that two systems are extracted only once)
-            # Also the extracted relation '<' means "is better than"
-            compare = lambda x, y: '<' if x < y else '>' if x > y else '='
-            extracted_comparisons = [
-                    HumanComparison(segment, sys1.id, sys2.id, compare(sys1.rank, sys2.rank))
-                    for idx1, sys1 in enumerate(systems_ranks)
-                    for idx2, sys2 in enumerate(systems_ranks)
-                    if idx1 < idx2
-                    and sys1.rank != -1
-                    and sys2.rank != -1
-                ]
-
-            self[dataset, lang_pair] += extracted_comparisons
-            counter += len(extracted_comparisons)
+        if not os.path.exists(cache) or os.path.getmtime(cache) < os.path.getmtime(path):
+            return False
+
+        with np.load(cache) as data:
+            if str(data['settings']) != dumps([sorted(lang_pairs), max_comparisons]):
+                return False
+
+            self.datasets = Codes(data['datasets'].tolist())
+            self.lang_pairs = Codes(data['lang_pairs'].tolist())
+            self.systems = Codes(data['systems'].tolist())
+            self.columns = {name: data[name] for name in COLUMNS}
+
+        print("Loaded human judgments from " + cache)
+        return True
+
+    def save_cache(self, path, lang_pairs, max_comparisons):
+
+        cache = HumanRanking.cache_path(path)
+        tmp = cache + '.tmp.npz'
+
+        try:
+            np.savez(tmp,
+                     settings=np.array(dumps([sorted(lang_pairs), max_comparisons])),
+                     datasets=np.array(self.datasets.names, dtype=str),
+                     lang_pairs=np.array(self.lang_pairs.names, dtype=str),
+                     systems=np.array(self.systems.names, dtype=str),
+                     **self.columns)
+            os.replace(tmp, cache)
+        except (IOError, OSError):
+            print("Could not write the human judgments cache " + cache)
+
+    def group_rows(self):
+
+        # Sorts the rows by (dataset, lang_pair), keeping the file order within each group,
+        # and sets the list views. Rows are not moved afterwards, comparisons appended to a
+        # group are added at the end of the columns
+
+        order = np.lexsort((self.columns['lang_pair'], self.columns['dataset']))
+        self.columns = {name: self.columns[name][order] for name in COLUMNS}
+
+        keys = self.columns['dataset'].astype(np.int64) * max(len(self.lang_pairs.names), 1) + self.columns['lang_pair']
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        starts = np.concatenate(([0], bounds))
+        stops = np.concatenate((bounds, [len(keys)]))
+
+        self.clear()
+        self.groups = {}
+        for start, stop in zip(starts, stops):
+            if start == stop:
+                continue
+            dataset = self.datasets.names[self.columns['dataset'][start]]
+            lang_pair = self.lang_pairs.names[self.columns['lang_pair'][start]]
+            self.groups[dataset, lang_pair] = np.arange(start, stop)
+            self[dataset, lang_pair] = ComparisonList(self, (dataset, lang_pair))
+
+    def set_row(self, row, comparison):
+        self.columns['phrase'][row] = comparison.phrase
+        self.columns['sys1'][row] = self.systems.code(comparison.sys1)
+        self.columns['sys2'][row] = self.systems.code(comparison.sys2)
+        self.columns['sign'][row] = SIGNS.index(comparison.sign)
+        self.columns['idx_phrase_sys1'][row] = comparison.idx_phrase_sys1
+        self.columns['idx_phrase_sys2'][row] = comparison.idx_phrase_sys2
+
+    def add_rows(self, key, comparisons):
+
+        # Appends comparisons to the group of key = (dataset, lang_pair)
+
+        comparisons = list(comparisons)
+        start = len(self.columns['sign'])
+        stop = start + len(comparisons)
+
+        self.columns = {name: extended(self.columns[name], stop) for name in COLUMNS}
+        self.columns['dataset'][start:stop] = self.datasets.code(key[0])
+        self.columns['lang_pair'][start:stop] = self.lang_pairs.code(key[1])
+        self.columns['phrase'][start:stop] = [c.phrase for c in comparisons]
+        self.columns['sys1'][start:stop] = [self.systems.code(c.sys1) for c in comparisons]
+        self.columns['sys2'][start:stop] = [self.systems.code(c.sys2) for c in comparisons]
+        self.columns['sign'][start:stop] = [SIGNS.index(c.sign) for c in comparisons]
+        self.columns['idx_phrase_sys1'][start:stop] = [c.idx_phrase_sys1 for c in comparisons]
+        self.columns['idx_phrase_sys2'][start:stop] = [c.idx_phrase_sys2 for c in comparisons]
+
+        rows = self.rows(*key)
+        self.groups[key] = extended(rows, len(rows) + len(comparisons))
+        self.groups[key][len(rows):] = np.arange(start, stop)
+
+    def comparison(self, row):
+        return StoredComparison(self, row)
+
+    def rows(self, dataset, lang_pair):
+        return self.groups.get((dataset, lang_pair), np.zeros(0, dtype=np.int64))
 
     def clean_data(self):
         """ Filters out the judgments provided by different judges for the same pair of MT outputs. Majority voting
         is used in order to choose the a single judgment. Cases where different judgments have been assigned
         by the same number of judges are eliminated """
 
+        # The judgments are accumulated over the (dataset, lang_pair) groups in sorted order, and after each group
+        # the votes of all the judgments read so far are counted per (phrase, sys1, sys2) and added to the lang_pair
+
         unique_comparisons = defaultdict(list)
-        listed_comparisons = defaultdict(list)
 
-        for dataset, lang_pair in sorted(self.keys()):
+        keys = sorted(self.keys())
+        rows = np.concatenate([self.rows(dataset, lang_pair) for dataset, lang_pair in keys] or
+                              [np.zeros(0, dtype=np.int64)])
+        ends = np.cumsum([len(self.rows(dataset, lang_pair)) for dataset, lang_pair in keys])
 
-            ties = 0
+        n_systems = max(len(self.systems.names), 1)
+        items = (self.columns['phrase'][rows].astype(np.int64) * n_systems + self.columns['sys1'][rows]) * n_systems \
+            + self.columns['sys2'][rows]
+        signs = self.columns['sign'][rows].astype(np.int64)
 
-            for comp in self[dataset, lang_pair]:
-                listed_comparisons[comp.phrase, comp.sys1, comp.sys2].append(comp.sign)
+        for (dataset, lang_pair), end in zip(keys, ends):
 
-            for sign in itertools.chain.from_iterable(listed_comparisons.values()):
-                if sign == '=':
-                    ties += 1
+            unique_items, first, inverse = np.unique(items[:end], return_index=True, return_inverse=True)
+            votes = np.bincount(inverse.ravel() * len(SIGNS) + signs[:end],
+                                minlength=len(unique_items) * len(SIGNS)).reshape(-1, len(SIGNS))
 
-            comparisons_numbers = [len(x) for x in listed_comparisons.values()]
-            max_comparison_number = max(comparisons_numbers)
+            # Items in the order of their first judgment
+            order = np.argsort(first, kind='stable')
+            votes = votes[order]
+            first_rows = rows[first[order]]
+
+            comparisons_numbers = votes.sum(axis=1)
+            ties = int(votes[:, SIGNS.index('=')].sum())
+            max_comparison_number = np.max(comparisons_numbers)
             avg_comparison_number = np.mean(comparisons_numbers)
             total_comparison_number = np.sum(comparisons_numbers)
 
-            for item in listed_comparisons.keys():
-
-                c = Counter(listed_comparisons[item])
-                signs_and_counts = list(c.items())
-                counts = [x[1] for x in signs_and_counts]
+            # A single sign with the most votes
+            majority = (votes == votes.max(axis=1)[:, None]).sum(axis=1) == 1
+            majority_signs = votes.argmax(axis=1)
 
-                if len(c) == 1:
-                    unique_comparisons[lang_pair].append(
-                        HumanComparison(item[0], item[1], item[2], listed_comparisons[item][0]))
-                    continue
-
-                if counts.count(max(counts)) > 1:
-                    continue
-
-                idx = np.argmax(counts)
-                my_sign = signs_and_counts[idx][0]
-                unique_comparisons[lang_pair].append(HumanComparison(item[0], item[1], item[2], my_sign))
+            for row, sign in zip(first_rows[majority], majority_signs[majority]):
+                unique_comparisons[lang_pair].append(HumanComparison(int(self.columns['phrase'][row]),
+                                                                     self.systems.names[self.columns['sys1'][row]],
+                                                                     self.systems.names[self.columns['sys2'][row]],
+                                                                     SIGNS[sign]))
 
             print(lang_pair + ' ' + str(max_comparison_number) + ' ' + str(avg_comparison_number) + ' ' + str(
                 total_comparison_number) + ' ' + str(ties / float(total_comparison_number)) + ' ' + str(
@@ -112,40 +369,120 @@ class HumanRanking(defaultdict):
 
     def get_sentence_ids(self, data):
 
-        for dataset, lp in sorted(self.keys()):
-            for comparison in self[dataset, lp]:
-                comparison.idx_phrase_sys1 = data.index((dataset, lp, comparison.sys1, comparison.phrase))
-                comparison.idx_phrase_sys2 = data.index((dataset, lp, comparison.sys2, comparison.phrase))
+        # data.index is called once per distinct (dataset, lang_pair, system, phrase)
+
+        positions = {}
+
+        for sys_column, idx_column in [('sys1', 'idx_phrase_sys1'), ('sys2', 'idx_phrase_sys2')]:
+            for row in range(len(self.columns['sign'])):
+                key = (self.datasets.names[self.columns['dataset'][row]],
+                       self.lang_pairs.names[self.columns['lang_pair'][row]],
+                       self.systems.names[self.columns[sys_column][row]],
+                       int(self.columns['phrase'][row]))
+                if key not in positions:
+                    positions[key] = data.index(key)
+                self.columns[idx_column][row] = positions[key]
+
+    def sentence_indexes(self, positions=None):
+
+        # Sentence indexes of the two systems of every row. They are looked up in positions, a dictionary
+        # (dataset, lang_pair, system, phrase) -> index, or taken from the indexes set by get_sentence_ids
+
+        idx1 = self.columns['idx_phrase_sys1']
+        idx2 = self.columns['idx_phrase_sys2']
+
+        if positions is not None:
+            idx1 = np.zeros(len(self.columns['sign']), dtype=np.int64)
+            idx2 = np.zeros(len(self.columns['sign']), dtype=np.int64)
+            for row in range(len(idx1)):
+                dataset = self.datasets.names[self.columns['dataset'][row]]
+                lang_pair = self.lang_pairs.names[self.columns['lang_pair'][row]]
+                phrase = int(self.columns['phrase'][row])
+                idx1[row] = positions[dataset, lang_pair, self.systems.names[self.columns['sys1'][row]], phrase]
+                idx2[row] = positions[dataset, lang_pair, self.systems.names[self.columns['sys2'][row]], phrase]
+
+        return idx1, idx2
+
+    def sorted_rows(self):
+
+        # Rows of all the groups, in the order of the sorted (dataset, lang_pair) keys
+
+        return np.concatenate([self.rows(dataset, lp) for dataset, lp in sorted(self.keys())] or
+                              [np.zeros(0, dtype=np.int64)])
+
+    def winner_loser_indexes(self, positions=None):
+
+        # Sentence indexes of the winner and the loser of every comparison without a tie,
+        # in the order of the sorted (dataset, lang_pair) keys (see sentence_indexes)
+
+        idx1, idx2 = self.sentence_indexes(positions)
+
+        rows = self.sorted_rows()
+        rows = rows[self.columns['sign'][rows] != SIGNS.index('=')]
+        better = self.columns['sign'][rows] == SIGNS.index('<')
+
+        winners = np.where(better, idx1[rows], idx2[rows]).astype(np.int64)
+        losers = np.where(better, idx2[rows], idx1[rows]).astype(np.int64)
+
+        return winners, losers
+
+    def tie_indexes(self, positions=None):
+
+        # Sentence indexes of the two systems of every comparison with a tie,
+        # in the order of the sorted (dataset, lang_pair) keys (see sentence_indexes)
+
+        idx1, idx2 = self.sentence_indexes(positions)
+
+        rows = self.sorted_rows()
+        rows = rows[self.columns['sign'][rows] == SIGNS.index('=')]
+
+        return idx1[rows].astype(np.int64), idx2[rows].astype(np.int64)
 
     @staticmethod
     def lang_pair(line):
+        return HumanRanking.lang_pair_from_id(line['system1Id'])
+
+    @staticmethod
+    def lang_pair_from_id(system_id):
 
-        if '2013' in line['system1Id']:
-            return line['system1Id'].split('.')[1]
-        elif '2015' in line['system1Id']:
-            return re.sub(r'^.+\.(?P<l1>..)-(?P<l2>..)\.txt$', '\g<l1>-\g<l2>', line['system1Id'])
+        if '2013' in system_id:
+            return system_id.split('.')[1]
+        elif '2015' in system_id:
+            return re.sub(r'^.+\.(?P<l1>..)-(?P<l2>..)\.txt$', '\g<l1>-\g<l2>', system_id)
         else:
-            return line['system1Id'].split('.')[-1]
+            return system_id.split('.')[-1]
 
     @staticmethod
     def dataset(line):
-        return line['system1Id'].split('.')[0]
+        return HumanRanking.dataset_from_id(line['system1Id'])
+
+    @staticmethod
+    def dataset_from_id(system_id):
+        return system_id.split('.')[0]
 
     @staticmethod
     def sent_number(line):
         return int(line['srcIndex'])
 
+    @staticmethod
+    def system_extractor(system_id, dataset, direction):
+
+        # Function from system id to system name, the patterns are compiled once per dataset and direction
+
+        if '2013' in system_id:
+            pattern = re.compile('^%s\.%s\.(?P<name>.+)$' % (re.escape(dataset), re.escape(direction)))
+            return lambda x: pattern.sub('\g<name>', x)
+        elif '2015' in system_id:
+            pattern = re.compile('^%s\.(?P<name>.+)\.%s\.txt$' % (re.escape(dataset), re.escape(direction)))
+            return lambda x: pattern.sub('\g<name>', x)
+        else:
+            return lambda x: '.'.join(x.split('.')[1:3])
+
     @staticmethod
     def system_ranks(line, dataset, direction):
         systems_ranks = []
         SystemsTuple = namedtuple("SystemTuple", ["id", "rank"])
-
-        if '2013' in line['system1Id']:
-            extract_system = lambda x: re.sub('^%s\.%s\.(?P<name>.+)$' % (dataset, direction), '\g<name>', x)
-        elif '2015' in line['system1Id']:
-            extract_system = lambda x: re.sub('^%s\.(?P<name>.+)\.%s\.txt$' % (dataset, direction), '\g<name>', x)
-        else:
-            extract_system = lambda x: '.'.join(x.split('.')[1:3])
+        extract_system = HumanRanking.system_extractor(line['system1Id'], dataset, direction)
 
         for number in range(1, 6):
             if 'system' + str(number) + 'Id' in line.keys():
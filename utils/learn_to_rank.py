@@ -3,25 +3,51 @@ import numpy as np
 from utils.file_utils import write_feature_file, write_reference_file
 
 
-def learn_to_rank(feature_values, human_comparisons, path_x, path_y):
+def learn_to_rank(feature_values, human_comparisons, path_x=None, path_y=None, lazy=False):
 
-    xs = []
-    ys = []
+    # Builds the pairwise training set: for each comparison without a tie the difference
+    # winner - loser is labeled 1 and its mirrored negative loser - winner is labeled 0.
+    # Returns the instances and the labels, and writes them to path_x and path_y if given
 
-    for dataset, lp in sorted(human_comparisons.keys()):
-        for comparison in human_comparisons[dataset, lp]:
+    winners, losers = human_comparisons.winner_loser_indexes()
+    xs, ys = pairwise_instances(feature_values, winners, losers, lazy=lazy)
 
-            if comparison.sign == '=':
-                continue
+    if path_x is not None:
+        write_feature_file(path_x, np.asarray(xs))
+    if path_y is not None:
+        write_reference_file(path_y, ys)
 
-            idx_winner, idx_loser = find_winner_loser_index(comparison)
-            xs.append(make_instance(feature_values[idx_winner], feature_values[idx_loser]))
-            xs.append(make_instance(feature_values[idx_loser], feature_values[idx_winner]))
-            ys.append(1)
-            ys.append(0)
+    return xs, ys
 
-    write_feature_file(path_x, xs)
-    write_reference_file(path_y, ys)
+
+def pairwise_instances(feature_values, winners, losers, lazy=False, dtype=np.float32):
+
+    # Instances alternate as before: row 2 * i is winner - loser, row 2 * i + 1 is loser - winner
+
+    ys = np.tile(np.array([1, 0], dtype=np.int32), len(winners))
+
+    if lazy:
+        return PairDifferences(feature_values, winners, losers, dtype=dtype), ys
+
+    feature_values = np.asarray(feature_values, dtype=dtype)
+    first, second = interleave(winners, losers)
+
+    return feature_values[first] - feature_values[second], ys
+
+
+def interleave(winners, losers):
+
+    # Row indexes of the first and second operand of every instance
+
+    first = np.empty(2 * len(winners), dtype=np.int64)
+    first[0::2] = winners
+    first[1::2] = losers
+
+    second = np.empty_like(first)
+    second[0::2] = losers
+    second[1::2] = winners
+
+    return first, second
 
 
 def make_instance(feature_values1, feature_values2):
@@ -35,3 +61,31 @@ def find_winner_loser_index(comparison):
     else:
         return comparison.idx_phrase_sys2, comparison.idx_phrase_sys1
 
+
+class PairDifferences(object):
+
+    # Lazy view on the pairwise training set: only the feature matrix and the index arrays
+    # are stored, rows are computed when indexed (or all of them when converted to an array)
+
+    def __init__(self, feature_values, winners, losers, dtype=np.float32):
+        self.feature_values = np.asarray(feature_values, dtype=dtype)
+        self.first, self.second = interleave(winners, losers)
+        self.dtype = self.feature_values.dtype
+
+    @property
+    def shape(self):
+        return len(self.first), self.feature_values.shape[1]
+
+    def __len__(self):
+        return len(self.first)
+
+    def __getitem__(self, rows):
+        return self.feature_values[self.first[rows]] - self.feature_values[self.second[rows]]
+
+    def __array__(self, dtype=None, copy=None):
+        result = self[:]
+        return result if dtype is None else result.astype(dtype)
+
+    def batches(self, size):
+        for start in range(0, len(self), size):
+            yield self[start:start + size]
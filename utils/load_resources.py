@@ -4,22 +4,11 @@ import numpy as np
 from lex_resources.config import *
 
 
-def load_ppdb(ppdbFileName):
+def load_ppdb(ppdbFileName, bloom=True):
 
-    global ppdb_dict
+    # Compiled, memory-mapped pairs (see lex_resources.ppdb_store), bloom enables the Bloom filter pre-check
 
-    count = 0
-
-    ppdbFile = open(os.path.expanduser(ppdbFileName), 'r')
-    for line in ppdbFile:
-        if line == '\n':
-            continue
-        tokens = line.split()
-        if len(tokens) < 2:
-            continue
-        tokens[1] = tokens[1].strip()
-        ppdb_dict[(tokens[0], tokens[1])] = 0.6
-        count += 1
+    ppdb.load(ppdbFileName, bloom=bloom)
 
 
 def load_word_vectors(vectorsFileName, delimiter=' '):
@@ -1,7 +1,10 @@
 """This class stores wmt-style ranking data (references and MT outputs) with dataset, language pairs and system ids"""
 
 import codecs
+import hashlib
+import os
 import random
+import numpy as np
 
 from os.path import expanduser as usr
 from utils import wmt
@@ -95,6 +98,75 @@ class RankingData(object):
             data.append(item)
         return data
 
+    @staticmethod
+    def deduplicate(plain, parsed=None):
+
+        # Many systems produce identical outputs for the same segment.
+        # Keeps the first item for each unique (candidate, reference) pair
+        # and returns the inverse index mapping every original row to its unique item.
+
+        keys = {}
+        unique = []
+        inverse = np.zeros(len(plain), dtype=np.int64)
+
+        for i, item in enumerate(plain):
+            key = hashlib.sha1()
+            key.update(item.target_sentence.encode('utf8'))
+            key.update(b'\0')
+            key.update(item.reference_sentence.encode('utf8'))
+            if parsed is not None:
+                key.update(b'\0')
+                key.update(''.join(parsed[i].target_sentence).encode('utf8'))
+                key.update(b'\0')
+                key.update(''.join(parsed[i].reference_sentence).encode('utf8'))
+            digest = key.digest()
+
+            if digest not in keys:
+                keys[digest] = len(unique)
+                unique.append(i)
+            inverse[i] = keys[digest]
+
+        unique_plain = [plain[i] for i in unique]
+        unique_parsed = None if parsed is None else [parsed[i] for i in unique]
+
+        return unique_plain, unique_parsed, inverse
+
+    @staticmethod
+    def write_inverse_index(inverse, path):
+        np.savetxt(path, inverse, fmt='%d')
+
+    @staticmethod
+    def read_inverse_index(path):
+        return np.loadtxt(path, dtype=np.int64, ndmin=1)
+
+    @staticmethod
+    def reference_index(items):
+
+        # References are shared by all systems: each item gets the id of
+        # its unique reference, keyed on (dataset, lang_pair, segment)
+
+        ids = {}
+        index = np.zeros(len(items), dtype=np.int64)
+
+        for i, item in enumerate(items):
+            key = (item.dataset, item.lp, item.sentence_num)
+            if key not in ids:
+                ids[key] = len(ids)
+            index[i] = ids[key]
+
+        return index
+
+    @staticmethod
+    def write_reference_index(index, path):
+        np.savetxt(path, index, fmt='%d')
+
+    @staticmethod
+    def expand(values, inverse):
+
+        # Fans values computed for unique pairs back out to all the rows
+
+        return [values[i] for i in inverse]
+
     def get_plain_data(self):
         return self.plain
 
@@ -146,6 +218,11 @@ class RankingData(object):
     def write_plain(self, plain_items):
         path_tgt = usr(self.cfg.get('Data', 'working_dir') + '/' + 'tgt.txt')
         path_ref = usr(self.cfg.get('Data', 'working_dir') + '/' + 'ref.txt')
+        path_index = usr(self.cfg.get('Data', 'working_dir') + '/' + 'ref.index')
+
+        # One reference per item, an index left by write_dataset in the same directory would not match them
+        if os.path.exists(path_index):
+            os.remove(path_index)
 
         with codecs.open(path_tgt, 'w', 'utf8') as o:
             for item in plain_items:
@@ -161,9 +238,12 @@ class RankingData(object):
 
         path_tgt = usr(self.cfg.get('Data', 'working_dir') + '/' + 'tgt.txt')
         path_ref = usr(self.cfg.get('Data', 'working_dir') + '/' + 'ref.txt')
+        path_index = usr(self.cfg.get('Data', 'working_dir') + '/' + 'ref.index')
 
         counter_tgt = 0
         counter_ref = 0
+        ref_index = []
+        ref_offset = 0
 
         with codecs.open(path_tgt, 'w', 'utf8') as output_tgt:
             with codecs.open(path_ref, 'w', 'utf8') as output_ref:
@@ -175,6 +255,7 @@ class RankingData(object):
                             ref_lines = input_ref.readlines()
 
                         for sys_name in dataset.system_names[lp]:
+                            ref_index.extend(range(ref_offset, ref_offset + dataset.number_sentences[lp]))
                             counter_sys = 0
                             with codecs.open(wmt.system_path(self.dir, dataset.name, lp, sys_name), 'r', 'utf8') as input_sys:
                                 for line in input_sys.readlines():
@@ -199,6 +280,10 @@ class RankingData(object):
                                     else:
                                         output_ref.write(line)
 
+                        ref_offset += dataset.number_sentences[lp]
+
+        self.write_reference_index(np.array(ref_index, dtype=np.int64), path_index)
+
     def write_scores_wmt_format(self, scores, metric='metric', output_path='scores.txt'):
 
         with open(output_path, 'w') as o:
@@ -7,11 +7,18 @@ class Sentence(defaultdict):
         defaultdict.__init__(self, list)
 
     def add_data(self, method, sent_data):
+        self[Sentence.data_key(method)] = sent_data
+
+    @staticmethod
+    def data_key(method):
+
+        # Key of the data of a processor (aligners and tokenizers share a key)
+
         if 'aligner' in method:
-            self['alignments'] = sent_data
+            return 'alignments'
         elif 'tokenizer' in method:
-            self['tokens'] = sent_data
+            return 'tokens'
         else:
-            self[method] = sent_data
+            return method
 
 
@@ -7,17 +7,25 @@ from utils.word import Word
 class StanfordParseLoader(object):
 
     @staticmethod
-    def parsed_sentences(input_path):
+    def parsed_sentences(input_path, index=None):
+
+        # If index is given (id of the unique sentence for each position), each unique sentence
+        # is processed once and the same word list is shared by all its positions
+
         with codecs.open(input_path, 'r', 'utf8') as f:
             text = f.read()
 
         loader = ParsedSentencesLoader()
         sentences = loader.load(text)
         parsed = []
-        i = 0
-        for sentence in sentences['sentences']:
-            i += 1
-            parsed.append(StanfordParseLoader._process_parse_result(sentence))
+        processed = {}
+        for i, sentence in enumerate(sentences['sentences']):
+            if index is None:
+                parsed.append(StanfordParseLoader._process_parse_result(sentence))
+                continue
+            if index[i] not in processed:
+                processed[index[i]] = StanfordParseLoader._process_parse_result(sentence)
+            parsed.append(processed[index[i]])
         return parsed
 
 
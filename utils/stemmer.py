@@ -1,18 +1,20 @@
-from nltk import SnowballStemmer
-
-
 class Stemmer(object):
 
     __internal_stemmer__ = None
     __stemmed_words__ = dict()
 
     def __init__(self, language):
-        self.__internal_stemmer__ = SnowballStemmer(language)
+        # The NLTK stemmer is created on the first stem() call
+        self.language = language
 
     def stem(self, word):
         if word in self.__stemmed_words__:
             return self.__stemmed_words__[word]
 
+        if self.__internal_stemmer__ is None:
+            from nltk import SnowballStemmer
+            self.__internal_stemmer__ = SnowballStemmer(self.language)
+
         stem = self.__internal_stemmer__.stem(word)
         self.__stemmed_words__[word] = stem
 
@@ -1,10 +1,9 @@
 from lex_resources.config import *
 from numpy import dot
-from gensim import matutils
 
 global stemmer
 global punctuations
-global ppdb_dict
+global ppdb
 global cobalt_stopwords
 
 __word_relatedness_alignment__ = dict()
@@ -178,6 +177,15 @@ def get_similarity_type_score(similarity_type, scorer):
 
 def word_relatedness_scoring(word1, word2, scorer):
 
+    # The match type is cached rather than the similarity, so that scorers with different weights can share it
+
+    return getattr(scorer, word_relatedness_type(word1, word2))
+
+
+def word_relatedness_type(word1, word2):
+
+    # Name of the scorer weight of the match between two aligned words: exact, stem, synonym, paraphrase or related
+
     if word1.form + '__' + word2.form in __word_relatedness_scoring__:
         return __word_relatedness_scoring__[word1.form + '__' + word2.form]
 
@@ -185,29 +193,29 @@ def word_relatedness_scoring(word1, word2, scorer):
     canonical_word2 = canonize_word(word2.form)
 
     if canonical_word1 == canonical_word2:
-        similarity = scorer.exact
+        match_type = 'exact'
 
     elif contractionDictionary.check_contraction(canonical_word1, canonical_word2):
-        similarity = scorer.exact
+        match_type = 'exact'
 
     elif word1.lemma == word2.lemma:
-        similarity = scorer.stem
+        match_type = 'stem'
 
     elif stemmer.stem(canonical_word1) == stemmer.stem(canonical_word2):
-        similarity = scorer.stem
+        match_type = 'stem'
 
     elif synonymDictionary.checkSynonymByLemma(word1.lemma, word2.lemma):
-        similarity = scorer.synonym
+        match_type = 'synonym'
 
     elif presentInPPDB(canonical_word1, canonical_word2):
-        similarity = scorer.paraphrase
+        match_type = 'paraphrase'
 
     else:
-        similarity = scorer.related
+        match_type = 'related'
 
-    __word_relatedness_scoring__[word1.form + '__' + word2.form] = similarity
+    __word_relatedness_scoring__[word1.form + '__' + word2.form] = match_type
 
-    return similarity
+    return match_type
 
 
 def word_relatedness_feature(word1, word2):
@@ -243,6 +251,8 @@ def cosine_similarity(word1, word2):
 
     global word_vector
 
+    from gensim import matutils
+
     if word1.lower() in word_vector.keys() and word2.lower() in word_vector.keys():
         return dot(matutils.unitvec(word_vector[word1.lower()]), matutils.unitvec(word_vector[word2.lower()]))
     else:
@@ -250,10 +260,7 @@ def cosine_similarity(word1, word2):
 
 
 def presentInPPDB(word1, word2):
-    if (word1.lower(), word2.lower()) in ppdb_dict:
-        return True
-    if (word2.lower(), word1.lower()) in ppdb_dict:
-        return True
+    return ppdb.present(word1, word2)
 
 
 def function_word(word):